@@ -1,4 +1,4 @@
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import styled, { css } from 'styled-components';
 
 /** Hero search + left accessory (Library / Discover). DOM order: input column first, leading second — mobile column shows search on top; desktop row-reverse puts the pill on the left. */
@@ -494,6 +494,47 @@ const SearchContainer = styled.div`
   }
 `;
 
+const SUGGEST_DEBOUNCE_MS = 150;
+const SUGGEST_LIMIT = 8;
+const SUGGESTION_TYPE_LABELS = {
+  movie: 'Movie',
+  director: 'Director',
+  article: 'Article',
+  tag: 'Tag',
+};
+
+/** Typeahead list under the input (GET /api/search/suggest) */
+const SuggestionList = styled.ul`
+  position: absolute;
+  top: calc(100% + 6px);
+  left: 0;
+  right: 0;
+  z-index: 20;
+  margin: 0;
+  padding: 6px 0;
+  list-style: none;
+  border-radius: 12px;
+  border: 1px solid var(--border);
+  background: var(--background-secondary);
+  box-shadow: 0 8px 24px rgba(0, 0, 0, 0.25);
+  text-align: left;
+`;
+
+const SuggestionItem = styled.li`
+  display: flex;
+  justify-content: space-between;
+  gap: 1rem;
+  padding: 8px 16px;
+  cursor: pointer;
+  color: var(--font-color-1);
+  background: ${(props) => (props.$active ? 'var(--background-tertiary)' : 'none')};
+
+  small {
+    color: var(--font-color-2);
+    flex: none;
+  }
+`;
+
 export function SearchBar({
   enterSearch,
   placeholder = 'Search movies...',
@@ -501,11 +542,65 @@ export function SearchBar({
   value,
   onValueChange,
   accessory = null,
+  /** Show a typeahead list from /api/search/suggest while typing */
+  suggestions = false,
 }) {
   const [searchInput, setSearchInput] = useState('');
   const [isExpanded, setIsExpanded] = useState(false);
+  const [suggestionItems, setSuggestionItems] = useState([]);
+  const [activeSuggestion, setActiveSuggestion] = useState(-1);
+  // Set when the text changed by typing; picking or submitting clears it
+  const wantSuggestions = useRef(false);
   const isControlled = typeof value === 'string';
   const hasHeroAccessory = Boolean(accessory && variant === 'hero');
+  const currentText = isControlled ? value : searchInput;
+
+  // Debounced: one small request once typing pauses, stale responses aborted
+  useEffect(() => {
+    if (!suggestions || !wantSuggestions.current || !currentText.trim()) {
+      setSuggestionItems([]);
+      return undefined;
+    }
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const query = encodeURIComponent(currentText);
+        const res = await fetch(
+          `/api/search/suggest?q=${query}&limit=${SUGGEST_LIMIT}`,
+          { signal: controller.signal }
+        );
+        if (!res.ok) return;
+        const data = await res.json();
+        setSuggestionItems(Array.isArray(data?.suggestions) ? data.suggestions : []);
+        setActiveSuggestion(-1);
+      } catch (err) {
+        if (err.name !== 'AbortError') setSuggestionItems([]);
+      }
+    }, SUGGEST_DEBOUNCE_MS);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [suggestions, currentText]);
+
+  const closeSuggestions = () => {
+    wantSuggestions.current = false;
+    setSuggestionItems([]);
+    setActiveSuggestion(-1);
+  };
+
+  const submit = (text) => {
+    closeSuggestions();
+    enterSearch(text ?? '');
+  };
+
+  const pickSuggestion = (suggestion) => {
+    if (!isControlled) {
+      setSearchInput(suggestion.label);
+    }
+    onValueChange?.(suggestion.label);
+    submit(suggestion.label);
+  };
 
   useEffect(() => {
     if (isControlled) {
@@ -515,6 +610,7 @@ export function SearchBar({
 
   const handleChangeSearch = (event) => {
     const nextValue = event.target.value;
+    wantSuggestions.current = true;
     if (!isControlled) {
       setSearchInput(nextValue);
     }
@@ -526,14 +622,38 @@ export function SearchBar({
       setSearchInput('');
     }
     onValueChange?.('');
-    enterSearch('');
+    submit('');
     setIsExpanded(false);
   };
 
   const handleKeyDown = (event) => {
+    if (suggestionItems.length > 0) {
+      if (event.key === 'ArrowDown' || event.key === 'ArrowUp') {
+        event.preventDefault();
+        // -1 is the typed text itself; wrap around through it
+        const count = suggestionItems.length;
+        setActiveSuggestion((current) =>
+          event.key === 'ArrowDown'
+            ? current + 1 >= count
+              ? -1
+              : current + 1
+            : current - 1 < -1
+              ? count - 1
+              : current - 1
+        );
+        return;
+      }
+      if (event.key === 'Escape') {
+        closeSuggestions();
+        return;
+      }
+      if (event.key === 'Enter' && activeSuggestion >= 0) {
+        pickSuggestion(suggestionItems[activeSuggestion]);
+        return;
+      }
+    }
     if (event.key === 'Enter') {
-      const submittedValue = isControlled ? value : searchInput;
-      enterSearch(submittedValue ?? '');
+      submit(currentText);
     }
   };
 
@@ -544,6 +664,7 @@ export function SearchBar({
   const handleBlur = () => {
     setTimeout(() => {
       setIsExpanded(false);
+      closeSuggestions();
     }, 200);
   };
 
@@ -565,6 +686,27 @@ export function SearchBar({
       ✖
     </span>
   );
+  const suggestionEl =
+    suggestionItems.length > 0 ? (
+      <SuggestionList role="listbox">
+        {suggestionItems.map((suggestion, index) => (
+          <SuggestionItem
+            key={`${suggestion.type}-${suggestion.id}`}
+            role="option"
+            aria-selected={index === activeSuggestion}
+            $active={index === activeSuggestion}
+            // mousedown, so the pick lands before the input's blur closes the list
+            onMouseDown={(event) => {
+              event.preventDefault();
+              pickSuggestion(suggestion);
+            }}
+          >
+            {suggestion.label}
+            <small>{SUGGESTION_TYPE_LABELS[suggestion.type] || suggestion.type}</small>
+          </SuggestionItem>
+        ))}
+      </SuggestionList>
+    ) : null;
 
   return (
     <SearchContainer
@@ -578,6 +720,7 @@ export function SearchBar({
           <InputWrap>
             {inputEl}
             {clearEl}
+            {suggestionEl}
           </InputWrap>
           <LeadingSlot>{accessory}</LeadingSlot>
         </HeroCombinedShell>
@@ -585,6 +728,7 @@ export function SearchBar({
         <div>
           {inputEl}
           {clearEl}
+          {suggestionEl}
         </div>
       )}
     </SearchContainer>
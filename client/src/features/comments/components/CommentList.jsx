@@ -83,19 +83,22 @@ function CommentList({ reviewId }) {
   const { user } = useContext(UserContext);
   const [flatComments, setFlatComments] = useState([]);
   const [total, setTotal] = useState(0);
+  // Server's keyset cursor for the next (older) page; null when there is none
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
 
   const fetchPage = useCallback(
-    async (offset, append = false) => {
+    async (after, append = false) => {
       if (!reviewId) return;
       if (!append) setLoading(true);
       else setLoadingMore(true);
       setError(null);
       try {
         const res = await fetch(
-          `/api/reviews/${reviewId}/comments?limit=${COMMENT_PAGE_SIZE}&offset=${offset}`
+          `/api/reviews/${reviewId}/comments?limit=${COMMENT_PAGE_SIZE}` +
+            (after ? `&after=${encodeURIComponent(after)}` : '')
         );
         if (!res.ok) {
           setError('Failed to load comments');
@@ -111,6 +114,7 @@ function CommentList({ reviewId }) {
           setFlatComments(nextFlat);
         }
         setTotal(nextTotal);
+        setNextCursor(camel.nextCursor ?? null);
         setCachedComments(reviewId, nextFlat, nextTotal);
       } catch (err) {
         console.error(err);
@@ -141,9 +145,8 @@ function CommentList({ reviewId }) {
   }, []);
 
   const loadMore = () => {
-    const topLevelLoaded = flatComments.filter((c) => c.parentCommentId == null).length;
-    if (topLevelLoaded >= total) return;
-    fetchPage(topLevelLoaded, true);
+    if (!nextCursor || loadingMore) return;
+    fetchPage(nextCursor, true);
   };
 
   useEffect(() => {
@@ -154,9 +157,9 @@ function CommentList({ reviewId }) {
       setTotal(cached.total ?? 0);
       setLoading(false);
       // Always revalidate in the background
-      fetchPage(0, false);
+      fetchPage(null, false);
     } else {
-      fetchPage(0, false);
+      fetchPage(null, false);
     }
   }, [reviewId, fetchPage]);
 
@@ -167,7 +170,9 @@ function CommentList({ reviewId }) {
 
   const tree = buildCommentTree(flatComments);
   const topLevelLoaded = flatComments.filter((c) => c.parentCommentId == null).length;
-  const hasMore = total > topLevelLoaded;
+  const hasMore = nextCursor != null;
+  // total can lag behind deletions; the cursor decides whether there is more
+  const earlierCount = total - topLevelLoaded;
 
   if (!reviewId) return null;
 
@@ -182,7 +187,9 @@ function CommentList({ reviewId }) {
             <LoadMore type="button" onClick={loadMore} disabled={loadingMore}>
               {loadingMore
                 ? 'Loading…'
-                : `View ${total - topLevelLoaded} earlier comment${total - topLevelLoaded !== 1 ? 's' : ''}`}
+                : earlierCount > 0
+                  ? `View ${earlierCount} earlier comment${earlierCount !== 1 ? 's' : ''}`
+                  : 'View earlier comments'}
             </LoadMore>
           )}
           {tree.length === 0 && !user && (
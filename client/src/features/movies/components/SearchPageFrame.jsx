@@ -281,6 +281,8 @@ export default function SearchPageFrame({
    * Desktop: rendered inside the hero pill on the left. Mobile: stacked below the bar (same as before).
    */
   searchBarAccessory,
+  /** When true, SearchBar shows typeahead suggestions (/api/search/suggest) */
+  searchSuggestions = false,
   children,
 }) {
   const Container = wide ? PageContainer : SearchFrameShell;
@@ -319,6 +321,7 @@ export default function SearchPageFrame({
                   value={searchValue}
                   onValueChange={onSearchValueChange}
                   accessory={searchBarAccessory}
+                  suggestions={searchSuggestions}
                 />
               </SearchRowCenter>
               {searchBarRightSlot ? (
@@ -340,6 +343,7 @@ export default function SearchPageFrame({
                 value={searchValue}
                 onValueChange={onSearchValueChange}
                 accessory={searchBarAccessory}
+                suggestions={searchSuggestions}
               />
             </SearchRowCenter>
             {searchBarRightSlot ? (
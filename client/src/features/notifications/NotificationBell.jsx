@@ -3,6 +3,7 @@ import styled from 'styled-components';
 import { useNotifications, NotificationList } from '@features/notifications';
 import DropdownPanel from '@components/ui/DropdownPanel';
 import { UserContext } from '@context/userProvider';
+import { reconnectStream } from '@utils/eventStream';
 
 const BellWrapper = styled.div`
   position: relative;
@@ -69,6 +70,11 @@ function NotificationBell() {
     fetchPage(0, false);
   }, [user, fetchPage]);
 
+  useEffect(() => {
+    // The stream's notification channel follows the session cookie
+    reconnectStream();
+  }, [user]);
+
   const unreadItems = items.filter((i) => !i.read);
 
   if (!user) return null;
@@ -91,7 +97,7 @@ function NotificationBell() {
           <path d="M18 8a6 6 0 10-12 0c0 7-3 7-3 7h18s-3 0-3-7" />
           <path d="M13.73 21a2 2 0 01-3.46 0" />
         </BellIcon>
-        {unreadCount > 0 && <Badge>{unreadCount}</Badge>}
+        {unreadCount > 0 && <Badge>{unreadCount > 99 ? '99+' : unreadCount}</Badge>}
       </BellButton>
       <Dropdown className={isOpen ? 'open' : 'closed'}>
         {isLoading && unreadItems.length === 0 ? (
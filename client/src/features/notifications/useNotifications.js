@@ -1,16 +1,16 @@
-import { useState, useCallback, useEffect } from 'react';
+import { useState, useCallback, useEffect, useRef } from 'react';
 import { snakeToCamel } from '@helper';
+import { subscribeToStream } from '@utils/eventStream';
 
 // Shared in-memory cache so multiple hooks (bell, page) reuse data
 const NOTIFICATION_CACHE_TTL = 60 * 1000; // 60 seconds
-let cachedSnapshot = null; // { items, total, unreadCount, hasMore, timestamp }
+let cachedSnapshot = null; // { items, unreadCount, hasMore, timestamp }
 let inFlightPromise = null;
 
 /**
  * Fetches notifications from GET /api/notifications and provides mark-as-read.
  * @returns {{
  *   items: Array,
- *   total: number,
  *   unreadCount: number,
  *   hasMore: boolean,
  *   isLoading: boolean,
@@ -22,7 +22,6 @@ let inFlightPromise = null;
  */
 export function useNotifications() {
   const [items, setItems] = useState([]);
-  const [total, setTotal] = useState(0);
   const [unreadCount, setUnreadCount] = useState(0);
   const [hasMore, setHasMore] = useState(false);
   const [isLoading, setIsLoading] = useState(false);
@@ -36,7 +35,6 @@ export function useNotifications() {
     const now = Date.now();
     if (now - cachedSnapshot.timestamp > NOTIFICATION_CACHE_TTL) return;
     setItems(cachedSnapshot.items);
-    setTotal(cachedSnapshot.total);
     setUnreadCount(cachedSnapshot.unreadCount);
     setHasMore(cachedSnapshot.hasMore);
   }, []);
@@ -54,7 +52,6 @@ export function useNotifications() {
           now - cachedSnapshot.timestamp < NOTIFICATION_CACHE_TTL
         ) {
           setItems(cachedSnapshot.items);
-          setTotal(cachedSnapshot.total);
           setUnreadCount(cachedSnapshot.unreadCount);
           setHasMore(cachedSnapshot.hasMore);
           setIsLoading(false);
@@ -66,12 +63,10 @@ export function useNotifications() {
           const camel = await inFlightPromise;
           const list = camel.items || [];
           setItems(list);
-          setTotal(camel.total ?? 0);
           setUnreadCount(camel.unreadCount ?? 0);
           setHasMore(camel.hasMore ?? false);
           cachedSnapshot = {
             items: list,
-            total: camel.total ?? 0,
             unreadCount: camel.unreadCount ?? 0,
             hasMore: camel.hasMore ?? false,
             timestamp: Date.now(),
@@ -107,7 +102,6 @@ export function useNotifications() {
           const combined = [...items, ...list];
           cachedSnapshot = {
             items: combined,
-            total: camel.total ?? 0,
             unreadCount: camel.unreadCount ?? 0,
             hasMore: camel.hasMore ?? false,
             timestamp: Date.now(),
@@ -116,13 +110,11 @@ export function useNotifications() {
           setItems(list);
           cachedSnapshot = {
             items: list,
-            total: camel.total ?? 0,
             unreadCount: camel.unreadCount ?? 0,
             hasMore: camel.hasMore ?? false,
             timestamp: Date.now(),
           };
         }
-        setTotal(camel.total ?? 0);
         setUnreadCount(camel.unreadCount ?? 0);
         setHasMore(camel.hasMore ?? false);
       } catch (err) {
@@ -142,6 +134,20 @@ export function useNotifications() {
     [items, PAGE_SIZE]
   );
 
+  // Refetch the first page when /api/stream says something changed
+  const fetchPageRef = useRef(fetchPage);
+  fetchPageRef.current = fetchPage;
+  useEffect(() => {
+    const refetch = () => {
+      cachedSnapshot = null;
+      fetchPageRef.current(0, false);
+    };
+    const unsubscribes = ['notification', 'notification_removed', 'resync'].map(
+      (name) => subscribeToStream(name, refetch)
+    );
+    return () => unsubscribes.forEach((unsubscribe) => unsubscribe());
+  }, []);
+
   const loadMore = useCallback(() => {
     fetchPage(items.length, true);
   }, [fetchPage, items.length]);
@@ -195,7 +201,6 @@ export function useNotifications() {
 
   return {
     items,
-    total,
     unreadCount,
     hasMore,
     isLoading,
@@ -1,7 +1,8 @@
 import { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import styled from 'styled-components';
-import { getJSON } from '@helper';
+import { getJSON, snakeToCamel } from '@helper';
+import { subscribeToStream } from '@utils/eventStream';
 import { formatRelativeTime } from '@utils/formatting';
 import GlowBullet from '@components/ui/GlowBullet';
 import Loading from '@components/ui/Loading';
@@ -106,7 +107,7 @@ function ActivityFeedList() {
 
   useEffect(() => {
     let cancelled = false;
-    (async () => {
+    const load = async () => {
       try {
         const data = await getJSON('activity');
         if (!cancelled && data?.items && Array.isArray(data.items)) {
@@ -117,12 +118,30 @@ function ActivityFeedList() {
       } finally {
         if (!cancelled) setLoading(false);
       }
-    })();
+    };
+    load();
+    // The stream lost events (queue overflow, or a reconnect it could not replay)
+    const unsubscribe = subscribeToStream('resync', load);
     return () => {
       cancelled = true;
+      unsubscribe();
     };
   }, []);
 
+  // New comments and likes arrive over /api/stream; keep the list the same length
+  useEffect(
+    () =>
+      subscribeToStream('activity', (data) => {
+        const item = snakeToCamel(data);
+        setItems((prev) => {
+          const key = `${item.type}-${item.id}`;
+          const rest = prev.filter((p) => `${p.type}-${p.id}` !== key);
+          return [item, ...rest].slice(0, Math.max(prev.length, 1));
+        });
+      }),
+    []
+  );
+
   if (loading) {
     return <Loading text="Loading" size="small" />;
   }
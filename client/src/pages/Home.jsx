@@ -220,6 +220,7 @@ export default function Home() {
           heroSearchPrimaryBand
           heroBandBackgroundImage="/images/spotlight.webp"
           searchBarVariant="hero"
+          searchSuggestions
           contentFlushTop
         >
           <>
@@ -5,10 +5,7 @@ import { UserContext } from '@context/userProvider';
 import LoginMessage from '@components/feedback/LoginMessage';
 import { NotificationList, useNotifications } from '@features/notifications';
 import Loading from '@components/ui/Loading';
-import {
-  StaticPageHeader,
-  StaticPageSubtitle,
-} from '@components/layout/staticPageStyles';
+import { StaticPageHeader } from '@components/layout/staticPageStyles';
 
 const ErrorBanner = styled.div`
   padding: 0.75rem 1rem;
@@ -21,7 +18,7 @@ const ErrorBanner = styled.div`
 
 function Notifications() {
   const { user } = useContext(UserContext);
-  const { items, total, hasMore, isLoading, error, fetchPage, loadMore, markAsRead } =
+  const { items, hasMore, isLoading, error, fetchPage, loadMore, markAsRead } =
     useNotifications();
 
   const hasMarkedFirstPage = useRef(false);
@@ -54,11 +51,6 @@ function Notifications() {
     <StaticPageShell>
       <StaticPageHeader>
         <h1>Notifications</h1>
-        {total > 0 ? (
-          <StaticPageSubtitle>
-            {`${total} notification${total !== 1 ? 's' : ''}`}
-          </StaticPageSubtitle>
-        ) : null}
       </StaticPageHeader>
 
       {error && <ErrorBanner>{error}</ErrorBanner>}
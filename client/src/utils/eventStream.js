@@ -0,0 +1,79 @@
+/**
+ * One shared EventSource on /api/stream for the whole app.
+ *
+ * Components subscribe to named events ('notification', 'activity', 'resync', ...);
+ * the connection opens with the first listener and closes with the last. If the
+ * server has streaming disabled (404) the source is closed and never retried, and
+ * callers keep their fetch-on-mount behaviour. On reconnect the browser sends
+ * Last-Event-ID and the server replays what was missed, or sends 'resync' when it
+ * cannot; listeners of 'resync' refetch.
+ */
+const listeners = new Map(); // event name -> Set of handlers
+let source = null;
+let attached = new Set(); // event names with a listener on the current source
+let unavailable = false;
+
+function dispatch(name, event) {
+  let data = {};
+  try {
+    data = event.data ? JSON.parse(event.data) : {};
+  } catch {
+    return;
+  }
+  (listeners.get(name) || []).forEach((handler) => handler(data));
+}
+
+function attach(name) {
+  if (!source || attached.has(name)) return;
+  attached.add(name);
+  source.addEventListener(name, (event) => dispatch(name, event));
+}
+
+function open() {
+  if (source || unavailable || typeof EventSource === 'undefined') return;
+  source = new EventSource('/api/stream', { withCredentials: true });
+  attached = new Set();
+  source.onerror = () => {
+    // CLOSED means the server refused the stream; OPEN/CONNECTING retries itself
+    if (source && source.readyState === EventSource.CLOSED) {
+      source = null;
+      unavailable = true;
+    }
+  };
+  listeners.forEach((_handlers, name) => attach(name));
+}
+
+function close() {
+  if (source) {
+    source.close();
+    source = null;
+  }
+}
+
+/** Subscribe to a stream event; returns an unsubscribe function. */
+function subscribeToStream(name, handler) {
+  const isNewName = !listeners.has(name);
+  if (isNewName) listeners.set(name, new Set());
+  listeners.get(name).add(handler);
+  if (!source) {
+    open();
+  } else if (isNewName) {
+    attach(name);
+  }
+  return () => {
+    const handlers = listeners.get(name);
+    if (!handlers) return;
+    handlers.delete(handler);
+    if (handlers.size === 0) listeners.delete(name);
+    if (listeners.size === 0) close();
+  };
+}
+
+/** Reopen after login/logout so the stream carries the right user channel. */
+function reconnectStream() {
+  close();
+  unavailable = false;
+  if (listeners.size > 0) open();
+}
+
+export { subscribeToStream, reconnectStream };
@@ -94,7 +94,33 @@ export const uploadDocument = async (file, reviewId, replaceText = true) => {
     throw new Error(errorData.error || 'Document upload failed');
   }
 
-  return await response.json();
+  const body = await response.json();
+  // 202: the server queued the document (DOCUMENT_JOBS); wait for the worker
+  if (response.status === 202 && body.job) {
+    const job = await waitForDocumentJob(body.job.id);
+    return { ...body, review: job.review || body.review };
+  }
+  return body;
+};
+
+const DOCUMENT_JOB_POLL_MS = 1000;
+const DOCUMENT_JOB_TIMEOUT_MS = 5 * 60 * 1000;
+
+/**
+ * Poll /api/documents/jobs/:id until the job succeeds (resolves with the job) or fails
+ */
+export const waitForDocumentJob = async (jobId) => {
+  const deadline = Date.now() + DOCUMENT_JOB_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    const response = await fetch(`/api/documents/jobs/${jobId}`);
+    const job = await response.json();
+    if (!response.ok) throw new Error(job.error || 'Document job lookup failed');
+    if (job.status === 'succeeded') return job;
+    if (job.status === 'failed') throw new Error(job.error || 'Document processing failed');
+    devDebug('[formSubmit] document job', { id: jobId, stage: job.stage, progress: job.progress });
+    await new Promise((resolve) => setTimeout(resolve, DOCUMENT_JOB_POLL_MS));
+  }
+  throw new Error('Document processing is taking longer than expected');
 };
 
 /**
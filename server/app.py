@@ -2,8 +2,10 @@
 
 from flask import request
 from flask_cors import CORS
+from movie_reviews import document_jobs, like_buffer, stream
 from movie_reviews.api import ROUTE_MODULES
 from movie_reviews.config import api, app
+from movie_reviews.search import install_search_index, install_suggest_index
 
 # Enable CORS for all routes
 CORS(app)
@@ -12,6 +14,17 @@ CORS(app)
 for register in ROUTE_MODULES:
     register(api)
 
+# Opt-in (SEARCH_MEMORY_INDEX=1): build the in-memory search index per worker
+install_search_index(app)
+# Keep /api/search/suggest's prefix index in step with this worker's commits
+install_suggest_index(app)
+# Opt-in (LIKE_WRITE_BEHIND=1): buffer like toggles and flush them in batches
+like_buffer.install(app)
+# Opt-in (STREAM_ENABLED=1): /api/stream pushes notifications and activity
+stream.install(app)
+# Opt-in (DOCUMENT_JOBS=1): uploads are queued; DOCUMENT_JOB_THREADS works them here
+document_jobs.install(app)
+
 _STATIC_EXT = frozenset(
     (
         "css",
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Round trips and latency of a like toggle: the old ORM flow vs the atomic toggle.
+
+"orm flow" replays what the endpoints used to do (SELECT parent, SELECT existing
+like, INSERT/DELETE, COMMIT, COUNT(*)); "atomic" is models.aggregates.toggle_like
+plus COMMIT. On Postgres the atomic toggle is one statement; on SQLite it is two
+or three. "write-behind" buffers a burst of toggles from different users with
+like_buffer.LikeBuffer and flushes them as one batch; its statements column is the
+total (one read per toggle plus the flush) divided by the number of toggles.
+With a Postgres URL the script also hammers one review from many threads and
+checks that reviews.like_count still equals COUNT(*) afterwards.
+
+Usage (from server/):
+  python benchmarks/bench_likes.py
+  python benchmarks/bench_likes.py --database-url postgresql://... --threads 16
+"""
+
+import argparse
+import threading
+import time
+
+from common import (
+    DEFAULT_DATABASE_URL,
+    bench_app,
+    count_queries,
+    print_table,
+    seed_catalog,
+    time_call,
+)
+
+
+def orm_flow_toggle(db, ReviewLike, Review, user_id, review_id):
+    """The pre-aggregate endpoint body, kept here as the baseline."""
+    review = db.session.get(Review, review_id)
+    if not review:
+        return None
+    existing = ReviewLike.query.filter_by(user_id=user_id, review_id=review_id).first()
+    if existing:
+        db.session.delete(existing)
+    else:
+        db.session.add(ReviewLike(user_id=user_id, review_id=review_id))
+    db.session.commit()
+    return ReviewLike.query.filter_by(review_id=review_id).count()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--clicks", type=int, default=50, help="toggles per thread")
+    args = parser.parse_args()
+
+    app = bench_app(args.database_url)
+
+    from movie_reviews.config import db
+    from movie_reviews.like_buffer import LikeBuffer
+    from movie_reviews.models import Review, ReviewLike, User
+    from movie_reviews.models.aggregates import reconcile, toggle_like
+
+    with app.app_context():
+        seed_catalog(movies=20, reviews_per_movie=1, comments_per_review=0, users=50)
+        review_id = db.session.scalar(db.select(Review.id).order_by(Review.id))
+        user_ids = list(db.session.scalars(db.select(User.id)))
+
+        def atomic():
+            toggle_like(db.session, ReviewLike, user_ids[0], review_id)
+            db.session.commit()
+
+        def orm_flow():
+            orm_flow_toggle(db, ReviewLike, Review, user_ids[1], review_id)
+
+        rows = []
+        for label, toggle in (("orm flow", orm_flow), ("atomic", atomic)):
+            with count_queries(db.engine) as statements:
+                toggle()
+                toggle()
+            median, p99 = time_call(toggle, repeat=args.repeat)
+            rows.append((label, statements[0] / 2, f"{median:.3f}", f"{p99:.3f}"))
+
+        buffer = LikeBuffer()
+        burst = user_ids[2:]
+        with count_queries(db.engine) as statements:
+            start = time.perf_counter()
+            for user_id in burst:
+                buffer.toggle(ReviewLike, user_id, review_id)
+            buffer.flush()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        per_toggle = elapsed_ms / len(burst)
+        rows.append(
+            (
+                "write-behind",
+                round(statements[0] / len(burst), 2),
+                f"{per_toggle:.3f}",
+                "-",
+            )
+        )
+
+        print(f"{db.engine.dialect.name}, {args.repeat} toggles per flow\n")
+        print_table(("flow", "statements", "median ms", "p99 ms"), rows)
+        # The ORM flow goes through after_flush, so the counter stays consistent
+        drift = sum(len(found) for found in reconcile().values())
+        print(f"\ndrift after sequential toggles: {drift}")
+        dialect = db.engine.dialect.name
+
+    if dialect != "postgresql":
+        print("Concurrency check skipped: needs --database-url postgresql://...")
+        return 0 if drift == 0 else 1
+
+    errors = []
+
+    def hammer(user_id):
+        with app.app_context():
+            try:
+                for _ in range(args.clicks):
+                    toggle_like(db.session, ReviewLike, user_id, review_id)
+                    db.session.commit()
+            except Exception as exc:  # report, don't hang the join
+                errors.append(exc)
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+    # Two threads per user so double-clicks from the same account collide too
+    workers = [
+        threading.Thread(target=hammer, args=(user_ids[2 + i // 2],))
+        for i in range(args.threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    with app.app_context():
+        stored = db.session.scalar(
+            db.select(Review.like_count).where(Review.id == review_id)
+        )
+        actual = ReviewLike.query.filter_by(review_id=review_id).count()
+    ok = not errors and stored == actual
+    print(
+        f"concurrent: {args.threads} threads x {args.clicks} toggles, "
+        f"errors={len(errors)} like_count={stored} count(*)={actual} "
+        f"{'PASS' if ok else 'FAIL'}"
+    )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+PDF text extraction: the old one-thread page loop vs utils.pdf_extraction.
+
+"sequential" replays what DocumentProcessor.extract_text_from_pdf used to do
+(pdfplumber layout extraction page by page, ``text +=``). "chunked inline" is the
+new engine without a pool, and "pool xN" runs it on N worker processes (the pool
+is started before timing). Every engine's output is checked against the sequential
+text. Without ``--corpus`` the script writes a corpus of multi-page text PDFs to a
+temporary folder; with it, every ``*.pdf`` in the folder is used.
+
+Usage (from server/):
+  python benchmarks/bench_pdf_extract.py
+  python benchmarks/bench_pdf_extract.py --docs 4 --pages 60 --workers 2 4
+  python benchmarks/bench_pdf_extract.py --corpus ~/essays
+"""
+
+import argparse
+import random
+import tempfile
+from pathlib import Path
+
+from common import add_import_paths, print_table, time_call
+
+WORDS = (
+    "the film frames its heroine against a city that never quite sleeps while "
+    "the camera lingers on doorways mirrors and stairwells as if the house itself "
+    "were a witness to every quiet betrayal and every small mercy"
+).split()
+
+
+def _pdf_string(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path, pages, lines_per_page=46, seed=0):
+    """A plain multi-page PDF (Helvetica text lines), no third-party writer."""
+    rng = random.Random(seed)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for number in range(pages):
+        lines = [f"Page {number + 1}"] + [
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 14)))
+            for _ in range(lines_per_page)
+        ]
+        body = "BT /F1 10 Tf 14 TL 56 760 Td " + " ".join(
+            f"({_pdf_string(line)}) Tj T*" for line in lines
+        )
+        stream = body.encode("latin-1") + b" ET"
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref_at,
+    )
+    Path(path).write_bytes(bytes(out))
+
+
+def sequential_extract(file_path):
+    """The pre-pool DocumentProcessor.extract_text_from_pdf body (baseline)."""
+    import pdfplumber
+
+    text = ""
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text(layout=True, x_tolerance=3, y_tolerance=3)
+            if page_text:
+                text += page_text + "\n\n"
+    return text.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", type=Path, help="folder of PDFs to use instead")
+    parser.add_argument("--docs", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    add_import_paths()
+    from movie_reviews.utils import pdf_extraction
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.corpus:
+            corpus = sorted(args.corpus.glob("*.pdf"))
+        else:
+            corpus = []
+            for n in range(args.docs):
+                path = Path(scratch) / f"essay_{n}.pdf"
+                write_text_pdf(path, args.pages, seed=n)
+                corpus.append(path)
+        if not corpus:
+            print("No PDFs found")
+            return 1
+        pages = sum(pdf_extraction.count_pages(str(path)) for path in corpus)
+
+        def run_all(extract):
+            return [extract(str(path)) for path in corpus]
+
+        expected = run_all(sequential_extract)
+        engines = [
+            ("sequential", sequential_extract),
+            (
+                "chunked inline",
+                lambda path: pdf_extraction.extract_pdf_text(path, workers=0),
+            ),
+        ]
+        for workers in args.workers:
+            engines.append(
+                (
+                    f"pool x{workers}",
+                    lambda path, workers=workers: pdf_extraction.extract_pdf_text(
+                        path, workers=workers
+                    ),
+                )
+            )
+
+        rows = []
+        ok = True
+        for label, extract in engines:
+            if label.startswith("pool"):
+                # Pool size is fixed at first use; start a fresh one per row
+                if pdf_extraction._pool is not None:
+                    pdf_extraction._drop_pool(pdf_extraction._pool)
+                run_all(extract)  # warm-up: spawn the workers
+            same = run_all(extract) == expected
+            ok = ok and same
+            median, _p99 = time_call(
+                lambda extract=extract: run_all(extract), repeat=args.repeat
+            )
+            rows.append(
+                (
+                    label,
+                    f"{median:.0f}",
+                    f"{pages / (median / 1000):.1f}",
+                    "yes" if same else "NO",
+                )
+            )
+
+    print(f"{len(corpus)} PDFs, {pages} pages\n")
+    print_table(("engine", "median ms (corpus)", "pages/s", "same text"), rows)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
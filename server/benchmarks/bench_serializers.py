@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Compare SerializerMixin.to_dict() with the compiled schemas in movie_reviews.serializers.
+
+For each model the "to_dict" row loads rows plainly and serializes them the way the
+endpoints used to (lazy loads included); the "schema" row loads with
+``schema.load_options()`` and serializes with ``schema.dump``. Both include query time.
+
+Usage (from server/):
+  python benchmarks/bench_serializers.py
+  python benchmarks/bench_serializers.py --movies 500 --database-url postgresql://...
+"""
+
+import argparse
+import json
+
+from common import (
+    DEFAULT_DATABASE_URL,
+    bench_app,
+    count_queries,
+    print_table,
+    seed_catalog,
+    time_call,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--movies", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    app = bench_app(args.database_url)
+
+    from movie_reviews.config import db
+    from movie_reviews.models import Director, Movie, Review, ReviewComment
+    from movie_reviews.serializers import (
+        COMMENT_DETAIL,
+        DIRECTOR_DETAIL,
+        MOVIE_DETAIL,
+        REVIEW_DETAIL,
+    )
+
+    cases = [
+        ("Movie", Movie, MOVIE_DETAIL),
+        ("Review", Review, REVIEW_DETAIL),
+        ("Director", Director, DIRECTOR_DETAIL),
+        ("ReviewComment", ReviewComment, COMMENT_DETAIL),
+    ]
+
+    with app.app_context():
+        seed_catalog(movies=args.movies)
+        rows = []
+        for label, model, schema in cases:
+
+            def legacy(model=model):
+                db.session.expunge_all()
+                return [obj.to_dict() for obj in model.query.all()]
+
+            def compiled(model=model, schema=schema):
+                db.session.expunge_all()
+                return schema.dump_many(model.query.options(*schema.load_options()))
+
+            for name, fn in (("to_dict", legacy), ("schema", compiled)):
+                with count_queries(db.engine) as queries:
+                    payload = fn()
+                size_kb = len(json.dumps(payload, default=str)) / 1024
+                median_ms, p99_ms = time_call(fn, repeat=args.repeat)
+                rows.append(
+                    (
+                        label,
+                        name,
+                        len(payload),
+                        queries[0],
+                        f"{size_kb:.0f}",
+                        f"{median_ms:.1f}",
+                        f"{p99_ms:.1f}",
+                    )
+                )
+
+    print_table(
+        ("model", "serializer", "rows", "queries", "json_kb", "median_ms", "p99_ms"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Latency of /api/search/suggest against a synthetic catalog.
+
+Seeds movies with varied multi-word titles (plus the seed script's directors and
+tags), warms the prefix index, then replays typeahead-style prefixes (1-6
+characters of a random title word, sometimes two words). It reports the raw index
+lookup and the full request through the Flask test client, and exits non-zero if
+the endpoint's p99 is over the target.
+
+Usage (from server/):
+  python benchmarks/bench_suggest.py
+  python benchmarks/bench_suggest.py --movies 20000 --queries 5000
+"""
+
+import argparse
+import random
+import sys
+
+from common import DEFAULT_DATABASE_URL, bench_app, print_table, seed_catalog, time_call
+
+WORDS = (
+    "rear window vertigo psycho notorious rebecca suspicion lifeboat spellbound "
+    "rope strangers train stage fright dial murder trouble harry wrong man north "
+    "northwest birds marnie frenzy family plot topaz torn curtain sabotage lady "
+    "vanishes secret agent young innocent jamaica inn shadow doubt saboteur "
+    "foreign correspondent paradine case under capricorn confess"
+).split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--movies", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--target-p99-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    app = bench_app(args.database_url)
+
+    from movie_reviews.config import db
+    from movie_reviews.models import Movie
+    from movie_reviews.search import suggest_index
+
+    rng = random.Random(7)
+    with app.app_context():
+        seed_catalog(
+            movies=args.movies, reviews_per_movie=0, comments_per_review=0, tags=200
+        )
+        titles = {}
+        for movie_id in db.session.scalars(db.select(Movie.id)):
+            words = rng.sample(WORDS, rng.randint(1, 4))
+            titles[movie_id] = " ".join(words).title() + f" {movie_id}"
+        db.session.execute(
+            db.update(Movie),
+            [{"id": mid, "title": title} for mid, title in titles.items()],
+        )
+        db.session.commit()
+        suggest_index.build()
+        entries = suggest_index.stats()["entries"]
+
+    prefixes = []
+    for _ in range(args.queries):
+        word = rng.choice(WORDS)
+        prefix = word[: rng.randint(1, min(6, len(word)))]
+        if rng.random() < 0.25:
+            prefix = f"{rng.choice(WORDS)} {prefix}"
+        prefixes.append(prefix)
+
+    client = app.test_client()
+    rows = []
+    with app.test_request_context():
+        lookups = iter(prefixes)
+        median, p99 = time_call(
+            lambda: suggest_index.suggest(next(lookups)), repeat=len(prefixes)
+        )
+        rows.append(("index lookup", f"{median:.3f}", f"{p99:.3f}"))
+
+    requests = iter(prefixes)
+    median, p99 = time_call(
+        lambda: client.get("/api/search/suggest", query_string={"q": next(requests)}),
+        repeat=len(prefixes),
+    )
+    rows.append(("GET /api/search/suggest", f"{median:.3f}", f"{p99:.3f}"))
+
+    print(f"{args.movies} movies, {entries} index entries, {args.queries} queries\n")
+    print_table(("path", "median ms", "p99 ms"), rows)
+
+    ok = p99 < args.target_p99_ms
+    print(f"\np99 target {args.target_p99_ms} ms: {'PASS' if ok else 'FAIL'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Latency of the TMDb-backed endpoints against the offline stand-in.
+
+Starts ``tmdb_standin`` on a local port with the given latency and error rate,
+points the app's TMDb client at it, and times PullMovieInfo searches,
+DiscoverMovies pages, the /api/movies/<id>/tmdb inspector and (on Postgres)
+Movies.post. The "upstream" column is the average number of stand-in requests
+per call. The response cache is off unless ``--cache`` is given, so every call
+pays the upstream round trips.
+
+Usage (from server/):
+  python benchmarks/bench_tmdb.py
+  python benchmarks/bench_tmdb.py --latency-ms 120 --jitter-ms 60 --error-rate 0.05
+  python benchmarks/bench_tmdb.py --database-url postgresql://... --cache
+"""
+
+import argparse
+import os
+import random
+
+from common import DEFAULT_DATABASE_URL, bench_app, print_table, seed_catalog, time_call
+from tmdb_standin import (
+    TITLE_WORDS,
+    StandinConfig,
+    SyntheticCatalog,
+    TMDbStandin,
+    serve_in_thread,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--cache", action="store_true", help="keep the TMDb cache on")
+    args = parser.parse_args()
+
+    standin = TMDbStandin(
+        catalog=SyntheticCatalog(movies=2000),
+        config=StandinConfig(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            error_statuses=[429, 503],
+        ),
+    )
+    server, base_url = serve_in_thread(standin)
+
+    # The client singleton reads these when it is first created
+    os.environ["TMDB_BASE_URL"] = base_url
+    os.environ.setdefault("MOVIE_API_KEY", "standin")
+    if not args.cache:
+        os.environ["TMDB_CACHE_MAX_ENTRIES"] = "0"
+
+    app = bench_app(args.database_url)
+
+    from movie_reviews.config import db
+    from movie_reviews.models import Movie
+
+    with app.app_context():
+        seed_catalog(movies=50, reviews_per_movie=0, comments_per_review=0)
+        movie_ids = list(db.session.scalars(db.select(Movie.id)))
+
+    client = app.test_client()
+    rng = random.Random(3)
+    new_external_ids = iter(range(100100, 102000))
+
+    scenarios = [
+        (
+            "GET /api/pull_movie_info?search=",
+            lambda: client.get(
+                "/api/pull_movie_info", query_string={"search": rng.choice(TITLE_WORDS)}
+            ),
+        ),
+        (
+            "GET /api/discover_movies",
+            lambda: client.get(
+                "/api/discover_movies", query_string={"page": rng.randint(1, 50)}
+            ),
+        ),
+        (
+            "GET /api/movies/<id>/tmdb",
+            lambda: client.get(f"/api/movies/{rng.choice(movie_ids)}/tmdb"),
+        ),
+    ]
+    if app.config["SQLALCHEMY_DATABASE_URI"].startswith("postgresql"):
+        scenarios.append(
+            (
+                "POST /api/movies",
+                lambda: client.post(
+                    "/api/movies",
+                    json={
+                        "external_id": next(new_external_ids),
+                        "title": "Stand-in Movie",
+                        "original_title": "Stand-in Movie",
+                        "original_language": "en",
+                        "overview": "Created by bench_tmdb.py",
+                    },
+                ),
+            )
+        )
+    else:
+        print("Skipping POST /api/movies: SQLite's Date type rejects TMDb date strings")
+
+    rows = []
+    for label, call in scenarios:
+        statuses = []
+        standin.stats.clear()
+        median, p99 = time_call(
+            lambda call=call, statuses=statuses: statuses.append(call().status_code),
+            repeat=args.repeat,
+        )
+        upstream = standin.stats["requests"] / args.repeat
+        ok = sum(1 for status in statuses if status < 400)
+        rows.append(
+            (
+                label,
+                f"{median:.1f}",
+                f"{p99:.1f}",
+                f"{upstream:.2f}",
+                f"{ok}/{len(statuses)}",
+            )
+        )
+
+    server.shutdown()
+    print(
+        f"\nstand-in latency {args.latency_ms}±{args.jitter_ms} ms, "
+        f"error rate {args.error_rate}, cache {'on' if args.cache else 'off'}\n"
+    )
+    print_table(("path", "median ms", "p99 ms", "upstream", "ok"), rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
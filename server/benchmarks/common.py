@@ -0,0 +1,169 @@
+"""
+Shared setup for the scripts in this folder.
+
+Benchmarks run against a throwaway database (SQLite by default) so they never touch
+DATABASE_URL from the environment. Pass ``--database-url postgresql://...`` to a
+script to measure against a scratch Postgres instead.
+"""
+
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_DATABASE_URL = "sqlite://"
+
+
+def add_import_paths():
+    """Make ``app`` and the ``movie_reviews`` package importable."""
+    for path in (SERVER_DIR, SERVER_DIR / "src"):
+        if str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+
+
+def bench_app(database_url=DEFAULT_DATABASE_URL):
+    """Import the Flask app bound to ``database_url`` and create all tables."""
+    os.environ.pop("DATABASE_PUBLIC_URL", None)
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("FLASK_ENV", "development")
+    os.environ.setdefault("APP_LOG_LEVEL", "WARNING")
+    add_import_paths()
+
+    from app import app
+    from movie_reviews.config import db
+
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def seed_catalog(
+    movies=200, reviews_per_movie=1, comments_per_review=5, users=20, tags=30
+):
+    """Insert a synthetic catalog; call inside an app context."""
+    from movie_reviews.config import db
+    from movie_reviews.models import (
+        CommentLike,
+        Director,
+        Movie,
+        Review,
+        ReviewComment,
+        ReviewLike,
+        Tag,
+        User,
+    )
+
+    user_rows = []
+    for i in range(users):
+        user = User(username=f"bench_user_{i}", email=f"bench{i}@example.com")
+        user._password_hash = "x"
+        user_rows.append(user)
+    db.session.add_all(user_rows)
+
+    tag_rows = [Tag(name=f"tag {i}") for i in range(tags)]
+    db.session.add_all(tag_rows)
+
+    directors = [
+        Director(
+            name=f"Director {i}",
+            cover_photo="https://example.com/director.jpg",
+            biography="Biography " * 40,
+        )
+        for i in range(max(1, movies // 10))
+    ]
+    db.session.add_all(directors)
+    db.session.flush()
+
+    body = "<p>" + "Long form review prose. " * 400 + "</p>"
+    started = datetime(2024, 1, 1)
+    for i in range(movies):
+        movie = Movie(
+            external_id=100000 + i,
+            title=f"Bench Movie {i}",
+            original_title=f"Bench Movie {i}",
+            original_language="en",
+            overview="Overview " * 30,
+            release_date=date(1940, 1, 1) + timedelta(days=97 * i),
+            cover_photo="https://example.com/poster.jpg",
+            director_id=directors[i % len(directors)].id,
+        )
+        db.session.add(movie)
+        db.session.flush()
+        for r in range(reviews_per_movie):
+            review = Review(
+                movie_id=movie.id,
+                title=f"Review {i}.{r}",
+                rating=1 + (i % 7),
+                review_text=body,
+                content_type="review",
+            )
+            review.tags = [tag_rows[(i + k) % len(tag_rows)] for k in range(3)]
+            db.session.add(review)
+            db.session.flush()
+            for u in range(3):
+                db.session.add(
+                    ReviewLike(
+                        user_id=user_rows[(i + u) % len(user_rows)].id,
+                        review_id=review.id,
+                    )
+                )
+            for c in range(comments_per_review):
+                comment = ReviewComment(
+                    review_id=review.id,
+                    user_id=user_rows[(i + c) % len(user_rows)].id,
+                    body=f"Comment {c} on review {review.id}",
+                    created_at=started + timedelta(minutes=i * 10 + c),
+                )
+                db.session.add(comment)
+                db.session.flush()
+                db.session.add(
+                    CommentLike(
+                        user_id=user_rows[(i + c + 1) % len(user_rows)].id,
+                        comment_id=comment.id,
+                    )
+                )
+    db.session.commit()
+
+
+@contextmanager
+def count_queries(engine):
+    """Yield a one-item list holding the number of SQL statements executed."""
+    from sqlalchemy import event
+
+    counter = [0]
+
+    def _on_execute(*_args, **_kwargs):
+        counter[0] += 1
+
+    event.listen(engine, "before_cursor_execute", _on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _on_execute)
+
+
+def time_call(fn, repeat=20):
+    """Run ``fn`` ``repeat`` times; return (median_ms, p99_ms)."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return statistics.median(samples), p99
+
+
+def print_table(headers, rows):
+    widths = [
+        max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)
+    ]
+    line = "  ".join(str(h).ljust(w) for h, w in zip(headers, widths))
+    print(line)
+    print("-" * len(line))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the TMDb v3 API, for load tests and benchmarks.
+
+Serves the endpoints this project calls (search/movie, search/person,
+person/{id}, person/{id}/movie_credits, movie/{id} with append_to_response,
+movie/{id}/credits, movie/{id}/release_dates, movie/popular and discover/movie)
+from a deterministic synthetic catalog. Movie ids start at 100000, matching the
+``external_id`` values ``common.seed_catalog`` writes, so seeded movies resolve.
+
+Responses can also come from recorded fixtures: with ``--record DIR`` every miss
+is proxied to ``--upstream`` (the real API, using the caller's api_key) and the
+200 body is saved under DIR; with ``--fixtures DIR`` those files are replayed
+before falling back to the synthetic catalog.
+
+Latency (``--latency-ms``/``--jitter-ms``, plus ``--route-latency PREFIX=MS``
+overrides) and failures (``--error-rate`` with ``--error-status``, and
+``--hang-rate`` for requests that outlive client timeouts) are injected per
+request. ``GET/PUT /__standin__/config`` reads or changes those knobs while the
+server runs, and ``GET/DELETE /__standin__/stats`` reads or resets counters.
+
+Usage (from server/):
+  python benchmarks/tmdb_standin.py --port 8787 --latency-ms 80 --jitter-ms 40
+  TMDB_BASE_URL=http://127.0.0.1:8787/3 MOVIE_API_KEY=standin python app.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import requests
+from common import add_import_paths
+from werkzeug.serving import WSGIRequestHandler, make_server, run_simple
+from werkzeug.wrappers import Request, Response
+
+add_import_paths()
+
+from movie_reviews.utils.tmdb_cache import cache_key  # noqa: E402
+
+API_PREFIX = "/3"
+CONTROL_PREFIX = "/__standin__"
+MOVIE_ID_BASE = 100000
+PERSON_ID_BASE = 900000
+PAGE_SIZE = 20
+MAX_PAGE = 500  # TMDb refuses deeper pages
+
+TITLE_WORDS = (
+    "rear window vertigo psycho notorious rebecca suspicion lifeboat spellbound "
+    "rope strangers train stage fright dial murder trouble harry wrong man north "
+    "birds marnie frenzy family plot topaz torn curtain sabotage lady vanishes "
+    "secret agent young innocent shadow doubt saboteur foreign correspondent"
+).split()
+FIRST_NAMES = "alfred billy fritz howard ida john orson agnes akira jean".split()
+LAST_NAMES = (
+    "hitchcock wilder lang hawks lupino ford welles varda kurosawa renoir".split()
+)
+GENRE_IDS = (18, 35, 53, 80, 9648, 10749, 27, 878)
+COUNTRIES = ("US", "GB", "FR", "DE", "JP", "IT")
+
+NOT_FOUND = {
+    "success": False,
+    "status_code": 34,
+    "status_message": "The resource you requested could not be found.",
+}
+
+
+class SyntheticCatalog:
+    """Deterministic movies and directors shaped like TMDb payloads."""
+
+    def __init__(self, movies=5000, seed=7):
+        rng = random.Random(seed)
+        self.people = {}
+        for i in range(max(1, movies // 10)):
+            person_id = PERSON_ID_BASE + i
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}".title()
+            self.people[person_id] = {
+                "id": person_id,
+                "name": name,
+                "known_for_department": "Directing",
+                "biography": f"{name} is a synthetic director. " * 8,
+                "profile_path": f"/person{person_id}.jpg",
+                "popularity": round(rng.uniform(1, 50), 3),
+            }
+
+        person_ids = list(self.people)
+        self.movies = {}
+        self.director_of = {}
+        for i in range(movies):
+            movie_id = MOVIE_ID_BASE + i
+            title = " ".join(rng.sample(TITLE_WORDS, rng.randint(1, 4))).title()
+            release = f"{1930 + rng.randint(0, 90)}-{rng.randint(1, 12):02d}-15"
+            self.movies[movie_id] = {
+                "id": movie_id,
+                "title": title,
+                "original_title": title,
+                "original_language": "en",
+                "overview": f"A synthetic movie called {title}. " * 4,
+                "release_date": release,
+                "poster_path": f"/poster{movie_id}.jpg",
+                "backdrop_path": f"/backdrop{movie_id}.jpg",
+                "genre_ids": rng.sample(GENRE_IDS, 2),
+                "popularity": round(rng.uniform(1, 500), 3),
+                "vote_average": round(rng.uniform(4, 9), 1),
+                "vote_count": rng.randint(10, 20000),
+                "adult": False,
+                "video": False,
+            }
+            self.director_of[movie_id] = person_ids[i % len(person_ids)]
+        self.origin_country = {
+            movie_id: COUNTRIES[movie_id % len(COUNTRIES)] for movie_id in self.movies
+        }
+        self.by_popularity = sorted(
+            self.movies.values(), key=lambda m: m["popularity"], reverse=True
+        )
+
+    # Payload builders ------------------------------------------------------
+
+    def movie_details(self, movie_id):
+        movie = self.movies[movie_id]
+        return {
+            **movie,
+            "origin_country": [self.origin_country[movie_id]],
+            "genres": [
+                {"id": gid, "name": f"Genre {gid}"} for gid in movie["genre_ids"]
+            ],
+            "runtime": 80 + movie_id % 70,
+            "status": "Released",
+        }
+
+    def credits(self, movie_id):
+        person = self.people[self.director_of[movie_id]]
+        return {
+            "id": movie_id,
+            "cast": [],
+            "crew": [
+                {
+                    "id": person["id"],
+                    "name": person["name"],
+                    "job": "Director",
+                    "department": "Directing",
+                    "profile_path": person["profile_path"],
+                }
+            ],
+        }
+
+    def release_dates(self, movie_id):
+        home = self.origin_country[movie_id]
+        release = self.movies[movie_id]["release_date"]
+        return {
+            "id": movie_id,
+            "results": [
+                {
+                    "iso_3166_1": country,
+                    "release_dates": [
+                        {
+                            "release_date": f"{release}T00:00:00.000Z",
+                            "type": 3 if country == home else 4,
+                        }
+                    ],
+                }
+                for country in sorted({home, "US"})
+            ],
+        }
+
+    def movie_credits(self, person_id):
+        crew = [
+            {**self.movies[movie_id], "job": "Director", "department": "Directing"}
+            for movie_id, director_id in self.director_of.items()
+            if director_id == person_id
+        ]
+        return {"id": person_id, "cast": [], "crew": crew}
+
+    def search_movies(self, query):
+        words = query.casefold().split()
+        return [
+            movie
+            for movie in self.by_popularity
+            if all(word in movie["title"].casefold() for word in words)
+        ]
+
+    def search_people(self, query):
+        words = query.casefold().split()
+        return [
+            {key: person[key] for key in ("id", "name", "known_for_department")}
+            for person in self.people.values()
+            if all(word in person["name"].casefold() for word in words)
+        ]
+
+    def discover(self, args):
+        genre = args.get("with_genres")
+        gte = args.get("primary_release_date.gte")
+        lte = args.get("primary_release_date.lte")
+        results = []
+        for movie in self.by_popularity:
+            if genre and genre.isdigit() and int(genre) not in movie["genre_ids"]:
+                continue
+            if gte and movie["release_date"] < gte:
+                continue
+            if lte and movie["release_date"] > lte:
+                continue
+            results.append(movie)
+        return results
+
+
+def _paginate(results, args):
+    try:
+        page = max(1, min(MAX_PAGE, int(args.get("page", 1))))
+    except (TypeError, ValueError):
+        page = 1
+    start = (page - 1) * PAGE_SIZE
+    return {
+        "page": page,
+        "results": results[start : start + PAGE_SIZE],
+        "total_pages": max(1, -(-len(results) // PAGE_SIZE)),
+        "total_results": len(results),
+    }
+
+
+MOVIE_RE = re.compile(r"^/movie/(\d+)(?:/(credits|release_dates))?$")
+PERSON_RE = re.compile(r"^/person/(\d+)(?:/(movie_credits))?$")
+
+
+def synthetic_response(catalog, path, args):
+    """``(status, body)`` for a TMDb path relative to /3."""
+    if path == "/search/movie":
+        return 200, _paginate(catalog.search_movies(args.get("query", "")), args)
+    if path == "/search/person":
+        return 200, _paginate(catalog.search_people(args.get("query", "")), args)
+    if path == "/discover/movie":
+        return 200, _paginate(catalog.discover(args), args)
+    if path == "/movie/popular":
+        return 200, _paginate(catalog.by_popularity, args)
+
+    match = MOVIE_RE.match(path)
+    if match:
+        movie_id, section = int(match.group(1)), match.group(2)
+        if movie_id not in catalog.movies:
+            return 404, NOT_FOUND
+        if section == "credits":
+            return 200, catalog.credits(movie_id)
+        if section == "release_dates":
+            return 200, catalog.release_dates(movie_id)
+        body = catalog.movie_details(movie_id)
+        appended = (args.get("append_to_response") or "").split(",")
+        if "credits" in appended:
+            body["credits"] = catalog.credits(movie_id)
+        if "release_dates" in appended:
+            body["release_dates"] = catalog.release_dates(movie_id)
+        return 200, body
+
+    match = PERSON_RE.match(path)
+    if match:
+        person_id = int(match.group(1))
+        if person_id not in catalog.people:
+            return 404, NOT_FOUND
+        if match.group(2):
+            return 200, catalog.movie_credits(person_id)
+        return 200, catalog.people[person_id]
+
+    return 404, NOT_FOUND
+
+
+class FixtureStore:
+    """Recorded 200 bodies, one JSON file per (path, params) cache key."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _file(self, key):
+        return self.directory / f"{hashlib.sha1(key.encode()).hexdigest()[:20]}.json"
+
+    def get(self, path, args):
+        key = cache_key(path, args)
+        fixture = self._file(key)
+        if not fixture.exists():
+            return None
+        return json.loads(fixture.read_text())["body"]
+
+    def put(self, path, args, body):
+        key = cache_key(path, args)
+        self._file(key).write_text(json.dumps({"key": key, "body": body}, indent=1))
+
+
+class StandinConfig:
+    """Injection knobs; changed at runtime through /__standin__/config."""
+
+    FIELDS = (
+        "latency_ms",
+        "jitter_ms",
+        "route_latency",
+        "error_rate",
+        "error_statuses",
+        "hang_rate",
+        "hang_seconds",
+        "require_api_key",
+    )
+
+    def __init__(self, **values):
+        self.latency_ms = 0.0
+        self.jitter_ms = 0.0
+        self.route_latency = {}  # path prefix -> ms, replaces latency_ms
+        self.error_rate = 0.0
+        self.error_statuses = [503]
+        self.hang_rate = 0.0
+        self.hang_seconds = 30.0
+        self.require_api_key = True
+        self.update(values)
+
+    def update(self, values):
+        unknown = set(values) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown config fields: {sorted(unknown)}")
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def delay_for(self, path, rng):
+        base = self.latency_ms
+        for prefix, ms in self.route_latency.items():
+            if path.startswith(prefix):
+                base = ms
+                break
+        return max(0.0, base + rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+
+
+class TMDbStandin:
+    """WSGI app; see the module docstring."""
+
+    def __init__(
+        self, catalog=None, config=None, fixtures=None, record_to=None, upstream=None
+    ):
+        self.catalog = catalog or SyntheticCatalog()
+        self.config = config or StandinConfig()
+        self.fixtures = FixtureStore(fixtures) if fixtures else None
+        self.recorder = FixtureStore(record_to) if record_to else None
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self._rng = random.Random(11)
+        self._lock = threading.Lock()
+        self.stats = Counter()
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def __call__(self, environ, start_response):
+        request = Request(environ)
+        if request.path.startswith(CONTROL_PREFIX):
+            response = self._control(request)
+        else:
+            response = self._api(request)
+        return response(environ, start_response)
+
+    def _control(self, request):
+        if request.path == f"{CONTROL_PREFIX}/config":
+            if request.method == "PUT":
+                try:
+                    self.config.update(request.get_json(force=True) or {})
+                except ValueError as exc:
+                    return _json({"error": str(exc)}, 400)
+            return _json(self.config.as_dict())
+        if request.path == f"{CONTROL_PREFIX}/stats":
+            with self._lock:
+                if request.method == "DELETE":
+                    self.stats.clear()
+                return _json(dict(self.stats))
+        return _json(NOT_FOUND, 404)
+
+    def _api(self, request):
+        if not request.path.startswith(f"{API_PREFIX}/"):
+            return _json(NOT_FOUND, 404)
+        path = request.path[len(API_PREFIX) :]
+        args = request.args.to_dict()
+        route = re.sub(r"\d+", "{id}", path)
+        self._count("requests")
+        self._count(f"GET {route}")
+
+        config = self.config
+        if config.require_api_key and not args.get("api_key"):
+            self._count("unauthorized")
+            return _json(
+                {
+                    "success": False,
+                    "status_code": 7,
+                    "status_message": "Invalid API key",
+                },
+                401,
+            )
+
+        with self._lock:
+            roll = self._rng.random()
+            delay = config.delay_for(path, self._rng)
+            status = self._rng.choice(config.error_statuses or [503])
+        if roll < config.hang_rate:
+            self._count("injected_hangs")
+            time.sleep(config.hang_seconds)
+        elif delay:
+            time.sleep(delay)
+        if config.hang_rate <= roll < config.hang_rate + config.error_rate:
+            self._count(f"injected_{status}")
+            headers = {"Retry-After": "1"} if status == 429 else None
+            return _json(
+                {"success": False, "status_message": "Injected"}, status, headers
+            )
+
+        status, body = self._lookup(path, args)
+        return _json(body, status)
+
+    def _lookup(self, path, args):
+        if self.fixtures is not None:
+            body = self.fixtures.get(path, args)
+            if body is not None:
+                self._count("fixture_hits")
+                return 200, body
+        if self.recorder is not None and self.upstream:
+            upstream = requests.get(f"{self.upstream}{path}", params=args, timeout=10)
+            self._count("upstream_requests")
+            if upstream.status_code == 200:
+                self.recorder.put(path, args, upstream.json())
+                return 200, upstream.json()
+            return upstream.status_code, upstream.text
+        return synthetic_response(self.catalog, path, args)
+
+
+def _json(body, status=200, headers=None):
+    return Response(
+        json.dumps(body) if not isinstance(body, str) else body,
+        status=status,
+        headers=headers,
+        mimetype="application/json",
+    )
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def serve_in_thread(app, host="127.0.0.1", port=0):
+    """Start ``app`` on a daemon thread; returns ``(server, base_url)``."""
+    server = make_server(
+        host, port, app, threaded=True, request_handler=_QuietRequestHandler
+    )
+    threading.Thread(
+        target=server.serve_forever, name="tmdb-standin", daemon=True
+    ).start()
+    return server, f"http://{host}:{server.server_port}{API_PREFIX}"
+
+
+def _route_latency(values):
+    overrides = {}
+    for value in values or []:
+        prefix, _, ms = value.partition("=")
+        overrides[prefix] = float(ms)
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--movies", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--route-latency",
+        action="append",
+        metavar="PREFIX=MS",
+        help="per-path latency, e.g. /search/person=400 (repeatable)",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--error-status",
+        type=int,
+        action="append",
+        help="status for injected errors (repeatable; default 503)",
+    )
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=30.0)
+    parser.add_argument("--fixtures", help="replay recorded responses from DIR")
+    parser.add_argument("--record", metavar="DIR", help="proxy misses and save them")
+    parser.add_argument("--upstream", default="https://api.themoviedb.org/3")
+    args = parser.parse_args()
+
+    config = StandinConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        route_latency=_route_latency(args.route_latency),
+        error_rate=args.error_rate,
+        error_statuses=args.error_status or [503],
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+    )
+    app = TMDbStandin(
+        catalog=SyntheticCatalog(args.movies),
+        config=config,
+        fixtures=args.fixtures or args.record,
+        record_to=args.record,
+        upstream=args.upstream if args.record else None,
+    )
+    print(f"TMDb stand-in on http://{args.host}:{args.port}{API_PREFIX}")
+    run_simple(args.host, args.port, app, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""adding activity feed indices
+
+Revision ID: 2d61b9e4a7f3
+Revises: e5a9c3f71d08
+Create Date: 2026-10-18 18:55:31.402217
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "2d61b9e4a7f3"
+down_revision = "e5a9c3f71d08"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("review_comments", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_review_comments_created_at", ["created_at"], unique=False
+        )
+
+    with op.batch_alter_table("review_likes", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_review_likes_created_at", ["created_at"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("review_likes", schema=None) as batch_op:
+        batch_op.drop_index("ix_review_likes_created_at")
+
+    with op.batch_alter_table("review_comments", schema=None) as batch_op:
+        batch_op.drop_index("ix_review_comments_created_at")
@@ -0,0 +1,34 @@
+"""adding keyset indices to movies
+
+Revision ID: 3e1f0c9a7b21
+Revises: fb38617af53a
+Create Date: 2026-10-18 09:12:40.118302
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3e1f0c9a7b21"
+down_revision = "fb38617af53a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("movies", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_movies_release_date_id", ["release_date", "id"], unique=False
+        )
+        batch_op.create_index("ix_movies_title_id", ["title", "id"], unique=False)
+        # Its leading column makes (release_date, id) cover this one
+        batch_op.drop_index("ix_movies_release_date")
+
+
+def downgrade():
+    with op.batch_alter_table("movies", schema=None) as batch_op:
+        batch_op.create_index("ix_movies_release_date", ["release_date"], unique=False)
+        batch_op.drop_index("ix_movies_title_id")
+        batch_op.drop_index("ix_movies_release_date_id")
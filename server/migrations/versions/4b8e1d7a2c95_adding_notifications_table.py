@@ -0,0 +1,110 @@
+"""adding notifications table
+
+Revision ID: 4b8e1d7a2c95
+Revises: 9d2a6c41e8b7
+Create Date: 2026-10-18 16:02:47.530918
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "4b8e1d7a2c95"
+down_revision = "9d2a6c41e8b7"
+branch_labels = None
+depends_on = None
+
+
+# Same event definitions as movie_reviews.models.fanout; keep in sync. Read state
+# carries over from notification_reads.
+BACKFILL = (
+    """
+    INSERT INTO notifications
+        (user_id, event_type, event_id, actor_id, review_id, created_at, read_at)
+    SELECT parent.user_id, 'reply', reply.id, reply.user_id, reply.review_id,
+           reply.created_at, nr.read_at
+    FROM review_comments AS reply
+    JOIN review_comments AS parent ON reply.parent_comment_id = parent.id
+    LEFT JOIN notification_reads AS nr
+        ON nr.user_id = parent.user_id
+       AND nr.event_type = 'reply' AND nr.event_id = reply.id
+    WHERE parent.user_id != reply.user_id;
+    """,
+    """
+    INSERT INTO notifications
+        (user_id, event_type, event_id, actor_id, review_id, created_at, read_at)
+    SELECT comment.user_id, 'comment_like', cl.id, cl.user_id, comment.review_id,
+           cl.created_at, nr.read_at
+    FROM comment_likes AS cl
+    JOIN review_comments AS comment ON cl.comment_id = comment.id
+    LEFT JOIN notification_reads AS nr
+        ON nr.user_id = comment.user_id
+       AND nr.event_type = 'comment_like' AND nr.event_id = cl.id
+    WHERE comment.user_id != cl.user_id;
+    """,
+    """
+    UPDATE users SET unread_notification_count = (
+        SELECT COUNT(*) FROM notifications
+        WHERE notifications.user_id = users.id AND notifications.read_at IS NULL
+    );
+    """,
+)
+
+
+def upgrade():
+    op.create_table(
+        "notifications",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("event_type", sa.String(length=20), nullable=False),
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("actor_id", sa.Integer(), nullable=False),
+        sa.Column("review_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("read_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["actor_id"],
+            ["users.id"],
+            name=op.f("fk_notifications_actor_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_notifications_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("event_type", "event_id", name="uq_notification_event"),
+    )
+    with op.batch_alter_table("notifications", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_notifications_user_created",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            unique=False,
+        )
+
+    with op.batch_alter_table("users", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "unread_notification_count",
+                sa.Integer(),
+                server_default="0",
+                nullable=False,
+            )
+        )
+
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade():
+    with op.batch_alter_table("users", schema=None) as batch_op:
+        batch_op.drop_column("unread_notification_count")
+
+    with op.batch_alter_table("notifications", schema=None) as batch_op:
+        batch_op.drop_index("ix_notifications_user_created")
+
+    op.drop_table("notifications")
@@ -0,0 +1,59 @@
+"""adding document jobs table
+
+Revision ID: 6f3a8c2e91d4
+Revises: 2d61b9e4a7f3
+Create Date: 2026-10-18 20:14:09.118342
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "6f3a8c2e91d4"
+down_revision = "2d61b9e4a7f3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "document_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("review_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("stage", sa.String(length=40), nullable=True),
+        sa.Column("progress", sa.Integer(), nullable=False),
+        sa.Column("filename", sa.String(length=255), nullable=False),
+        sa.Column("file_type", sa.String(length=10), nullable=False),
+        sa.Column("replace_text", sa.Boolean(), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("locked_by", sa.String(length=100), nullable=True),
+        sa.Column("locked_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["review_id"],
+            ["reviews.id"],
+            name=op.f("fk_document_jobs_review_id_reviews"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("document_jobs", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_document_jobs_status_created", ["status", "created_at"], unique=False
+        )
+        batch_op.create_index("ix_document_jobs_review_id", ["review_id"], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table("document_jobs", schema=None) as batch_op:
+        batch_op.drop_index("ix_document_jobs_review_id")
+        batch_op.drop_index("ix_document_jobs_status_created")
+
+    op.drop_table("document_jobs")
@@ -0,0 +1,172 @@
+"""adding search vectors
+
+Revision ID: 7c4d2e9b1f30
+Revises: 3e1f0c9a7b21
+Create Date: 2026-10-18 11:04:27.530914
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "7c4d2e9b1f30"
+down_revision = "3e1f0c9a7b21"
+branch_labels = None
+depends_on = None
+
+
+# Weights: A = titles/names, B = tags/short descriptions, C = overview/biography,
+# D = long-form review text (HTML stripped). Keep in sync with search/fulltext.py.
+MOVIES_FUNCTION = """
+CREATE OR REPLACE FUNCTION movies_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.original_title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.overview, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+REVIEWS_FUNCTION = """
+CREATE OR REPLACE FUNCTION reviews_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce((
+            SELECT string_agg(t.name, ' ')
+            FROM review_tags rt JOIN tags t ON t.id = rt.tag_id
+            WHERE rt.review_id = NEW.id
+        ), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B') ||
+        setweight(to_tsvector('english', regexp_replace(
+            coalesce(NEW.review_text, ''), '<[^>]+>', ' ', 'g'
+        )), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+DIRECTORS_FUNCTION = """
+CREATE OR REPLACE FUNCTION directors_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.biography, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+# Tag membership and tag renames live in other tables; nulling the review's vector
+# re-fires the BEFORE UPDATE trigger above, which recomputes it from scratch.
+REVIEW_TAGS_FUNCTION = """
+CREATE OR REPLACE FUNCTION review_tags_search_vector_touch() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        UPDATE reviews SET search_vector = NULL WHERE id = OLD.review_id;
+        RETURN OLD;
+    END IF;
+    UPDATE reviews SET search_vector = NULL WHERE id = NEW.review_id;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+TAGS_FUNCTION = """
+CREATE OR REPLACE FUNCTION tags_search_vector_touch() RETURNS trigger AS $$
+BEGIN
+    UPDATE reviews SET search_vector = NULL
+    WHERE id IN (SELECT review_id FROM review_tags WHERE tag_id = NEW.id);
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS = (
+    (
+        "movies_search_vector_trigger",
+        "movies",
+        "BEFORE INSERT OR UPDATE OF title, original_title, overview, search_vector",
+        "movies_search_vector_update",
+    ),
+    (
+        "reviews_search_vector_trigger",
+        "reviews",
+        "BEFORE INSERT OR UPDATE OF title, description, review_text, search_vector",
+        "reviews_search_vector_update",
+    ),
+    (
+        "directors_search_vector_trigger",
+        "directors",
+        "BEFORE INSERT OR UPDATE OF name, biography, description, search_vector",
+        "directors_search_vector_update",
+    ),
+    (
+        "review_tags_search_vector_trigger",
+        "review_tags",
+        "AFTER INSERT OR DELETE",
+        "review_tags_search_vector_touch",
+    ),
+    (
+        "tags_search_vector_trigger",
+        "tags",
+        "AFTER UPDATE OF name",
+        "tags_search_vector_touch",
+    ),
+)
+
+SEARCH_TABLES = ("movies", "reviews", "directors")
+
+
+def upgrade():
+    for table in SEARCH_TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(
+                sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True)
+            )
+
+    for function_sql in (
+        MOVIES_FUNCTION,
+        REVIEWS_FUNCTION,
+        DIRECTORS_FUNCTION,
+        REVIEW_TAGS_FUNCTION,
+        TAGS_FUNCTION,
+    ):
+        op.execute(function_sql)
+
+    for name, table, timing, function in TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {name} {timing} ON {table} "
+            f"FOR EACH ROW EXECUTE PROCEDURE {function}();"
+        )
+
+    # Backfill existing rows through the triggers
+    for table in SEARCH_TABLES:
+        op.execute(f"UPDATE {table} SET search_vector = NULL;")
+
+    for table in SEARCH_TABLES:
+        op.create_index(
+            f"ix_{table}_search_vector",
+            table,
+            ["search_vector"],
+            postgresql_using="gin",
+        )
+
+
+def downgrade():
+    for table in reversed(SEARCH_TABLES):
+        op.drop_index(f"ix_{table}_search_vector", table_name=table)
+
+    for name, table, _timing, function in reversed(TRIGGERS):
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table};")
+        op.execute(f"DROP FUNCTION IF EXISTS {function}();")
+
+    for table in reversed(SEARCH_TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column("search_vector")
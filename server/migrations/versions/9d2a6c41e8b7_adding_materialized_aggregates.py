@@ -0,0 +1,77 @@
+"""adding materialized aggregates
+
+Revision ID: 9d2a6c41e8b7
+Revises: 7c4d2e9b1f30
+Create Date: 2026-10-18 14:26:03.812455
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9d2a6c41e8b7"
+down_revision = "7c4d2e9b1f30"
+branch_labels = None
+depends_on = None
+
+
+# Same definitions as movie_reviews.models.aggregates; keep in sync.
+BACKFILL = (
+    """
+    UPDATE reviews SET like_count = (
+        SELECT COUNT(*) FROM review_likes WHERE review_likes.review_id = reviews.id
+    );
+    """,
+    """
+    UPDATE review_comments SET like_count = (
+        SELECT COUNT(*) FROM comment_likes
+        WHERE comment_likes.comment_id = review_comments.id
+    );
+    """,
+    """
+    UPDATE movies SET
+        rating = (
+            SELECT MAX(reviews.rating) FROM reviews
+            WHERE reviews.movie_id = movies.id AND reviews.content_type = 'review'
+        ),
+        review_count = (
+            SELECT COUNT(*) FROM reviews
+            WHERE reviews.movie_id = movies.id AND reviews.content_type = 'review'
+        );
+    """,
+)
+
+
+def upgrade():
+    with op.batch_alter_table("reviews", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("like_count", sa.Integer(), server_default="0", nullable=False)
+        )
+
+    with op.batch_alter_table("review_comments", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("like_count", sa.Integer(), server_default="0", nullable=False)
+        )
+
+    with op.batch_alter_table("movies", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("rating", sa.Integer(), nullable=True))
+        batch_op.add_column(
+            sa.Column("review_count", sa.Integer(), server_default="0", nullable=False)
+        )
+
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade():
+    with op.batch_alter_table("movies", schema=None) as batch_op:
+        batch_op.drop_column("review_count")
+        batch_op.drop_column("rating")
+
+    with op.batch_alter_table("review_comments", schema=None) as batch_op:
+        batch_op.drop_column("like_count")
+
+    with op.batch_alter_table("reviews", schema=None) as batch_op:
+        batch_op.drop_column("like_count")
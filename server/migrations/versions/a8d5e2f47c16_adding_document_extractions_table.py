@@ -0,0 +1,51 @@
+"""adding document extractions table
+
+Revision ID: a8d5e2f47c16
+Revises: 6f3a8c2e91d4
+Create Date: 2026-10-18 21:02:44.671205
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a8d5e2f47c16"
+down_revision = "6f3a8c2e91d4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "document_extractions",
+        sa.Column("content_sha256", sa.String(length=64), nullable=False),
+        sa.Column("file_type", sa.String(length=10), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("object_key", sa.String(length=500), nullable=False),
+        sa.Column("extracted_html", sa.Text(), nullable=False),
+        sa.Column("main_cast", sa.Text(), nullable=True),
+        sa.Column("line_notes", sa.Text(), nullable=True),
+        sa.Column("backdrop_object_key", sa.String(length=500), nullable=True),
+        sa.Column("extractor_version", sa.Integer(), nullable=False),
+        sa.Column("hit_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("content_sha256"),
+    )
+    with op.batch_alter_table("document_extractions", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_document_extractions_object_key", ["object_key"], unique=False
+        )
+        batch_op.create_index(
+            "ix_document_extractions_backdrop", ["backdrop_object_key"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("document_extractions", schema=None) as batch_op:
+        batch_op.drop_index("ix_document_extractions_backdrop")
+        batch_op.drop_index("ix_document_extractions_object_key")
+
+    op.drop_table("document_extractions")
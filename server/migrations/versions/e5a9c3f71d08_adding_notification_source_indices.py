@@ -0,0 +1,33 @@
+"""adding notification source indices
+
+Revision ID: e5a9c3f71d08
+Revises: 4b8e1d7a2c95
+Create Date: 2026-10-18 17:40:12.095531
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e5a9c3f71d08"
+down_revision = "4b8e1d7a2c95"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("review_comments", schema=None) as batch_op:
+        batch_op.create_index("ix_review_comments_user_id", ["user_id"], unique=False)
+        batch_op.create_index(
+            "ix_review_comments_parent_comment_id",
+            ["parent_comment_id"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("review_comments", schema=None) as batch_op:
+        batch_op.drop_index("ix_review_comments_parent_comment_id")
+        batch_op.drop_index("ix_review_comments_user_id")
@@ -5,6 +5,7 @@ from .core import register_routes as core_routes
 from .documents import register_routes as document_routes
 from .likes import register_routes as likes_routes
 from .notifications import register_routes as notifications_routes
+from .stream import register_routes as stream_routes
 from .version import register_routes as version_routes
 
 ROUTE_MODULES = [
@@ -15,5 +16,6 @@ ROUTE_MODULES = [
     likes_routes,
     notifications_routes,
     activity_routes,
+    stream_routes,
     version_routes,
 ]
@@ -1,30 +1,49 @@
-"""Public site activity: recent comments and review likes (global, not personalized)."""
-
-from flask import request
+"""Public site activity: recent comments and review likes (global, not personalized).
+
+The feed is the same for everyone, so it is served from one shared snapshot of the
+newest ``ACTIVITY_SNAPSHOT_SIZE`` items. The snapshot is rebuilt after a comment or
+review like is written in this worker, and otherwise at most every
+``ACTIVITY_SNAPSHOT_TTL`` seconds (which is how other workers' writes show up).
+Responses carry an ETag so unchanged polls get a bodyless 304.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from flask import Response, request
 from flask_restful import Resource
-from sqlalchemy.orm import joinedload
-
-from movie_reviews.models import Review, ReviewComment, ReviewLike
-
-
-def _review_display_title(review):
-    if review.title and str(review.title).strip():
-        return str(review.title).strip()
-    if review.movie_id and review.movie is not None:
-        return getattr(review.movie, "title", None) or f"Review {review.id}"
-    text = (review.review_text or "").strip()
-    if text:
-        return (text[:50] + "…") if len(text) > 50 else text
-    return f"Review {review.id}"
-
-
-def _review_target(review):
-    mid = review.movie_id
-    path = f"/movies/{mid}" if mid else f"/articles/{review.id}"
+from sqlalchemy import func, literal, null, select, union_all
+
+from movie_reviews import stream
+from movie_reviews.config import db
+from movie_reviews.logging import logger
+from movie_reviews.models import Movie, Review, ReviewComment, ReviewLike, User
+
+ACTIVITY_SNAPSHOT_SIZE = 20  # the largest ?limit= the feed serves
+ACTIVITY_SNAPSHOT_TTL = float(os.getenv("ACTIVITY_SNAPSHOT_TTL", "5"))
+# Enough of an article body for the 50-character fallback title
+_REVIEW_TEXT_PREFIX = 200
+
+
+def _review_target(review_id, title, movie_id, movie_title, review_text):
+    if title and str(title).strip():
+        display_title = str(title).strip()
+    elif movie_id:
+        display_title = movie_title or f"Review {review_id}"
+    else:
+        text = (review_text or "").strip()
+        if text:
+            display_title = (text[:50] + "…") if len(text) > 50 else text
+        else:
+            display_title = f"Review {review_id}"
+    path = f"/movies/{movie_id}" if movie_id else f"/articles/{review_id}"
     return {
-        "review_id": review.id,
-        "title": _review_display_title(review),
-        "movie_id": mid,
+        "review_id": review_id,
+        "title": display_title,
+        "movie_id": movie_id,
         "path": path,
     }
 
@@ -36,6 +55,157 @@ def _snippet(text, max_len=100):
     return (t[:max_len] + "…") if len(t) > max_len else t
 
 
+def _activity_item(kind, event_id, occurred_at, user, review, body=None):
+    item = {
+        "type": kind,
+        "id": event_id,
+        "occurred_at": occurred_at.isoformat() if occurred_at else None,
+        "actor": {"id": user[0], "username": user[1] or "Someone"},
+        "review": _review_target(*review),
+    }
+    if kind == "comment":
+        item["snippet"] = _snippet(body)
+    return item
+
+
+def _review_parts(review):
+    movie_title = review.movie.title if review.movie is not None else None
+    return review.id, review.title, review.movie_id, movie_title, review.review_text
+
+
+def comment_activity_item(comment):
+    return _activity_item(
+        "comment",
+        comment.id,
+        comment.created_at,
+        (comment.user.id, comment.user.username),
+        _review_parts(comment.review),
+        comment.body,
+    )
+
+
+def like_activity_item(like):
+    return _activity_item(
+        "like",
+        like.id,
+        like.created_at,
+        (like.user.id, like.user.username),
+        _review_parts(like.review),
+    )
+
+
+def publish_activity(item):
+    """Push a feed item to /api/stream once the current transaction commits."""
+    stream.publish(db.session, "activity", "activity", item)
+
+
+def _newest(kind, model, body, limit):
+    """One branch of the feed: newest rows of ``model`` (own ORDER BY/LIMIT)."""
+    branch = (
+        select(
+            literal(kind).label("kind"),
+            model.id.label("event_id"),
+            model.created_at.label("occurred_at"),
+            model.user_id.label("actor_id"),
+            model.review_id.label("review_id"),
+            body.label("body"),
+        )
+        .order_by(model.created_at.desc())
+        .limit(limit)
+        .subquery()
+    )
+    return select(branch)
+
+
+def load_activity(limit):
+    """Newest comments and review likes in one UNION ALL statement."""
+    events = union_all(
+        _newest("comment", ReviewComment, ReviewComment.body, limit),
+        _newest("like", ReviewLike, null(), limit),
+    ).subquery("events")
+    rows = db.session.execute(
+        select(
+            events.c.kind,
+            events.c.event_id,
+            events.c.occurred_at,
+            events.c.body,
+            User.id.label("actor_id"),
+            User.username,
+            Review.id.label("review_id"),
+            Review.title,
+            Review.movie_id,
+            Movie.title.label("movie_title"),
+            func.substr(Review.review_text, 1, _REVIEW_TEXT_PREFIX).label(
+                "review_text"
+            ),
+        )
+        .join(User, User.id == events.c.actor_id)
+        .join(Review, Review.id == events.c.review_id)
+        .outerjoin(Movie, Movie.id == Review.movie_id)
+        .order_by(events.c.occurred_at.desc())
+        .limit(limit)
+    ).all()
+    return [
+        _activity_item(
+            row.kind,
+            row.event_id,
+            row.occurred_at,
+            (row.actor_id, row.username),
+            (row.review_id, row.title, row.movie_id, row.movie_title, row.review_text),
+            row.body,
+        )
+        for row in rows
+    ]
+
+
+class ActivitySnapshot:
+    """The newest feed items shared by every request in this worker."""
+
+    def __init__(self, size=ACTIVITY_SNAPSHOT_SIZE, ttl=ACTIVITY_SNAPSHOT_TTL):
+        self.size = size
+        self.ttl = ttl
+        self._items = None
+        self._etag = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self._expires_at = 0.0
+
+    def get(self):
+        """(items, etag), rebuilding first if stale."""
+        if time.monotonic() >= self._expires_at:
+            with self._lock:
+                if time.monotonic() >= self._expires_at:
+                    # Reset before the query so a write landing mid-build
+                    # invalidates again instead of being lost
+                    self._expires_at = time.monotonic() + self.ttl
+                    try:
+                        items = load_activity(self.size)
+                    except Exception:
+                        # Retry on the next request, not after a whole TTL
+                        self._expires_at = 0.0
+                        if self._items is None:
+                            raise
+                        logger.exception(
+                            "activity snapshot rebuild failed; serving the previous one"
+                        )
+                    else:
+                        digest = hashlib.sha1(
+                            json.dumps(items, sort_keys=True).encode("utf-8")
+                        ).hexdigest()[:16]
+                        self._items, self._etag = items, digest
+        return self._items, self._etag
+
+
+activity_snapshot = ActivitySnapshot()
+
+
+def activity_written():
+    """Call after committing a comment or review like."""
+    activity_snapshot.invalidate()
+
+
 class ActivityFeed(Resource):
     """GET /api/activity — latest mixed comments and review likes, newest first."""
 
@@ -45,75 +215,17 @@ class ActivityFeed(Resource):
             limit = int(limit_param)
         except (TypeError, ValueError):
             limit = 5
-        limit = max(1, min(limit, 20))
-
-        fetch_n = min(limit * 4, 40)
+        limit = max(1, min(limit, ACTIVITY_SNAPSHOT_SIZE))
 
-        comment_opts = (
-            joinedload(ReviewComment.user),
-            joinedload(ReviewComment.review).joinedload(Review.movie),
-        )
-        comments = (
-            ReviewComment.query.options(*comment_opts)
-            .order_by(ReviewComment.created_at.desc())
-            .limit(fetch_n)
-            .all()
-        )
-
-        like_opts = (
-            joinedload(ReviewLike.user),
-            joinedload(ReviewLike.review).joinedload(Review.movie),
-        )
-        likes = (
-            ReviewLike.query.options(*like_opts)
-            .order_by(ReviewLike.created_at.desc())
-            .limit(fetch_n)
-            .all()
-        )
-
-        events = []
-
-        for c in comments:
-            if not c.user or not c.review:
-                continue
-            events.append(
-                {
-                    "type": "comment",
-                    "id": c.id,
-                    "occurred_at": c.created_at,
-                    "actor": {
-                        "id": c.user.id,
-                        "username": c.user.username or "Someone",
-                    },
-                    "review": _review_target(c.review),
-                    "snippet": _snippet(c.body),
-                }
-            )
-
-        for lk in likes:
-            if not lk.user or not lk.review:
-                continue
-            events.append(
-                {
-                    "type": "like",
-                    "id": lk.id,
-                    "occurred_at": lk.created_at,
-                    "actor": {
-                        "id": lk.user.id,
-                        "username": lk.user.username or "Someone",
-                    },
-                    "review": _review_target(lk.review),
-                }
-            )
-
-        events.sort(key=lambda x: x["occurred_at"], reverse=True)
-        out = events[:limit]
-
-        for e in out:
-            if e["occurred_at"] is not None:
-                e["occurred_at"] = e["occurred_at"].isoformat()
-
-        return {"items": out}, 200
+        try:
+            items, digest = activity_snapshot.get()
+        except Exception as e:
+            return {"error": f"Activity feed unavailable: {str(e)}"}, 500
+        etag = f"{digest}-{limit}"
+        headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers=headers)
+        return {"items": items[:limit]}, 200, headers
 
 
 def register_routes(api_instance):
@@ -1,22 +1,125 @@
+import base64
+import binascii
+import os
 import time
+from datetime import datetime
 
 from flask import request, session
 from flask_restful import Resource
-from sqlalchemy import func
-from sqlalchemy.orm import joinedload
+from sqlalchemy import literal, select, tuple_
+from sqlalchemy.orm import aliased
 
+from movie_reviews import stream
 from movie_reviews.config import db
 from movie_reviews.logging import logger
 from movie_reviews.models import CommentLike, Review, ReviewComment
+from movie_reviews.serializers import COMMENT_DETAIL
+from movie_reviews.utils.page_cache import PageCache, SqliteGenerationBackend
 
-COMMENT_CACHE_TTL = 10  # seconds
-_comment_cache = (
-    {}
-)  # (review_id, limit, offset, user_id or None) -> (expires_at, response)
+from .activity import activity_written, comment_activity_item, publish_activity
+
+COMMENT_CACHE_TTL = int(os.getenv("COMMENT_CACHE_TTL", "10"))  # seconds
+COMMENT_CACHE_MAX_ENTRIES = int(os.getenv("COMMENT_CACHE_MAX_ENTRIES", "1024"))
+# Bounds on the replies loaded under one page of top-level comments
+COMMENT_THREAD_MAX_DEPTH = int(os.getenv("COMMENT_THREAD_MAX_DEPTH", "8"))
+COMMENT_THREAD_MAX_COMMENTS = int(os.getenv("COMMENT_THREAD_MAX_COMMENTS", "500"))
+
+
+def build_comment_cache():
+    """Comment pages grouped by review; COMMENT_CACHE_PATH shares invalidations."""
+    shared = None
+    shared_path = os.getenv("COMMENT_CACHE_PATH")
+    if shared_path:
+        try:
+            shared = SqliteGenerationBackend(shared_path)
+        except Exception as exc:
+            logger.warning(f"Comment cache backend at {shared_path} unavailable: {exc}")
+    return PageCache(
+        COMMENT_CACHE_MAX_ENTRIES, COMMENT_CACHE_TTL, shared, name="comment_cache"
+    )
+
+
+# review_id -> {(limit, after, offset): response body without liked_by_me}
+comment_cache = build_comment_cache()
+
+
+def invalidate_review_comments(review_id):
+    """Call after committing anything shown on the review's comment pages."""
+    comment_cache.invalidate(review_id)
+
+
+def _with_liked_by_me(body, user_id):
+    """Set liked_by_me on a page body (one lookup on ix_comment_likes_user_comment)."""
+    comments = body["comments"]
+    liked_comment_ids = set()
+    if comments and user_id:
+        liked_comment_ids = set(
+            db.session.scalars(
+                select(CommentLike.comment_id).where(
+                    CommentLike.user_id == user_id,
+                    CommentLike.comment_id.in_([c["id"] for c in comments]),
+                )
+            )
+        )
+    for c in comments:
+        c["liked_by_me"] = c["id"] in liked_comment_ids
+    return body
+
+
+def load_threads(review_id, top_level_ids):
+    """The top-level comments plus their replies at any depth, oldest first.
+
+    One recursive CTE walks down ix_review_comments_parent_comment_id from the
+    page's top-level ids. It stops at COMMENT_THREAD_MAX_DEPTH levels and keeps at
+    most COMMENT_THREAD_MAX_COMMENTS rows, shallowest first, so one huge thread
+    cannot blow up the page.
+    """
+    thread = (
+        select(ReviewComment.id, literal(0).label("depth"))
+        .where(ReviewComment.id.in_(top_level_ids))
+        .cte("thread", recursive=True)
+    )
+    reply = aliased(ReviewComment)
+    thread = thread.union_all(
+        select(reply.id, thread.c.depth + 1).where(
+            reply.parent_comment_id == thread.c.id,
+            reply.review_id == review_id,
+            thread.c.depth < COMMENT_THREAD_MAX_DEPTH,
+        )
+    )
+    comments = db.session.scalars(
+        select(ReviewComment)
+        .join(thread, thread.c.id == ReviewComment.id)
+        .options(*COMMENT_DETAIL.load_options())
+        .order_by(thread.c.depth, ReviewComment.created_at, ReviewComment.id)
+        .limit(COMMENT_THREAD_MAX_COMMENTS)
+    ).all()
+    return sorted(comments, key=lambda c: (c.created_at, c.id))
+
+
+def encode_cursor(comment_created_at, comment_id):
+    """Opaque keyset cursor for the page after the comment ``(created_at, id)``."""
+    raw = f"{comment_created_at.isoformat()}|{comment_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """``(created_at, id)`` from :func:`encode_cursor`; ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, comment_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(comment_id)
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
 
 
 class ReviewComments(Resource):
-    """GET comments for a review (paginated by top-level). POST a new comment (requires session)."""
+    """GET comments for a review (paginated by top-level). POST a new comment (requires session).
+
+    GET takes ``?limit=&after=<next_cursor>`` (``offset`` still works) and returns
+    whole threads under each top-level comment.
+    """
 
     def get(self, review_id):
         start = time.perf_counter()
@@ -25,94 +128,73 @@ class ReviewComments(Resource):
             return {"error": "Review not found"}, 404
         limit = min(int(request.args.get("limit", 5)), 50)
         offset = max(int(request.args.get("offset", 0)), 0)
-        cache_key = (review_id, limit, offset, session.get("user_id"))
-        now = time.time()
-        cached = _comment_cache.get(cache_key)
-        if cached and cached[0] > now:
-            return cached[1]
+        after = request.args.get("after") or None
+        anchor = None
+        if after:
+            # The cursor carries (created_at, id) itself, so it stays valid even
+            # if that comment has since been deleted
+            try:
+                anchor = decode_cursor(after)
+            except ValueError:
+                return {"error": "Invalid cursor"}, 400
+        current_user_id = session.get("user_id")
+        # The cached page is the same for every viewer; liked_by_me is overlaid
+        cache_key = (limit, after, offset)
+        # Store under the generation seen now, so an invalidate() while this page
+        # is built leaves it unreachable instead of caching the pre-write page
+        generation = comment_cache.generation(review_id)
+        cached = comment_cache.get(review_id, cache_key, generation=generation)
+        if cached is not None:
+            return _with_liked_by_me(cached, current_user_id), 200
         # Total = count of top-level comments only
         total = ReviewComment.query.filter_by(
             review_id=review_id, parent_comment_id=None
         ).count()
-        # Page of top-level comments (newest first)
-        top_level = (
-            ReviewComment.query.filter_by(review_id=review_id, parent_comment_id=None)
-            .order_by(ReviewComment.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
+        # Page of top-level comments, newest first. With ?after=<cursor> this is a
+        # keyset seek on ix_review_comments_review_created; offset is the fallback.
+        query = db.session.query(ReviewComment.id, ReviewComment.created_at).filter_by(
+            review_id=review_id, parent_comment_id=None
         )
-        top_level_ids = [c.id for c in top_level]
-        if not top_level_ids:
-            return {"comments": [], "total": total}, 200
-        # All comments in this page: top-level + their replies
-        comments = (
-            ReviewComment.query.filter(
-                ReviewComment.review_id == review_id,
-                (
-                    (ReviewComment.id.in_(top_level_ids))
-                    | (ReviewComment.parent_comment_id.in_(top_level_ids))
-                ),
+        if anchor is not None:
+            query = query.filter(
+                tuple_(ReviewComment.created_at, ReviewComment.id)
+                < tuple_(literal(anchor[0]), literal(anchor[1]))
             )
-            .options(joinedload(ReviewComment.user))
-            .order_by(ReviewComment.created_at)
-            .all()
+        query = query.order_by(ReviewComment.created_at.desc(), ReviewComment.id.desc())
+        if anchor is None:
+            query = query.offset(offset)
+        # One extra row says whether there is a next page
+        rows = query.limit(limit + 1).all()
+        next_cursor = (
+            encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id)
+            if len(rows) > limit
+            else None
         )
-        current_user_id = session.get("user_id")
-        comment_ids = [c.id for c in comments]
-        counts = {}
-        liked_comment_ids = set()
-        if comment_ids:
-            count_rows = (
-                db.session.query(CommentLike.comment_id, func.count(CommentLike.id))
-                .filter(CommentLike.comment_id.in_(comment_ids))
-                .group_by(CommentLike.comment_id)
-                .all()
-            )
-            counts = {row[0]: row[1] for row in count_rows}
-            if current_user_id:
-                liked_comment_ids = {
-                    row[0]
-                    for row in db.session.query(CommentLike.comment_id)
-                    .filter(
-                        CommentLike.comment_id.in_(comment_ids),
-                        CommentLike.user_id == current_user_id,
-                    )
-                    .all()
-                }
-        out = []
-        for c in comments:
-            d = c.to_dict()
-            d["like_count"] = counts.get(c.id, 0)
-            d["liked_by_me"] = c.id in liked_comment_ids
-            out.append(d)
+        top_level_ids = [row.id for row in rows[:limit]]
+        if not top_level_ids:
+            return {"comments": [], "total": total, "next_cursor": None}, 200
+        comments = load_threads(review_id, top_level_ids)
+        out = [COMMENT_DETAIL.dump(c) for c in comments]
         elapsed_ms = (time.perf_counter() - start) * 1000
         log = logger.warning if elapsed_ms > 300 else logger.info
         log(
             f"comments.get.review elapsed_ms={elapsed_ms:.2f}ms "
-            f"review_id={review_id} count={len(out)} top_level={len(top_level)} total_top={total} "
-            f"cache_hit={bool(cached and cached[0] > now)}",
+            f"review_id={review_id} count={len(out)} top_level={len(top_level_ids)} total_top={total}",
             extra={
                 "endpoint": "/api/reviews/<id>/comments",
                 "review_id": review_id,
                 "limit": limit,
                 "offset": offset,
+                "after": after,
                 "elapsed_ms": round(elapsed_ms, 2),
                 "comment_count": len(out),
-                "top_level_count": len(top_level),
+                "top_level_count": len(top_level_ids),
                 "total_top_level": total,
-                "cache_hit": bool(cached and cached[0] > now),
-            },
-        )
-        response = (
-            {
-                "comments": out,
-                "total": total,
             },
-            200,
         )
-        _comment_cache[cache_key] = (time.time() + COMMENT_CACHE_TTL, response)
-        return response
+        body = {"comments": out, "total": total, "next_cursor": next_cursor}
+        comment_cache.set(review_id, cache_key, body, generation=generation)
+        return _with_liked_by_me(body, current_user_id), 200
 
     def post(self, review_id):
         user_id = session.get("user_id")
@@ -137,16 +219,25 @@ class ReviewComments(Resource):
             parent_comment_id=parent_comment_id,
         )
         db.session.add(comment)
+        if stream.STREAM_ENABLED:
+            db.session.flush()
+            publish_activity(comment_activity_item(comment))
         db.session.commit()
-        # Invalidate cached pages for this review so fresh comments are visible
-        for key in list(_comment_cache.keys()):
-            if key[0] == review_id:
-                _comment_cache.pop(key, None)
+        activity_written()
+        invalidate_review_comments(review_id)
         return comment.to_dict(), 201
 
 
+class CommentCacheStats(Resource):
+    """GET comment page cache counters (hits, misses, evictions, invalidations)."""
+
+    def get(self):
+        return comment_cache.stats(), 200
+
+
 def register_routes(api_instance):
     api_instance.add_resource(
         ReviewComments,
         "/api/reviews/<int:review_id>/comments",
     )
+    api_instance.add_resource(CommentCacheStats, "/api/comments/cache")
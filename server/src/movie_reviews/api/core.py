@@ -1,85 +1,75 @@
 #!/usr/bin/env python3
 
-import os
 import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import date, datetime
-from urllib.parse import quote_plus
 
 import requests
 
 # from flask_migrate import Migrate
 from flask import request, session
 from flask_restful import Resource
-from sqlalchemy import func
-from sqlalchemy.orm import joinedload
+from sqlalchemy import func, literal, tuple_
 
+from movie_reviews import document_cache
 from movie_reviews.config import db
 from movie_reviews.logging import logger
 from movie_reviews.models import Director, Movie, Review, ReviewLike, Tag
+from movie_reviews.search import (
+    SEARCH_DEFAULT_LIMIT,
+    SEARCH_MAX_LIMIT,
+    SEARCH_TYPES,
+    SUGGEST_DEFAULT_LIMIT,
+    SUGGEST_MAX_LIMIT,
+    run_search,
+    search_index,
+    suggest_index,
+)
+from movie_reviews.serializers import DIRECTOR_DETAIL, MOVIE_DETAIL, REVIEW_DETAIL, TAG
+from movie_reviews.utils.tmdb_client import TMDB_IMAGE_BASE_URL, get_tmdb_client
 
 FALLBACK_POSTER_URL = "https://placehold.co/500x750?text=No+Poster"
 FALLBACK_DIRECTOR_PHOTO_URL = "https://placehold.co/500x750?text=No+Photo"
 
 
-def _fetch_tmdb_director_for_movie(external_movie_id):
-    """Fetch director details from TMDb for a given movie external_id."""
-    API_KEY = os.getenv("MOVIE_API_KEY")
-    base_url = "https://api.themoviedb.org/3"
+# One /movie/{id} request returns details, credits and release dates together
+TMDB_MOVIE_APPEND_TO_RESPONSE = "credits,release_dates"
+# How long Movies.post waits on the director's person lookup before falling back
+# to the name/photo already present in the credits
+TMDB_PERSON_WAIT_SECONDS = 5.0
 
-    if not API_KEY or not external_movie_id:
-        return None
 
-    # Step 1: Get credits for the movie to find the director (crew member with job "Director")
-    credits_url = (
-        f"{base_url}/movie/{external_movie_id}/credits?api_key={API_KEY}&language=en-US"
-    )
-    try:
-        credits_response = requests.get(credits_url)
-    except Exception:
-        return None
+def _movie_params():
+    return {"language": "en-US", "append_to_response": TMDB_MOVIE_APPEND_TO_RESPONSE}
 
-    if credits_response.status_code != 200:
-        return None
 
-    credits_data = credits_response.json() or {}
-    crew = credits_data.get("crew", []) or []
-    director_entry = next((c for c in crew if c.get("job") == "Director"), None)
+def _fetch_tmdb_movie_enrichment(external_movie_id):
+    """Fetch TMDb movie details with credits and release_dates appended."""
+    tmdb = get_tmdb_client()
 
-    if not director_entry:
+    if not tmdb.configured or not external_movie_id:
         return None
 
-    person_id = director_entry.get("id")
-    if not person_id:
-        return None
+    return tmdb.get_json(f"/movie/{external_movie_id}", _movie_params())
 
-    # Step 2: Fetch person details to get biography and better profile photo info
-    person_url = f"{base_url}/person/{person_id}?api_key={API_KEY}&language=en-US"
-    try:
-        person_response = requests.get(person_url)
-    except Exception:
-        person_response = None
-
-    person_data = (
-        person_response.json()
-        if person_response and person_response.status_code == 200
-        else {}
-    )
 
-    name = person_data.get("name") or director_entry.get("name")
-    profile_path = person_data.get("profile_path") or director_entry.get("profile_path")
-    biography = person_data.get("biography") or None
+def _tmdb_director_entry(credits_data):
+    """Crew member with job "Director" from a TMDb credits payload."""
+    crew = (credits_data or {}).get("crew", []) or []
+    return next((c for c in crew if c.get("job") == "Director"), None)
 
-    if not name:
-        return None
 
-    image_base_url = "https://image.tmdb.org/t/p/w500"
-    cover_photo = f"{image_base_url}{profile_path}" if profile_path else None
+def _tmdb_director_data(director_entry, person_data=None):
+    """Director fields from the credits entry, preferring person details."""
+    person_data = person_data or {}
+    profile_path = person_data.get("profile_path") or director_entry.get("profile_path")
+    image_base_url = f"{TMDB_IMAGE_BASE_URL}/w500"
 
     return {
-        "external_id": person_id,
-        "name": name,
-        "cover_photo": cover_photo,
-        "biography": biography,
+        "external_id": director_entry.get("id"),
+        "name": person_data.get("name") or director_entry.get("name"),
+        "cover_photo": f"{image_base_url}{profile_path}" if profile_path else None,
+        "biography": person_data.get("biography") or None,
     }
 
 
@@ -106,41 +96,9 @@ def _extract_earliest_tmdb_release_date(release_dates_payload):
     return earliest
 
 
-def _fetch_tmdb_earliest_release_date(external_movie_id):
-    """Fetch earliest release date across countries for a TMDb movie."""
-    api_key = os.getenv("MOVIE_API_KEY")
-    base_url = "https://api.themoviedb.org/3"
-
-    if not api_key or not external_movie_id:
-        return None
-
-    url = f"{base_url}/movie/{external_movie_id}/release_dates?api_key={api_key}"
-    try:
-        response = requests.get(url, timeout=12)
-    except Exception:
-        return None
-
-    if response.status_code != 200:
-        return None
-
-    return _extract_earliest_tmdb_release_date(response.json() or {})
-
-
-def _fetch_tmdb_primary_origin_country(external_movie_id):
+def _extract_primary_origin_country(movie_data):
     """First TMDb production origin_country code (ISO 3166-1 alpha-2) for a movie."""
-    api_key = os.getenv("MOVIE_API_KEY")
-    base_url = "https://api.themoviedb.org/3"
-    if not api_key or not external_movie_id:
-        return None
-    url = f"{base_url}/movie/{external_movie_id}?api_key={api_key}&language=en-US"
-    try:
-        response = requests.get(url, timeout=12)
-    except Exception:
-        return None
-    if response.status_code != 200:
-        return None
-    data = response.json() or {}
-    oc = data.get("origin_country") or []
+    oc = (movie_data or {}).get("origin_country") or []
     if isinstance(oc, list) and oc:
         s = str(oc[0]).strip()
         return s[:10] if s else None
@@ -149,10 +107,9 @@ def _fetch_tmdb_primary_origin_country(external_movie_id):
     return None
 
 
-def _get_or_create_director_for_movie(external_movie_id):
-    """Ensure there is a Director row for the given TMDb movie external_id."""
-    director_data = _fetch_tmdb_director_for_movie(external_movie_id)
-    if not director_data:
+def _get_or_create_director(director_data):
+    """Ensure there is a Director row for TMDb director data."""
+    if not director_data or not director_data.get("name"):
         return None
 
     external_id = director_data["external_id"]
@@ -203,25 +160,18 @@ def _get_or_create_director_for_movie(external_movie_id):
 
 def _fetch_tmdb_movie_bundle(external_movie_id):
     """Fetch TMDb movie details + director details for investigation/debug."""
-    api_key = os.getenv("MOVIE_API_KEY")
-    base_url = "https://api.themoviedb.org/3"
-    image_base_url = "https://image.tmdb.org/t/p/w1280"
+    tmdb = get_tmdb_client()
+    image_base_url = f"{TMDB_IMAGE_BASE_URL}/w1280"
 
-    if not api_key:
+    if not tmdb.configured:
         return {"error": "MOVIE_API_KEY is not configured"}, 500
 
     if not external_movie_id:
         return {"error": "Movie has no external_id to query TMDb"}, 400
 
-    movie_url = f"{base_url}/movie/{external_movie_id}?api_key={api_key}&language=en-US"
-    credits_url = (
-        f"{base_url}/movie/{external_movie_id}/credits?api_key={api_key}&language=en-US"
-    )
-
     try:
-        movie_response = requests.get(movie_url, timeout=12)
-        credits_response = requests.get(credits_url, timeout=12)
-    except Exception as exc:
+        movie_response = tmdb.get(f"/movie/{external_movie_id}", _movie_params())
+    except requests.RequestException as exc:
         return {"error": f"Failed to reach TMDb: {str(exc)}"}, 502
 
     if movie_response.status_code != 200:
@@ -232,32 +182,19 @@ def _fetch_tmdb_movie_bundle(external_movie_id):
             )
         }, movie_response.status_code
 
-    if credits_response.status_code != 200:
-        return {
-            "error": (
-                f"TMDb credits request failed. Status {credits_response.status_code}: "
-                f"{credits_response.text}"
-            )
-        }, credits_response.status_code
-
     movie_data = movie_response.json() or {}
-    credits_data = credits_response.json() or {}
-    crew = credits_data.get("crew", []) or []
-    director_entry = next((c for c in crew if c.get("job") == "Director"), None)
+    # Split the appended sections back out so tmdb_movie keeps its old shape
+    credits_data = movie_data.pop("credits", None) or {}
+    release_dates_data = movie_data.pop("release_dates", None)
+    director_entry = _tmdb_director_entry(credits_data)
 
     director_data = None
     if director_entry and director_entry.get("id"):
-        person_url = (
-            f"{base_url}/person/{director_entry['id']}?api_key={api_key}&language=en-US"
+        director_data = tmdb.get_json(
+            f"/person/{director_entry['id']}", {"language": "en-US"}
         )
-        try:
-            person_response = requests.get(person_url, timeout=12)
-            if person_response.status_code == 200:
-                director_data = person_response.json() or {}
-        except Exception:
-            director_data = None
 
-    earliest_release_date = _fetch_tmdb_earliest_release_date(external_movie_id)
+    earliest_release_date = _extract_earliest_tmdb_release_date(release_dates_data)
 
     normalized_movie = {
         "external_id": movie_data.get("id"),
@@ -280,20 +217,7 @@ def _fetch_tmdb_movie_bundle(external_movie_id):
 
     normalized_director = None
     if director_entry:
-        normalized_director = {
-            "external_id": director_entry.get("id"),
-            "name": (director_data or {}).get("name") or director_entry.get("name"),
-            "biography": (director_data or {}).get("biography"),
-            "cover_photo": (
-                f"https://image.tmdb.org/t/p/w500"
-                f"{(director_data or {}).get('profile_path') or director_entry.get('profile_path')}"
-                if (
-                    (director_data or {}).get("profile_path")
-                    or director_entry.get("profile_path")
-                )
-                else None
-            ),
-        }
+        normalized_director = _tmdb_director_data(director_entry, director_data)
 
     return {
         "tmdb_movie": movie_data,
@@ -322,10 +246,102 @@ def _merge_tmdb_movie_results(*result_lists):
     return merged
 
 
+MOVIE_PAGE_DEFAULT_LIMIT = 24
+MOVIE_PAGE_MAX_LIMIT = 100
+MOVIE_PAGE_SORT_COLUMNS = {
+    "release_date": Movie.release_date,
+    "title": Movie.title,
+}
+
+
+def _list_movies_page():
+    """
+    Keyset-paginated movie cards: ``?after=<id>&limit=&sort=release_date|title&order=``.
+
+    Selects only card-level columns plus the materialized review rating, so page
+    cost depends on ``limit`` rather than on the size of the catalog or of the reviews.
+    """
+    sort = request.args.get("sort", "release_date")
+    sort_col = MOVIE_PAGE_SORT_COLUMNS.get(sort)
+    if sort_col is None:
+        allowed = ", ".join(MOVIE_PAGE_SORT_COLUMNS)
+        return {"error": f"sort must be one of: {allowed}"}, 400
+    descending = request.args.get("order", "asc").lower() == "desc"
+
+    try:
+        limit = int(request.args.get("limit", MOVIE_PAGE_DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        limit = MOVIE_PAGE_DEFAULT_LIMIT
+    limit = max(1, min(limit, MOVIE_PAGE_MAX_LIMIT))
+
+    query = db.session.query(
+        Movie.id,
+        Movie.external_id,
+        Movie.title,
+        Movie.original_title,
+        Movie.original_language,
+        Movie.release_date,
+        Movie.cover_photo,
+        Movie.backdrop,
+        Movie.primary_origin_country,
+        Movie.director_id,
+        Movie.rating,
+    )
+
+    after = request.args.get("after")
+    if after:
+        try:
+            after_id = int(after)
+        except (TypeError, ValueError):
+            return {"error": "after must be a movie id"}, 400
+        anchor = db.session.query(sort_col).filter(Movie.id == after_id).scalar()
+        if anchor is None:
+            return {"error": "Invalid cursor: movie not found"}, 400
+        key = tuple_(sort_col, Movie.id)
+        bound = tuple_(literal(anchor), literal(after_id))
+        query = query.filter(key < bound if descending else key > bound)
+
+    if descending:
+        query = query.order_by(sort_col.desc(), Movie.id.desc())
+    else:
+        query = query.order_by(sort_col.asc(), Movie.id.asc())
+
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = [
+        {
+            "id": row.id,
+            "external_id": row.external_id,
+            "title": row.title,
+            "original_title": row.original_title,
+            "original_language": row.original_language,
+            "release_date": (
+                row.release_date.isoformat() if row.release_date else None
+            ),
+            "cover_photo": row.cover_photo,
+            "backdrop": row.backdrop,
+            "primary_origin_country": row.primary_origin_country,
+            "director_id": row.director_id,
+            "rating": row.rating,
+        }
+        for row in rows
+    ]
+    return {
+        "items": items,
+        "has_more": has_more,
+        "next_after": items[-1]["id"] if has_more else None,
+    }, 200
+
+
 class Movies(Resource):
     def get(self):
-        movies = [movie.to_dict() for movie in Movie.query.all()]
-        return movies, 200
+        # Listing mode is opt-in so existing full-payload consumers keep working.
+        if "after" in request.args or "limit" in request.args:
+            return _list_movies_page()
+        movies = Movie.query.options(*MOVIE_DETAIL.load_options()).all()
+        return MOVIE_DETAIL.dump_many(movies), 200
 
     def post(self):
         data = request.get_json() or {}
@@ -340,8 +356,11 @@ class Movies(Resource):
             cover_photo = FALLBACK_POSTER_URL
         release_date = data.get("release_date")
         external_id = data.get("external_id")
-        if external_id:
-            earliest_release_date = _fetch_tmdb_earliest_release_date(external_id)
+        tmdb_movie = _fetch_tmdb_movie_enrichment(external_id) if external_id else None
+        if tmdb_movie:
+            earliest_release_date = _extract_earliest_tmdb_release_date(
+                tmdb_movie.get("release_dates")
+            )
             if earliest_release_date:
                 release_date = earliest_release_date
 
@@ -354,8 +373,16 @@ class Movies(Resource):
             s = str(raw_country).strip()
             primary_origin_country = s[:10] if s else None
 
-        if primary_origin_country is None and external_id:
-            primary_origin_country = _fetch_tmdb_primary_origin_country(external_id)
+        if primary_origin_country is None and tmdb_movie:
+            primary_origin_country = _extract_primary_origin_country(tmdb_movie)
+
+        # Start the director's person lookup now; it overlaps the movie insert.
+        director_entry = _tmdb_director_entry((tmdb_movie or {}).get("credits"))
+        person_future = None
+        if director_entry and director_entry.get("id"):
+            person_future = get_tmdb_client().get_json_async(
+                f"/person/{director_entry['id']}", {"language": "en-US"}
+            )
 
         try:
             new_movie = Movie(
@@ -374,8 +401,21 @@ class Movies(Resource):
             db.session.flush()
 
             # If this movie came from TMDb, try to associate a director
-            if new_movie.external_id:
-                director = _get_or_create_director_for_movie(new_movie.external_id)
+            if director_entry:
+                person_data = None
+                if person_future is not None:
+                    try:
+                        person_data = person_future.result(
+                            timeout=TMDB_PERSON_WAIT_SECONDS
+                        )
+                    except FutureTimeoutError:
+                        logger.warning(
+                            f"TMDb person lookup for movie {external_id} timed out; "
+                            "using credits data"
+                        )
+                director = _get_or_create_director(
+                    _tmdb_director_data(director_entry, person_data)
+                )
                 if director:
                     new_movie.director_id = director.id
 
@@ -400,23 +440,17 @@ class Movies(Resource):
 class MovieById(Resource):
     def get(self, movie_id):
         start = time.perf_counter()
-        movie = Movie.query.get(movie_id)
+        query = Movie.query.options(*MOVIE_DETAIL.load_options())
+        movie = query.get(movie_id)
         # Discover/search links use TMDb id in the URL; DB primary key differs.
         if not movie:
-            movie = Movie.query.filter_by(external_id=movie_id).first()
+            movie = query.filter_by(external_id=movie_id).first()
         if not movie:
             return {"error": "Movie not found"}, 404
-        out = movie.to_dict()
+        out = MOVIE_DETAIL.dump(movie)
         reviews_list = out.get("reviews") or []
         if reviews_list:
             review_ids = [r["id"] for r in reviews_list]
-            count_rows = (
-                db.session.query(ReviewLike.review_id, func.count(ReviewLike.id))
-                .filter(ReviewLike.review_id.in_(review_ids))
-                .group_by(ReviewLike.review_id)
-                .all()
-            )
-            counts = {row[0]: row[1] for row in count_rows}
             user_id = session.get("user_id")
             liked_ids = set()
             if user_id:
@@ -430,9 +464,7 @@ class MovieById(Resource):
                     .all()
                 }
             for r in reviews_list:
-                rid = r.get("id")
-                r["like_count"] = counts.get(rid, 0)
-                r["liked_by_me"] = rid in liked_ids
+                r["liked_by_me"] = r.get("id") in liked_ids
         elapsed_ms = (time.perf_counter() - start) * 1000
         log = logger.warning if elapsed_ms > 300 else logger.info
         log(
@@ -524,8 +556,8 @@ class MovieTmdbInvestigation(Resource):
 
 class Reviews(Resource):
     def get(self):
-        reviews = [review.to_dict() for review in Review.query.all()]
-        return reviews, 200
+        reviews = Review.query.options(*REVIEW_DETAIL.load_options()).all()
+        return REVIEW_DETAIL.dump_many(reviews), 200
 
     def post(self):
         data = request.get_json() or {}
@@ -587,17 +619,16 @@ def _add_like_fields_to_review_dict(review_dict, like_count, liked_by_me):
 
 class ReviewById(Resource):
     def get(self, review_id):
-        review = Review.query.get(review_id)
+        review = Review.query.options(*REVIEW_DETAIL.load_options()).get(review_id)
         if not review:
             return {"error": "Review not found"}, 404
-        like_count = ReviewLike.query.filter_by(review_id=review_id).count()
         user_id = session.get("user_id")
         liked_by_me = bool(
             user_id
             and ReviewLike.query.filter_by(review_id=review_id, user_id=user_id).first()
         )
-        out = review.to_dict()
-        _add_like_fields_to_review_dict(out, like_count, liked_by_me)
+        out = REVIEW_DETAIL.dump(review)
+        _add_like_fields_to_review_dict(out, review.like_count, liked_by_me)
         return out, 200
 
     def patch(self, review_id):
@@ -675,7 +706,9 @@ class Articles(Resource):
     def get(self):
         start = time.perf_counter()
         search_query = request.args.get("search", "")
-        articles = Review.query.filter_by(movie_id=None)
+        articles = Review.query.options(*REVIEW_DETAIL.load_options()).filter_by(
+            movie_id=None
+        )
 
         if search_query:
             articles = articles.filter(
@@ -689,13 +722,6 @@ class Articles(Resource):
         if not articles:
             return [], 200
         review_ids = [a.id for a in articles]
-        count_rows = (
-            db.session.query(ReviewLike.review_id, func.count(ReviewLike.id))
-            .filter(ReviewLike.review_id.in_(review_ids))
-            .group_by(ReviewLike.review_id)
-            .all()
-        )
-        counts = {row[0]: row[1] for row in count_rows}
         user_id = session.get("user_id")
         liked_ids = set()
         if user_id:
@@ -710,8 +736,8 @@ class Articles(Resource):
             }
         out = []
         for a in articles:
-            d = a.to_dict()
-            _add_like_fields_to_review_dict(d, counts.get(a.id, 0), a.id in liked_ids)
+            d = REVIEW_DETAIL.dump(a)
+            _add_like_fields_to_review_dict(d, a.like_count, a.id in liked_ids)
             out.append(d)
         elapsed_ms = (time.perf_counter() - start) * 1000
         log = logger.warning if elapsed_ms > 300 else logger.info
@@ -773,10 +799,14 @@ class Articles(Resource):
 
 class ArticleById(Resource):
     def get(self, article_id):
-        article = Review.query.filter_by(id=article_id, movie_id=None).first()
+        article = (
+            Review.query.options(*REVIEW_DETAIL.load_options())
+            .filter_by(id=article_id, movie_id=None)
+            .first()
+        )
         if not article:
             return {"error": "Article not found"}, 404
-        return article.to_dict(), 200
+        return REVIEW_DETAIL.dump(article), 200
 
     def patch(self, article_id):
         article = Review.query.filter_by(id=article_id, movie_id=None).first()
@@ -819,8 +849,7 @@ class ArticleById(Resource):
 
 class Tags(Resource):
     def get(self):
-        tags = Tag.query.all()
-        return [tag.to_dict() for tag in tags], 200
+        return TAG.dump_many(Tag.query.all()), 200
 
     def post(self):
         data = request.get_json()
@@ -844,18 +873,24 @@ class Tags(Resource):
 class Directors(Resource):
     def get(self):
         """Return all directors, sorted by name."""
-        directors = Director.query.order_by(Director.name.asc()).all()
-        return [director.to_dict() for director in directors], 200
+        directors = (
+            Director.query.options(*DIRECTOR_DETAIL.load_options())
+            .order_by(Director.name.asc())
+            .all()
+        )
+        return DIRECTOR_DETAIL.dump_many(directors), 200
 
 
 class DirectorById(Resource):
     def get(self, director_id):
         """Return a single director (with movies) by ID."""
         start = time.perf_counter()
-        director = Director.query.get(director_id)
+        director = Director.query.options(*DIRECTOR_DETAIL.load_options()).get(
+            director_id
+        )
         if not director:
             return {"error": "Director not found"}, 404
-        out = director.to_dict()
+        out = DIRECTOR_DETAIL.dump(director)
         elapsed_ms = (time.perf_counter() - start) * 1000
         log = logger.warning if elapsed_ms > 300 else logger.info
         log(
@@ -887,81 +922,122 @@ class DirectorById(Resource):
         return director.to_dict(), 200
 
 
+PULL_MOVIE_INFO_DEADLINE_SECONDS = 4.0
+PULL_MOVIE_INFO_MAX_DIRECTORS = 3
+
+
+def _director_people(person_results):
+    """People from /search/person who look like directors (capped)."""
+    return [
+        p
+        for p in person_results
+        if p.get("id")
+        and (
+            (p.get("known_for_department") == "Directing")
+            or any(
+                k.get("media_type") == "movie" and k.get("title")
+                for k in (p.get("known_for") or [])
+            )
+        )
+    ][:PULL_MOVIE_INFO_MAX_DIRECTORS]
+
+
+def _search_tmdb_movies_and_directors(tmdb, search_text):
+    """Title search merged with movies directed by matching people.
+
+    Runs as two concurrent waves under one deadline: /search/movie and
+    /search/person together, then every director's movie_credits together.
+    Calls that miss the deadline are dropped and the merged results are
+    returned with ``partial: true``.
+    """
+    start = time.perf_counter()
+    deadline = time.monotonic() + PULL_MOVIE_INFO_DEADLINE_SECONDS
+    search_params = {"query": search_text, "language": "en-US", "page": 1}
+
+    first_wave = tmdb.fetch_many(
+        {
+            "movies": ("/search/movie", search_params),
+            "people": ("/search/person", search_params),
+        },
+        deadline,
+    )
+    if not first_wave:
+        return {"error": "TMDb search failed or timed out"}, 504
+
+    partial = len(first_wave) < 2
+    movie_results = []
+    if "movies" in first_wave:
+        status, movie_payload = first_wave["movies"]
+        if status != 200:
+            return {
+                "error": (
+                    f"Failed to fetch movie search. Status {status}: {movie_payload}"
+                )
+            }, status
+        movie_results = (movie_payload or {}).get("results", []) or []
+
+    # If the query looks like a director name, include movies tied to matching directors.
+    director_movie_results = []
+    status, person_payload = first_wave.get("people", (None, None))
+    if status == 200:
+        director_people = _director_people(
+            (person_payload or {}).get("results", []) or []
+        )
+        credit_calls = {
+            person["id"]: (
+                f"/person/{person['id']}/movie_credits",
+                {"language": "en-US"},
+            )
+            for person in director_people
+        }
+        second_wave = tmdb.fetch_many(credit_calls, deadline) if credit_calls else {}
+        partial = partial or len(second_wave) < len(credit_calls)
+        for status, credits_payload in second_wave.values():
+            if status != 200:
+                continue
+            crew = (credits_payload or {}).get("crew", []) or []
+            director_movie_results.extend(
+                m for m in crew if m.get("job") == "Director" and m.get("id")
+            )
+
+    merged_results = _merge_tmdb_movie_results(movie_results, director_movie_results)
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    log = logger.warning if elapsed_ms > 1500 or partial else logger.info
+    log(
+        f"pull_movie_info.search elapsed_ms={elapsed_ms:.2f}ms "
+        f"results={len(merged_results)} partial={partial}",
+        extra={
+            "endpoint": "/api/pull_movie_info",
+            "elapsed_ms": round(elapsed_ms, 2),
+            "partial": partial,
+        },
+    )
+    return {"results": merged_results, "partial": partial}, 200
+
+
 class PullMovieInfo(Resource):
     def get(self):
         searchText = request.args.get("search", "").strip()
 
-        API_KEY = os.getenv("MOVIE_API_KEY")
-        base_url = "https://api.themoviedb.org/3"
+        tmdb = get_tmdb_client()
 
         # If there's a search query, search by movie title and director name.
         if searchText:
-            encoded_query = quote_plus(searchText)
-            movie_search_url = f"{base_url}/search/movie?api_key={API_KEY}&query={encoded_query}&language=en-US&page=1"
-            person_search_url = f"{base_url}/search/person?api_key={API_KEY}&query={encoded_query}&language=en-US&page=1"
-
-            print(movie_search_url)
-            movie_response = requests.get(movie_search_url)
-            if movie_response.status_code != 200:
-                return {
-                    "error": (
-                        f"Failed to fetch movie search. Status {movie_response.status_code}: "
-                        f"{movie_response.text}"
-                    )
-                }, movie_response.status_code
-
-            movie_results = (movie_response.json() or {}).get("results", []) or []
-
-            # If the query looks like a director name, include movies tied to matching directors.
-            director_movie_results = []
-            person_response = requests.get(person_search_url)
-            if person_response.status_code == 200:
-                person_results = (person_response.json() or {}).get("results", []) or []
-                director_people = [
-                    p
-                    for p in person_results
-                    if (p.get("known_for_department") == "Directing")
-                    or any(
-                        k.get("media_type") == "movie" and k.get("title")
-                        for k in (p.get("known_for") or [])
-                    )
-                ][:3]
-
-                for person in director_people:
-                    person_id = person.get("id")
-                    if not person_id:
-                        continue
-                    credits_url = (
-                        f"{base_url}/person/{person_id}/movie_credits"
-                        f"?api_key={API_KEY}&language=en-US"
-                    )
-                    credits_response = requests.get(credits_url)
-                    if credits_response.status_code != 200:
-                        continue
-                    crew = (credits_response.json() or {}).get("crew", []) or []
-                    directed_movies = [
-                        m for m in crew if m.get("job") == "Director" and m.get("id")
-                    ]
-                    director_movie_results.extend(directed_movies)
-
-            merged_results = _merge_tmdb_movie_results(
-                movie_results, director_movie_results
-            )
-            return {"results": merged_results}, 200
-        else:
-            # No search term provided, fetch popular movies
-            url = f"{base_url}/movie/popular?api_key={API_KEY}"
+            return _search_tmdb_movies_and_directors(tmdb, searchText)
 
-        print(url)
-
-        response = requests.get(url)
+        # No search term provided, fetch popular movies
+        try:
+            status, payload = tmdb.fetch("/movie/popular")
+        except requests.RequestException as exc:
+            return {"error": f"Failed to reach TMDb: {str(exc)}"}, 502
 
-        if response.status_code == 200:
-            return response.json()
+        if status == 200:
+            return payload
         else:
             return {
-                "error": f"Failed to fetch movies. Status {response.status_code}: {response.text}"
-            }, response.status_code
+                "error": f"Failed to fetch movies. Status {status}: {payload}"
+            }, status
 
 
 class DiscoverMovies(Resource):
@@ -971,8 +1047,7 @@ class DiscoverMovies(Resource):
         decade = request.args.get("decade", "").strip()
         page = request.args.get("page", 1)
 
-        API_KEY = os.getenv("MOVIE_API_KEY")
-        base_url = "https://api.themoviedb.org/3"
+        tmdb = get_tmdb_client()
 
         # Decade mapping:
         # - pre-1960s => <= 1959-12-31
@@ -1011,12 +1086,14 @@ class DiscoverMovies(Resource):
 
         if search_query:
             # Use search endpoint for text query, then apply genre/decade filters locally.
-            encoded_query = quote_plus(search_query)
-            url = f"{base_url}/search/movie?api_key={API_KEY}&query={encoded_query}&language=en-US&page={page}"
-            print(f"DiscoverMovies(search) - {url}")
-            response = requests.get(url)
-            if response.status_code == 200:
-                payload = response.json() or {}
+            params = {"query": search_query, "language": "en-US", "page": page}
+            logger.info(f"DiscoverMovies(search) - /search/movie {search_query!r}")
+            try:
+                status, payload = tmdb.fetch("/search/movie", params)
+            except requests.RequestException as exc:
+                return {"error": f"Failed to reach TMDb: {str(exc)}"}, 502
+            if status == 200:
+                payload = payload or {}
                 payload["results"] = [
                     movie
                     for movie in (payload.get("results") or [])
@@ -1024,31 +1101,35 @@ class DiscoverMovies(Resource):
                 ]
                 return payload
             return {
-                "error": f"Failed to fetch movies. Status {response.status_code}: {response.text}"
-            }, response.status_code
+                "error": f"Failed to fetch movies. Status {status}: {payload}"
+            }, status
 
         # No search query: use discover endpoint with server-side filters.
-        url = (
-            f"{base_url}/discover/movie?api_key={API_KEY}&language=en-US&page={page}"
-            "&sort_by=popularity.desc"
-        )
-        if genre_id:
-            url += f"&with_genres={quote_plus(str(genre_id))}"
-        if date_gte:
-            url += f"&primary_release_date.gte={date_gte}"
-        if date_lte:
-            url += f"&primary_release_date.lte={date_lte}"
+        params = {
+            "language": "en-US",
+            "page": page,
+            "sort_by": "popularity.desc",
+            "with_genres": genre_id or None,
+            "primary_release_date.gte": date_gte,
+            "primary_release_date.lte": date_lte,
+        }
 
-        print(f"DiscoverMovies - {url}")
+        logger.info(
+            f"DiscoverMovies - /discover/movie page={page} genre={genre_id} "
+            f"decade={decade or None}"
+        )
 
-        response = requests.get(url)
+        try:
+            status, payload = tmdb.fetch("/discover/movie", params)
+        except requests.RequestException as exc:
+            return {"error": f"Failed to reach TMDb: {str(exc)}"}, 502
 
-        if response.status_code == 200:
-            return response.json()
+        if status == 200:
+            return payload
         else:
             return {
-                "error": f"Failed to fetch movies. Status {response.status_code}: {response.text}"
-            }, response.status_code
+                "error": f"Failed to fetch movies. Status {status}: {payload}"
+            }, status
 
 
 class MovieRatings(Resource):
@@ -1063,11 +1144,10 @@ class MovieRatings(Resource):
             if not external_ids:
                 return {}, 200
 
-            # Single efficient query to get movies with ratings
+            # Single-table lookup on the materialized rating
             movies_with_ratings = (
-                db.session.query(Movie.id, Movie.external_id, Review.rating)
-                .join(Review)
-                .filter(Movie.external_id.in_(external_ids))
+                db.session.query(Movie.id, Movie.external_id, Movie.rating)
+                .filter(Movie.external_id.in_(external_ids), Movie.review_count > 0)
                 .all()
             )
 
@@ -1100,9 +1180,8 @@ class MovieRatingsBulk(Resource):
             # Handle local movies - direct ID lookup
             if local_ids:
                 local_movies_with_ratings = (
-                    db.session.query(Movie.id, Review.rating)
-                    .join(Review)
-                    .filter(Movie.id.in_(local_ids))
+                    db.session.query(Movie.id, Movie.rating)
+                    .filter(Movie.id.in_(local_ids), Movie.review_count > 0)
                     .all()
                 )
 
@@ -1115,9 +1194,8 @@ class MovieRatingsBulk(Resource):
             # Handle external movies - external ID to local ID lookup
             if external_ids:
                 external_movies_with_ratings = (
-                    db.session.query(Movie.id, Movie.external_id, Review.rating)
-                    .join(Review)
-                    .filter(Movie.external_id.in_(external_ids))
+                    db.session.query(Movie.id, Movie.external_id, Movie.rating)
+                    .filter(Movie.external_id.in_(external_ids), Movie.review_count > 0)
                     .all()
                 )
 
@@ -1145,9 +1223,14 @@ class DeleteMovie(Resource):
             # Get all reviews for this movie to clean up S3 documents
             reviews = Review.query.filter_by(movie_id=movie_id).all()
 
-            # Delete associated S3 documents for all reviews
+            # Delete associated S3 documents for all reviews, except objects the
+            # document cache shares with other reviews
             for review in reviews:
-                if review.has_document and review.document_path:
+                if (
+                    review.has_document
+                    and review.document_path
+                    and not document_cache.is_shared_object(review.document_path)
+                ):
                     try:
                         from movie_reviews.utils.s3_client import s3_client
 
@@ -1179,8 +1262,12 @@ class DeleteArticle(Resource):
             if not article:
                 return {"error": "Article not found"}, 404
 
-            # Delete associated document if it exists
-            if article.has_document and article.document_path:
+            # Delete associated document if it exists and no other review shares it
+            if (
+                article.has_document
+                and article.document_path
+                and not document_cache.is_shared_object(article.document_path)
+            ):
                 try:
                     from movie_reviews.utils.s3_client import s3_client
 
@@ -1202,6 +1289,13 @@ class DeleteArticle(Resource):
 
 
 class UnifiedSearch(Resource):
+    """Ranked, paged search across movies, articles and directors.
+
+    Query params: ``q``; ``type`` (comma-separated subset of movies, articles,
+    directors; default all); ``page`` (1-based) and ``limit`` (per type, max 50).
+    On Postgres each hit carries ``rank`` and a ``<mark>``-highlighted ``snippet``.
+    """
+
     def get(self):
         search_query = request.args.get("q", "").strip()
 
@@ -1214,67 +1308,74 @@ class UnifiedSearch(Resource):
                 "totalResults": 0,
             }, 200
 
-        # Pre-compile search pattern for consistency
-        search_pattern = f"%{search_query}%"
+        type_param = request.args.get("type")
+        if type_param:
+            types = [t.strip() for t in type_param.split(",") if t.strip()]
+            unknown = [t for t in types if t not in SEARCH_TYPES]
+            if unknown:
+                return {"error": f"Unknown search type: {', '.join(unknown)}"}, 400
+        else:
+            types = list(SEARCH_TYPES)
 
-        # OPTIMIZED: Use eager loading to prevent N+1 queries
-        # Load movies with their reviews and tags in a single query
-        movie_results = (
-            db.session.query(Movie)
-            .options(joinedload(Movie.reviews).joinedload(Review.tags))
-            .join(Review, Movie.id == Review.movie_id)
-            .filter(
-                db.or_(
-                    Movie.title.ilike(search_pattern),
-                    Review.review_text.ilike(search_pattern),
-                    Review.tags.any(Tag.name.ilike(search_pattern)),
-                )
-            )
-            .distinct()
-            .limit(25)
-            .all()
-        )  # Reduced limit for faster response
-
-        # OPTIMIZED: Use eager loading for articles with tags
-        article_results = (
-            db.session.query(Review)
-            .options(joinedload(Review.tags))
-            .filter_by(movie_id=None)
-            .filter(
-                db.or_(
-                    Review.title.ilike(search_pattern),
-                    Review.review_text.ilike(search_pattern),
-                    Review.tags.any(Tag.name.ilike(search_pattern)),
-                )
-            )
-            .limit(25)
-            .all()
-        )  # Reduced limit for faster response
+        try:
+            page = max(1, int(request.args.get("page", 1)))
+        except (TypeError, ValueError):
+            page = 1
+        try:
+            limit = int(request.args.get("limit", SEARCH_DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            limit = SEARCH_DEFAULT_LIMIT
+        limit = max(1, min(limit, SEARCH_MAX_LIMIT))
 
-        # Directors: search by name or biography
-        director_results = (
-            db.session.query(Director)
-            .filter(
-                db.or_(
-                    Director.name.ilike(search_pattern),
-                    Director.biography.ilike(search_pattern),
-                )
-            )
-            .limit(25)
-            .all()
+        start = time.perf_counter()
+        results = run_search(search_query, types, page, limit)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        log = logger.warning if elapsed_ms > 300 else logger.info
+        log(
+            f"Search {search_query!r} page {page} took {elapsed_ms:.1f}ms",
+            extra={"search_types": types, "elapsed_ms": round(elapsed_ms, 1)},
         )
 
-        # Convert to dictionaries (now with pre-loaded relationships)
-        movies_data = [movie.to_dict() for movie in movie_results]
-        articles_data = [article.to_dict() for article in article_results]
-        directors_data = [director.to_dict() for director in director_results]
+        payload = {"movies": [], "articles": [], "directors": []}
+        has_more = {}
+        for search_type, (items, more) in results.items():
+            payload[search_type] = items
+            has_more[search_type] = more
 
-        return {
-            "movies": movies_data,
-            "articles": articles_data,
-            "directors": directors_data,
-            "totalResults": len(movies_data) + len(articles_data) + len(directors_data),
-        }, 200
+        payload["totalResults"] = sum(len(payload[t]) for t in SEARCH_TYPES)
+        payload["page"] = page
+        payload["limit"] = limit
+        payload["has_more"] = has_more
+        return payload, 200
+
+
+class SearchSuggest(Resource):
+    """Typeahead: ``[{id, type, label}]`` for movies, directors, articles and tags."""
+
+    def get(self):
+        query = request.args.get("q", "")
+        try:
+            limit = int(request.args.get("limit", SUGGEST_DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            limit = SUGGEST_DEFAULT_LIMIT
+        limit = max(1, min(limit, SUGGEST_MAX_LIMIT))
+
+        return {"suggestions": suggest_index.suggest(query, limit)}, 200
+
+
+class SearchIndexStats(Resource):
+    """State, size and build time of the in-process search indexes."""
+
+    def get(self):
+        return {**search_index.stats(), "suggest": suggest_index.stats()}, 200
+
+
+class TmdbCacheStats(Resource):
+    """Hit/miss counters and size of the TMDb response cache."""
+
+    def get(self):
+        stats = get_tmdb_client().cache_stats()
+        return stats if stats is not None else {"enabled": False}, 200
 
 
 def register_routes(api):
@@ -1287,9 +1388,12 @@ def register_routes(api):
     api.add_resource(Tags, "/api/tags")
     api.add_resource(PullMovieInfo, "/api/pull_movie_info")
     api.add_resource(DiscoverMovies, "/api/discover_movies")
+    api.add_resource(TmdbCacheStats, "/api/tmdb/cache")
     api.add_resource(Directors, "/api/directors")
     api.add_resource(DirectorById, "/api/directors/<int:director_id>")
     api.add_resource(UnifiedSearch, "/api/search")
+    api.add_resource(SearchSuggest, "/api/search/suggest")
+    api.add_resource(SearchIndexStats, "/api/search/index")
     api.add_resource(MovieRatings, "/api/movie-ratings")
     api.add_resource(MovieRatingsBulk, "/api/movie-ratings-bulk")
     api.add_resource(DeleteMovie, "/api/movies/<int:movie_id>/delete")
@@ -3,21 +3,130 @@
 import os
 
 # from flask_migrate import Migrate
-from flask import jsonify, request, send_file
+from flask import Response, jsonify, redirect, request, send_file
 from flask_restful import Resource
+from werkzeug.http import http_date
 
+from movie_reviews import document_cache, document_jobs
 from movie_reviews.config import app, db
-from movie_reviews.models import Director, Review, Tag
+from movie_reviews.models import Director, DocumentJob, Review, Tag
+from movie_reviews.utils import presigned_urls
 from movie_reviews.utils.document_processor import DocumentProcessor
 from movie_reviews.utils.review_html_enricher import enrich_review_html
 from movie_reviews.utils.s3_client import get_s3_client
 
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def _stream_object(object_key, mimetype=None, download_name=None):
+    """Stream an S3 object in chunks, honouring Range and conditional requests.
+
+    A single byte range is forwarded to GetObject (206), so PDF.js can fetch pages
+    as it needs them; If-None-Match / If-Modified-Since are checked by S3 (304).
+    Responses carry ETag and Last-Modified with ``Cache-Control: no-cache``: the
+    browser keeps its copy and revalidates it instead of downloading it again.
+    """
+    byte_range = None
+    if_match = None
+    if (
+        request.range is not None
+        and request.range.units == "bytes"
+        and len(request.range.ranges) == 1
+    ):
+        byte_range = request.headers.get("Range")
+        if request.if_range.etag:
+            # If-Range: the range only applies while the object is unchanged
+            if_match = f'"{request.if_range.etag}"'
+        elif request.if_range.date:
+            byte_range = None
+    validators = {
+        "if_none_match": request.headers.get("If-None-Match"),
+        "if_modified_since": request.if_modified_since,
+    }
+
+    s3_client = get_s3_client()
+    result = s3_client.open_stream(
+        object_key, byte_range=byte_range, if_match=if_match, **validators
+    )
+    if result["status"] == 412 and if_match:
+        # Changed since the client's partial copy: send the whole object
+        result = s3_client.open_stream(object_key, **validators)
+
+    headers = {"Cache-Control": "no-cache", "Accept-Ranges": "bytes"}
+    if result.get("etag"):
+        headers["ETag"] = result["etag"]
+    if result["status"] == 304:
+        return Response(status=304, headers=headers)
+    if result["status"] == 416:
+        if result.get("size") is not None:
+            headers["Content-Range"] = f"bytes */{result['size']}"
+        return Response(status=416, headers=headers)
+    if not result["success"]:
+        # 404 for a missing object, 502 when S3 itself failed
+        return {"error": result["error"]}, result["status"]
+
+    body = result["body"]
+
+    def generate():
+        try:
+            yield from body.iter_chunks(STREAM_CHUNK_BYTES)
+        finally:
+            body.close()
+
+    if result["content_length"] is not None:
+        headers["Content-Length"] = str(result["content_length"])
+    if result["content_range"]:
+        headers["Content-Range"] = result["content_range"]
+    if result["last_modified"]:
+        headers["Last-Modified"] = http_date(result["last_modified"])
+    if download_name:
+        headers["Content-Disposition"] = f'attachment; filename="{download_name}"'
+    return Response(
+        generate(),
+        status=result["status"],
+        mimetype=mimetype or result["content_type"],
+        headers=headers,
+        direct_passthrough=True,
+    )
+
+
+def _deliver_object(object_key, mimetype=None, download_name=None):
+    """302 to a presigned URL (OBJECT_DELIVERY=redirect), else stream via Flask."""
+    if presigned_urls.redirect_enabled():
+        overrides = {}
+        if mimetype:
+            overrides["ResponseContentType"] = mimetype
+        if download_name:
+            overrides["ResponseContentDisposition"] = (
+                f'attachment; filename="{download_name}"'
+            )
+        url = presigned_urls.presigned_url(object_key, **overrides)
+        if url:
+            response = redirect(url, code=302)
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+    return _stream_object(object_key, mimetype=mimetype, download_name=download_name)
 
-def _set_backdrop_from_doc_upload_if_empty(review: Review, result: dict) -> None:
-    """Use first image extracted from a .docx as backdrop when the review has none yet."""
-    key = result.get("backdrop_object_key")
-    if key and not (review.backdrop or "").strip():
-        review.backdrop = key
+
+def _job_location(job):
+    return {"Location": f"/api/documents/jobs/{job.id}"}
+
+
+def _process_or_enqueue(review, file, replace_text):
+    """Process ``file`` for ``review`` now, or queue it (DOCUMENT_JOBS); ``(job, result)``.
+
+    Bytes seen before are applied from the extraction cache right away, even in
+    queue mode. Raises ValueError for a file the queue rejects.
+    """
+    if document_jobs.DOCUMENT_JOBS_ENABLED:
+        result = document_cache.cached_result(file)
+        if result is None:
+            return document_jobs.enqueue(review.id, file, replace_text), None
+    else:
+        result = document_cache.process_upload(file, review.id)
+    if result["success"]:
+        document_jobs.apply_document_result(review, result, replace_text)
+    return None, result
 
 
 @app.route("/uploads/<filename>")
@@ -90,32 +199,28 @@ class ReviewWithDocument(Resource):
                             review.tags.append(tag)
 
             # Handle document upload if file is provided
+            job = None
             if file and file.filename:
-                result = DocumentProcessor.process_uploaded_document_s3(file, review.id)
-
-                if result["success"]:
-                    # Update review with document information
-                    review.has_document = True
-                    review.document_filename = result["filename"]
-                    review.document_path = result["file_path"]
-                    review.document_type = result["file_type"]
-
-                    if result.get("file_type") in ("docx", "doc"):
-                        review.main_cast = result.get("main_cast")
-                        review.line_notes = result.get("line_notes")
-
-                    _set_backdrop_from_doc_upload_if_empty(review, result)
-
-                    # Replace review text with extracted text if replace_text is true
-                    replace_text = data.get("replace_text", "true").lower() == "true"
-                    if replace_text and result["extracted_text"]:
-                        review.review_text = result["extracted_text"]
-                else:
+                # Replace review text with extracted text if replace_text is true
+                replace_text = data.get("replace_text", "true").lower() == "true"
+                try:
+                    job, result = _process_or_enqueue(review, file, replace_text)
+                except ValueError as e:
+                    db.session.rollback()
+                    return {"error": f"Document processing failed: {e}"}, 400
+                if result is not None and not result["success"]:
                     return {
                         "error": f'Document processing failed: {result["error"]}'
                     }, 400
 
             db.session.commit()
+            if job is not None:
+                # The review is saved; the document lands when the job finishes
+                return (
+                    {**review.to_dict(), "document_job": job.to_dict()},
+                    202,
+                    _job_location(job),
+                )
             return review.to_dict(), 201
 
         except Exception as e:
@@ -175,32 +280,28 @@ class ReviewWithDocumentById(Resource):
                             review.tags.append(tag)
 
             # Handle document upload if file is provided
+            job = None
             if file and file.filename:
-                result = DocumentProcessor.process_uploaded_document_s3(file, review.id)
-
-                if result["success"]:
-                    # Update review with document information
-                    review.has_document = True
-                    review.document_filename = result["filename"]
-                    review.document_path = result["file_path"]
-                    review.document_type = result["file_type"]
-
-                    if result.get("file_type") in ("docx", "doc"):
-                        review.main_cast = result.get("main_cast")
-                        review.line_notes = result.get("line_notes")
-
-                    _set_backdrop_from_doc_upload_if_empty(review, result)
-
-                    # Replace review text with extracted text if replace_text is true
-                    replace_text = data.get("replace_text", "true").lower() == "true"
-                    if replace_text and result["extracted_text"]:
-                        review.review_text = result["extracted_text"]
-                else:
+                # Replace review text with extracted text if replace_text is true
+                replace_text = data.get("replace_text", "true").lower() == "true"
+                try:
+                    job, result = _process_or_enqueue(review, file, replace_text)
+                except ValueError as e:
+                    db.session.rollback()
+                    return {"error": f"Document processing failed: {e}"}, 400
+                if result is not None and not result["success"]:
                     return {
                         "error": f'Document processing failed: {result["error"]}'
                     }, 400
 
             db.session.commit()
+            if job is not None:
+                # The review is saved; the document lands when the job finishes
+                return (
+                    {**review.to_dict(), "document_job": job.to_dict()},
+                    202,
+                    _job_location(job),
+                )
             return review.to_dict(), 200
 
         except Exception as e:
@@ -246,22 +347,27 @@ class DocumentUpload(Resource):
 
             # Process the document using S3 storage (production-ready)
             print(f"Processing document: {file.filename}")
-            result = DocumentProcessor.process_uploaded_document_s3(
-                file, int(review_id)
-            )
+            try:
+                job, result = _process_or_enqueue(review, file, replace_text)
+            except ValueError as e:
+                db.session.rollback()
+                return {"error": str(e)}, 400
+            if job is not None:
+                db.session.commit()
+                return (
+                    {
+                        "message": "Document queued for processing",
+                        "review": review.to_dict(),
+                        "job": job.to_dict(),
+                    },
+                    202,
+                    _job_location(job),
+                )
             print(f"Document processing result: {result}")
 
             if not result["success"]:
                 return {"error": result["error"]}, 400
 
-            # Update review with document information
-            print(
-                f"DEBUG DocumentUpload - Before update - document_path: {review.document_path}"
-            )
-            review.has_document = True
-            review.document_filename = result["filename"]
-            review.document_path = result["file_path"]  # Store the actual file path
-            review.document_type = result["file_type"]
             print(
                 f"DEBUG DocumentUpload - After update - document_path: {review.document_path}"
             )
@@ -269,16 +375,6 @@ class DocumentUpload(Resource):
                 f"DEBUG DocumentUpload - New file_path from result: {result['file_path']}"
             )
 
-            # Optionally replace review text with extracted text
-            if replace_text and result["extracted_text"]:
-                review.review_text = result["extracted_text"]
-
-            if result.get("file_type") in ("docx", "doc"):
-                review.main_cast = result.get("main_cast")
-                review.line_notes = result.get("line_notes")
-
-            _set_backdrop_from_doc_upload_if_empty(review, result)
-
             print("DEBUG DocumentUpload - About to commit changes")
             db.session.commit()
             print("DEBUG DocumentUpload - Commit successful")
@@ -297,6 +393,7 @@ class DocumentUpload(Resource):
                     "file_type": result["file_type"],
                     "extracted_text_length": len(result["extracted_text"]),
                     "text_replaced": replace_text,
+                    "cached": bool(result.get("cached")),
                 },
             }, 200
 
@@ -304,6 +401,20 @@ class DocumentUpload(Resource):
             return {"error": f"Upload failed: {str(e)}"}, 500
 
 
+class DocumentJobStatus(Resource):
+    """GET a queued document upload's progress (and the updated review once done)."""
+
+    def get(self, job_id):
+        job = db.session.get(DocumentJob, job_id)
+        if not job:
+            return {"error": "Job not found"}, 404
+        body = job.to_dict()
+        if job.status == "succeeded":
+            review = db.session.get(Review, job.review_id)
+            body["review"] = review.to_dict() if review else None
+        return body, 200
+
+
 class ExtractText(Resource):
     """Handle text extraction from documents without saving."""
 
@@ -371,8 +482,6 @@ class DocumentDownload(Resource):
     def get(self, review_id):
         """Download the document associated with a review."""
         try:
-            from movie_reviews.utils.s3_client import get_s3_client
-
             review = Review.query.get(review_id)
             if not review:
                 return {"error": "Review not found"}, 404
@@ -380,31 +489,10 @@ class DocumentDownload(Resource):
             if not review.has_document or not review.document_path:
                 return {"error": "No document associated with this review"}, 404
 
-            # Download file from S3
-            s3_client = get_s3_client()
-            download_result = s3_client.download_file(review.document_path)
-
-            if not download_result["success"]:
-                return {"error": download_result["error"]}, 404
-
-            # Create response with file data
-            from flask import Response
-
-            response = Response(
-                download_result["file_data"],
-                mimetype=download_result["content_type"],
-                headers={
-                    "Content-Disposition": f'attachment; filename="{review.document_filename}"'
-                },
+            return _deliver_object(
+                review.document_path, download_name=review.document_filename
             )
 
-            # Add cache-busting headers
-            response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
-
-            return response
-
         except Exception as e:
             return {"error": f"Download failed: {str(e)}"}, 500
 
@@ -415,8 +503,6 @@ class DocumentView(Resource):
     def get(self, review_id):
         """View the document associated with a review inline."""
         try:
-            from movie_reviews.utils.s3_client import get_s3_client
-
             print(f"DEBUG DocumentView - Looking for review_id: {review_id}")
             review = Review.query.get(review_id)
             if not review:
@@ -433,32 +519,9 @@ class DocumentView(Resource):
                 )
                 return {"error": "No document associated with this review"}, 404
 
-            # Download file from S3
-            s3_client = get_s3_client()
-            download_result = s3_client.download_file(review.document_path)
-
-            if not download_result["success"]:
-                print(
-                    f"DEBUG DocumentView - S3 download failed: {download_result['error']}"
-                )
-                return {"error": download_result["error"]}, 404
-
-            # Create response with file data for inline viewing
-            from flask import Response
-
-            mimetype = (
-                "application/pdf"
-                if review.document_type == "pdf"
-                else download_result["content_type"]
-            )
-            response = Response(download_result["file_data"], mimetype=mimetype)
-
-            # Add cache-busting headers
-            response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
-
-            return response
+            # Inline viewing: PDFs always as application/pdf for the browser viewer
+            mimetype = "application/pdf" if review.document_type == "pdf" else None
+            return _deliver_object(review.document_path, mimetype=mimetype)
 
         except Exception as e:
             return {"error": f"View failed: {str(e)}"}, 500
@@ -544,7 +607,8 @@ class ArticleBackdropUpload(Resource):
                 return {"error": "Article not found"}, 404
 
             key = (review.backdrop or "").strip()
-            if key:
+            # Backdrops taken from a cached .docx are shared; leave those objects
+            if key and not document_cache.is_shared_object(key):
                 s3_client = get_s3_client()
                 del_result = s3_client.delete_file(key)
                 if not del_result.get("success"):
@@ -610,7 +674,8 @@ class ReviewBackdropUpload(Resource):
                 return {"error": "Review not found"}, 404
 
             key = (review.backdrop or "").strip()
-            if key:
+            # Backdrops taken from a cached .docx are shared; leave those objects
+            if key and not document_cache.is_shared_object(key):
                 s3_client = get_s3_client()
                 del_result = s3_client.delete_file(key)
                 if not del_result.get("success"):
@@ -674,18 +739,7 @@ class ArticleBackdropView(Resource):
             if not review or not review.backdrop:
                 return {"error": "Backdrop not found"}, 404
 
-            s3_client = get_s3_client()
-            key = review.backdrop
-            download = s3_client.download_file(key)
-            if not download["success"]:
-                return {"error": download["error"]}, 404
-
-            from flask import Response
-
-            return Response(
-                download["file_data"],
-                mimetype=download.get("content_type", "image/jpeg"),
-            )
+            return _deliver_object(review.backdrop)
         except Exception as e:
             return {"error": f"Backdrop fetch failed: {str(e)}"}, 500
 
@@ -701,18 +755,7 @@ class ReviewBackdropView(Resource):
             if not review or not review.backdrop:
                 return {"error": "Backdrop not found"}, 404
 
-            s3_client = get_s3_client()
-            key = review.backdrop
-            download = s3_client.download_file(key)
-            if not download["success"]:
-                return {"error": download["error"]}, 404
-
-            from flask import Response
-
-            return Response(
-                download["file_data"],
-                mimetype=download.get("content_type", "image/jpeg"),
-            )
+            return _deliver_object(review.backdrop)
         except Exception as e:
             return {"error": f"Backdrop fetch failed: {str(e)}"}, 500
 
@@ -726,18 +769,7 @@ class DirectorBackdropView(Resource):
             if not director or not director.backdrop:
                 return {"error": "Backdrop not found"}, 404
 
-            s3_client = get_s3_client()
-            key = director.backdrop
-            download = s3_client.download_file(key)
-            if not download["success"]:
-                return {"error": download["error"]}, 404
-
-            from flask import Response
-
-            return Response(
-                download["file_data"],
-                mimetype=download.get("content_type", "image/jpeg"),
-            )
+            return _deliver_object(director.backdrop)
         except Exception as e:
             return {"error": f"Backdrop fetch failed: {str(e)}"}, 500
 
@@ -746,6 +778,7 @@ def register_routes(api):
     api.add_resource(EnrichReviewHtml, "/api/enrich_review_html")
     api.add_resource(ExtractText, "/api/extract_text")
     api.add_resource(DocumentUpload, "/api/upload_document")
+    api.add_resource(DocumentJobStatus, "/api/documents/jobs/<int:job_id>")
     api.add_resource(ReviewWithDocument, "/api/reviews_with_document")
     api.add_resource(
         ReviewWithDocumentById, "/api/reviews_with_document/<int:review_id>"
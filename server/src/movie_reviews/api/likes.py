@@ -2,61 +2,97 @@
 
 from flask import session
 from flask_restful import Resource
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 
+from movie_reviews import like_buffer, stream
 from movie_reviews.config import db
 from movie_reviews.models import CommentLike, Review, ReviewComment, ReviewLike
 
+from .activity import activity_written, like_activity_item, publish_activity
+from .comments import invalidate_review_comments
+
+
+def _toggle(like_model, target_id, not_found):
+    user_id = session.get("user_id")
+    if not user_id:
+        return {"error": "You must be logged in to like"}, 401
+    result = like_buffer.toggle(like_model, user_id, target_id)
+    if result is None:
+        db.session.rollback()
+        return {"error": not_found}, 404
+    liked, like_count = result
+    if like_buffer.LIKE_WRITE_BEHIND_ENABLED:
+        # Nothing is written yet: the flush hooks below publish and invalidate
+        return {"liked": liked, "like_count": like_count}, 200
+    if liked and like_model is ReviewLike and stream.STREAM_ENABLED:
+        _publish_review_likes(
+            ReviewLike.user_id == user_id, ReviewLike.review_id == target_id
+        )
+    db.session.commit()
+    _likes_committed(like_model, (), {target_id})
+    return {"liked": liked, "like_count": like_count}, 200
+
+
+def _publish_review_likes(*criteria):
+    likes = ReviewLike.query.options(
+        joinedload(ReviewLike.user),
+        joinedload(ReviewLike.review).joinedload(Review.movie),
+    ).filter(*criteria)
+    for like in likes:
+        publish_activity(like_activity_item(like))
+
+
+def _likes_written(like_model, inserted_ids, target_ids):
+    """Buffer flush, inside the batch's transaction: queue the new likes' events."""
+    if like_model is ReviewLike and inserted_ids and stream.STREAM_ENABLED:
+        _publish_review_likes(ReviewLike.id.in_(inserted_ids))
+
+
+def _likes_committed(like_model, _inserted_ids, target_ids):
+    """After likes commit (here or in a buffer flush): drop what cached their counts."""
+    if like_model is ReviewLike:
+        activity_written()
+        return
+    # like_count is part of the cached comment pages
+    review_ids = db.session.scalars(
+        select(ReviewComment.review_id)
+        .where(ReviewComment.id.in_(target_ids))
+        .distinct()
+    )
+    for review_id in review_ids:
+        invalidate_review_comments(review_id)
+
+
+like_buffer.like_buffer.on_written.append(_likes_written)
+like_buffer.like_buffer.on_committed.append(_likes_committed)
+
 
 class CommentLikeToggle(Resource):
     """POST to toggle like on a comment. Requires session. Returns { liked, like_count }."""
 
     def post(self, comment_id):
-        user_id = session.get("user_id")
-        if not user_id:
-            return {"error": "You must be logged in to like"}, 401
-        comment = ReviewComment.query.get(comment_id)
-        if not comment:
-            return {"error": "Comment not found"}, 404
-        existing = CommentLike.query.filter_by(
-            user_id=user_id, comment_id=comment_id
-        ).first()
-        if existing:
-            db.session.delete(existing)
-            db.session.commit()
-            count = CommentLike.query.filter_by(comment_id=comment_id).count()
-            return {"liked": False, "like_count": count}, 200
-        like = CommentLike(user_id=user_id, comment_id=comment_id)
-        db.session.add(like)
-        db.session.commit()
-        count = CommentLike.query.filter_by(comment_id=comment_id).count()
-        return {"liked": True, "like_count": count}, 200
+        return _toggle(CommentLike, comment_id, "Comment not found")
 
 
 class ReviewLikeToggle(Resource):
     """POST to toggle like on a review/post. Requires session. Returns { liked, like_count }."""
 
     def post(self, review_id):
-        user_id = session.get("user_id")
-        if not user_id:
-            return {"error": "You must be logged in to like"}, 401
-        review = Review.query.get(review_id)
-        if not review:
-            return {"error": "Review not found"}, 404
-        existing = ReviewLike.query.filter_by(
-            user_id=user_id, review_id=review_id
-        ).first()
-        if existing:
-            db.session.delete(existing)
-            db.session.commit()
-            count = ReviewLike.query.filter_by(review_id=review_id).count()
-            return {"liked": False, "like_count": count}, 200
-        like = ReviewLike(user_id=user_id, review_id=review_id)
-        db.session.add(like)
-        db.session.commit()
-        count = ReviewLike.query.filter_by(review_id=review_id).count()
-        return {"liked": True, "like_count": count}, 200
+        return _toggle(ReviewLike, review_id, "Review not found")
+
+
+class LikeBufferStats(Resource):
+    """GET write-behind buffer counters (pending keys, flushes, drops)."""
+
+    def get(self):
+        return {
+            "enabled": like_buffer.LIKE_WRITE_BEHIND_ENABLED,
+            **like_buffer.like_buffer.stats(),
+        }, 200
 
 
 def register_routes(api_instance):
     api_instance.add_resource(CommentLikeToggle, "/api/comments/<int:comment_id>/like")
     api_instance.add_resource(ReviewLikeToggle, "/api/reviews/<int:review_id>/like")
+    api_instance.add_resource(LikeBufferStats, "/api/likes/buffer")
@@ -1,163 +1,216 @@
-"""Notifications: derived from replies and likes; read state in NotificationRead."""
+"""
+Notifications: rows written on reply/like by models.fanout, listed newest first.
+
+``NOTIFICATIONS_SOURCE=derived`` serves the same list straight from replies and
+comment likes instead (one UNION ALL statement, read state from
+notification_reads), for databases whose notifications table is not backfilled
+yet or as a fallback while fan-out is being checked.
+"""
+
+import os
 
 from flask import request, session
 from flask_restful import Resource
-from sqlalchemy import and_, or_
-from sqlalchemy.orm import aliased
+from sqlalchemy import and_, func, literal, select, tuple_
 
 from movie_reviews.config import db
 from movie_reviews.models import (
-    CommentLike,
+    Notification,
     NotificationRead,
     Review,
-    ReviewComment,
     User,
+    fanout,
 )
 
+NOTIFICATION_PAGE_DEFAULT_LIMIT = 20
+NOTIFICATION_PAGE_MAX_LIMIT = 50
+NOTIFICATIONS_SOURCE = os.getenv("NOTIFICATIONS_SOURCE", "table").lower()
+# The derived engine has no unread counter; it counts unread events up to this
+# many plus one, and the bell shows "99+" beyond it.
+NOTIFICATION_UNREAD_COUNT_CAP = 99
 
-def _replies_to_me(user_id):
-    """Replies where I am the parent comment author. Returns list of (event_id, event_at, actor_id, review_id)."""
-    parent = aliased(ReviewComment)
-    rows = (
-        db.session.query(
-            ReviewComment.id,
-            ReviewComment.created_at,
-            ReviewComment.user_id,
-            ReviewComment.review_id,
-        )
-        .join(parent, ReviewComment.parent_comment_id == parent.id)
-        .filter(parent.user_id == user_id)
-        .filter(ReviewComment.user_id != user_id)
-        .all()
+
+def _review_columns():
+    return (
+        Review.title.label("review_title"),
+        func.substr(Review.review_text, 1, 50).label("review_text"),
     )
+
+
+def _review_title(row):
+    if row.review_title:
+        return row.review_title
+    if row.review_text:
+        return row.review_text + "..."
+    return f"Review {row.review_id}"
+
+
+def _page_items(rows):
     return [
         {
-            "event_id": r[0],
-            "event_at": r[1],
-            "actor_id": r[2],
-            "review_id": r[3],
-            "event_type": "reply",
+            "event_type": row.event_type,
+            "event_id": row.event_id,
+            "event_at": row.created_at.isoformat() if row.created_at else None,
+            "review_id": row.review_id,
+            "review_title": _review_title(row) if row.review_id else "",
+            "actor_id": row.actor_id,
+            "actor_username": row.actor_username or "",
+            "read": row.read_at is not None,
         }
-        for r in rows
+        for row in rows
     ]
 
 
-def _likes_on_my_comments(user_id):
-    """Likes on comments I wrote. Returns list of (event_id, event_at, actor_id, review_id)."""
-    rows = (
+def _table_page(user_id, limit, offset, after):
+    """One index range scan on ix_notifications_user_created."""
+    query = (
         db.session.query(
-            CommentLike.id,
-            CommentLike.created_at,
-            CommentLike.user_id,
-            ReviewComment.review_id,
+            Notification.id,
+            Notification.event_type,
+            Notification.event_id,
+            Notification.created_at,
+            Notification.review_id,
+            Notification.actor_id,
+            Notification.read_at,
+            User.username.label("actor_username"),
+            *_review_columns(),
         )
-        .join(ReviewComment, CommentLike.comment_id == ReviewComment.id)
-        .filter(ReviewComment.user_id == user_id)
-        .filter(CommentLike.user_id != user_id)
-        .all()
+        .outerjoin(User, User.id == Notification.actor_id)
+        .outerjoin(Review, Review.id == Notification.review_id)
+        .filter(Notification.user_id == user_id)
     )
-    return [
-        {
-            "event_id": r[0],
-            "event_at": r[1],
-            "actor_id": r[2],
-            "review_id": r[3],
-            "event_type": "comment_like",
-        }
-        for r in rows
-    ]
+
+    if after:
+        try:
+            after_id = int(after)
+        except (TypeError, ValueError):
+            return {"error": "after must be a notification id"}, 400
+        anchor = (
+            db.session.query(Notification.created_at)
+            .filter(Notification.id == after_id, Notification.user_id == user_id)
+            .scalar()
+        )
+        if anchor is None:
+            return {"error": "Invalid cursor: notification not found"}, 400
+        key = tuple_(Notification.created_at, Notification.id)
+        query = query.filter(key < tuple_(literal(anchor), literal(after_id)))
+    query = query.order_by(Notification.created_at.desc(), Notification.id.desc())
+    if offset and not after:
+        query = query.offset(offset)
+
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # unread_count is the counter fan-out maintains; there is deliberately no
+    # "total": counting the whole history on every poll is what the bell cannot
+    # afford, and clients page with has_more / next_cursor.
+    unread_count = (
+        db.session.query(User.unread_notification_count)
+        .filter(User.id == user_id)
+        .scalar()
+    )
+
+    return {
+        "items": _page_items(rows),
+        "unread_count": unread_count,
+        "has_more": has_more,
+        "next_cursor": rows[-1].id if has_more else None,
+    }, 200
+
+
+def _derived_page(user_id, limit, offset, after):
+    """Merge, order, page and read flags in SQL; cursor is "<event_type>:<event_id>"."""
+    events = fanout.derived_events(user_id).subquery("events")
+    read_join = and_(
+        NotificationRead.user_id == user_id,
+        NotificationRead.event_type == events.c.event_type,
+        NotificationRead.event_id == events.c.event_id,
+    )
+    query = (
+        select(
+            events.c.event_type,
+            events.c.event_id,
+            events.c.created_at,
+            events.c.review_id,
+            events.c.actor_id,
+            NotificationRead.read_at,
+            User.username.label("actor_username"),
+            *_review_columns(),
+        )
+        .select_from(events)
+        .outerjoin(NotificationRead, read_join)
+        .outerjoin(User, User.id == events.c.actor_id)
+        .outerjoin(Review, Review.id == events.c.review_id)
+    )
+
+    if after:
+        event_type, _, event_id = after.partition(":")
+        if event_type not in fanout.EVENT_TYPES or not event_id.isdigit():
+            return {"error": "after must be <event_type>:<event_id>"}, 400
+        anchor = db.session.scalar(
+            select(events.c.created_at).where(
+                events.c.event_type == event_type,
+                events.c.event_id == int(event_id),
+            )
+        )
+        if anchor is None:
+            return {"error": "Invalid cursor: notification not found"}, 400
+        key = tuple_(events.c.created_at, events.c.event_type, events.c.event_id)
+        bound = tuple_(literal(anchor), literal(event_type), literal(int(event_id)))
+        query = query.where(key < bound)
+    query = query.order_by(
+        events.c.created_at.desc(),
+        events.c.event_type.desc(),
+        events.c.event_id.desc(),
+    )
+    if offset and not after:
+        query = query.offset(offset)
+
+    rows = db.session.execute(query.limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    unread = (
+        select(literal(1))
+        .select_from(events)
+        .outerjoin(NotificationRead, read_join)
+        .where(NotificationRead.id.is_(None))
+        .limit(NOTIFICATION_UNREAD_COUNT_CAP + 1)
+        .subquery()
+    )
+    unread_count = db.session.scalar(select(func.count()).select_from(unread))
+
+    last = rows[-1] if has_more else None
+    return {
+        "items": _page_items(rows),
+        "unread_count": unread_count,
+        "has_more": has_more,
+        "next_cursor": f"{last.event_type}:{last.event_id}" if last else None,
+    }, 200
 
 
 class NotificationsList(Resource):
-    """GET /api/notifications - paginated list for current user. Newest first."""
+    """GET /api/notifications - paginated list for current user. Newest first.
+
+    ``after=<next_cursor>`` continues from the previous page (keyset); ``offset`` is
+    still accepted for older clients.
+    """
 
     def get(self):
         user_id = session.get("user_id")
         if not user_id:
             return {"error": "You must be logged in to view notifications"}, 401
 
-        limit_param = request.args.get("limit", 20)
-        limit = min(int(limit_param), 50)
-        offset_param = request.args.get("offset", 0)
-        offset = max(int(offset_param), 0)
-
-        replies = _replies_to_me(user_id)
-        likes = _likes_on_my_comments(user_id)
-        merged = replies + likes
-        merged.sort(key=lambda x: x["event_at"], reverse=True)
-
-        total = len(merged)
-        page = merged[offset : offset + limit + 1]
-        has_more = len(page) > limit
-        if has_more:
-            page = page[:limit]
-
-        if not page:
-            return {
-                "items": [],
-                "total": total,
-                "unread_count": 0,
-                "has_more": False,
-            }, 200
-
-        read_pairs = [(p["event_type"], p["event_id"]) for p in page]
-        read_set = set()
-        if read_pairs:
-            conditions = [
-                and_(
-                    NotificationRead.event_type == et,
-                    NotificationRead.event_id == eid,
-                )
-                for et, eid in read_pairs
-            ]
-            q = NotificationRead.query.filter_by(user_id=user_id)
-            q = q.filter(or_(*conditions))
-            read_records = q.all()
-            read_set = {(r.event_type, r.event_id) for r in read_records}
-
-        actor_ids = {p["actor_id"] for p in page}
-        actors = {
-            u.id: u.username for u in User.query.filter(User.id.in_(actor_ids)).all()
-        }
-
-        review_ids = {p["review_id"] for p in page}
-        review_objs = Review.query.filter(Review.id.in_(review_ids)).all()
-        review_titles = {}
-        for r in review_objs:
-            title = getattr(r, "title", None) or (
-                r.review_text[:50] + "..." if r.review_text else f"Review {r.id}"
-            )
-            review_titles[r.id] = title
-
-        items = []
-        for p in page:
-            items.append(
-                {
-                    "event_type": p["event_type"],
-                    "event_id": p["event_id"],
-                    "event_at": p["event_at"].isoformat() if p["event_at"] else None,
-                    "review_id": p["review_id"],
-                    "review_title": review_titles.get(p["review_id"], ""),
-                    "actor_id": p["actor_id"],
-                    "actor_username": actors.get(p["actor_id"], ""),
-                    "read": (p["event_type"], p["event_id"]) in read_set,
-                }
-            )
-
-        event_types = ["reply", "comment_like"]
-        read_count = (
-            NotificationRead.query.filter_by(user_id=user_id)
-            .filter(NotificationRead.event_type.in_(event_types))
-            .count()
-        )
-        unread_count = max(0, total - read_count)
+        try:
+            limit = int(request.args.get("limit", NOTIFICATION_PAGE_DEFAULT_LIMIT))
+            offset = max(int(request.args.get("offset", 0)), 0)
+        except (TypeError, ValueError):
+            return {"error": "limit and offset must be integers"}, 400
+        limit = max(1, min(limit, NOTIFICATION_PAGE_MAX_LIMIT))
 
-        return {
-            "items": items,
-            "total": total,
-            "unread_count": unread_count,
-            "has_more": has_more,
-        }, 200
+        page = _derived_page if NOTIFICATIONS_SOURCE == "derived" else _table_page
+        return page(user_id, limit, offset, request.args.get("after"))
 
 
 class NotificationsMarkRead(Resource):
@@ -173,28 +226,25 @@ class NotificationsMarkRead(Resource):
         if not events:
             return {"error": "events array required"}, 400
 
-        created = 0
-        for ev in events:
-            event_type = ev.get("event_type")
-            event_id = ev.get("event_id")
-            if event_type not in ("reply", "comment_like") or event_id is None:
-                continue
-            existing = NotificationRead.query.filter_by(
-                user_id=user_id,
-                event_type=event_type,
-                event_id=event_id,
-            ).first()
-            if not existing:
-                nr = NotificationRead(
-                    user_id=user_id,
-                    event_type=event_type,
-                    event_id=event_id,
-                )
-                db.session.add(nr)
-                created += 1
-
+        pairs = [
+            (ev.get("event_type"), ev.get("event_id"))
+            for ev in events
+            if ev.get("event_type") in fanout.EVENT_TYPES
+            and ev.get("event_id") is not None
+        ]
+        try:
+            # Both stores are kept current so NOTIFICATIONS_SOURCE can be switched
+            # either way without losing read state; "marked" comes from the one
+            # being served.
+            marked = fanout.mark_read(db.session, user_id, pairs)
+            recorded = fanout.record_reads(db.session, user_id, pairs)
+            if NOTIFICATIONS_SOURCE == "derived":
+                marked = recorded
+        except (TypeError, ValueError):
+            db.session.rollback()
+            return {"error": "event_id must be an integer"}, 400
         db.session.commit()
-        return {"marked": created}, 200
+        return {"marked": marked}, 200
 
 
 def register_routes(api_instance):
@@ -0,0 +1,49 @@
+"""Server-sent events: GET /api/stream pushes notifications and activity items."""
+
+from flask import Response, request, session, stream_with_context
+from flask_restful import Resource
+
+from movie_reviews import stream
+
+
+class EventStream(Resource):
+    """GET /api/stream - text/event-stream of ``activity`` items, plus the
+    signed-in user's ``notification`` / ``notification_removed`` events.
+    Events carry ``id:``; on reconnect the ones after ``Last-Event-ID`` are
+    replayed, and ``resync`` means events were lost and the client should refetch."""
+
+    def get(self):
+        if not stream.STREAM_ENABLED:
+            return {"error": "Streaming is not enabled"}, 404
+        channels = ["activity"]
+        user_id = session.get("user_id")
+        if user_id:
+            channels.append(stream.user_channel(user_id))
+        # Sent by EventSource on reconnect; missed events are replayed
+        subscription = stream.broker.subscribe(
+            channels, last_event_id=request.headers.get("Last-Event-ID")
+        )
+
+        def generate():
+            try:
+                yield from stream.events(subscription)
+            finally:
+                stream.broker.unsubscribe(subscription)
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+
+class EventStreamStats(Resource):
+    """GET /api/stream/stats - open streams and publish/deliver/drop counters."""
+
+    def get(self):
+        return {"enabled": stream.STREAM_ENABLED, **stream.broker.stats()}, 200
+
+
+def register_routes(api_instance):
+    api_instance.add_resource(EventStream, "/api/stream")
+    api_instance.add_resource(EventStreamStats, "/api/stream/stats")
@@ -0,0 +1,190 @@
+"""
+Content-addressed cache in front of DocumentProcessor.process_uploaded_document_s3.
+
+Editors re-upload the same .docx or PDF while revising, and every upload used to
+re-run extraction and enrichment and store the bytes again under a new UUID key.
+Now the upload is hashed (SHA-256, read in chunks) and looked up in
+``document_extractions``; identical bytes of the same type reuse the stored HTML,
+main cast / line notes, backdrop and S3 object, so a repeat upload costs a hash, a
+lookup and a HEAD on the object. Misses run the full pipeline and record the
+result (``INSERT ... ON CONFLICT`` so concurrent uploads of one file cannot clash).
+
+A hit points the new review at the same S3 objects as every earlier upload of
+those bytes; nothing copies or counts them. Code that deletes a review's document
+or backdrop object must skip it while ``is_shared_object`` says a cache entry
+still names it.
+
+Bump ``EXTRACTION_VERSION`` whenever the extraction or enrichment output changes;
+older entries are then treated as misses and overwritten. ``DOCUMENT_CACHE=0``
+turns the cache off.
+"""
+
+import hashlib
+import os
+from datetime import datetime
+
+from sqlalchemy import exists, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from werkzeug.utils import secure_filename
+
+from movie_reviews.config import db
+from movie_reviews.logging import logger
+from movie_reviews.models import DocumentExtraction
+from movie_reviews.utils.document_processor import DocumentProcessor
+from movie_reviews.utils.s3_client import get_s3_client
+
+DOCUMENT_CACHE_ENABLED = os.getenv("DOCUMENT_CACHE", "1").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+EXTRACTION_VERSION = 1
+HASH_CHUNK_BYTES = 1024 * 1024
+
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def content_hash(file):
+    """SHA-256 hex digest and size of an uploaded file, leaving it rewound."""
+    digest = hashlib.sha256()
+    size = 0
+    file.seek(0)
+    while chunk := file.read(HASH_CHUNK_BYTES):
+        digest.update(chunk)
+        size += len(chunk)
+    file.seek(0)
+    return digest.hexdigest(), size
+
+
+def _cacheable(file):
+    return (
+        DOCUMENT_CACHE_ENABLED
+        and file
+        and file.filename
+        and DocumentProcessor.allowed_file(file.filename)
+    )
+
+
+def _lookup(digest, file_type):
+    entry = db.session.get(DocumentExtraction, digest)
+    if (
+        entry is None
+        or entry.file_type != file_type
+        or entry.extractor_version != EXTRACTION_VERSION
+    ):
+        return None
+    # The object may have been removed from the bucket by hand
+    if not get_s3_client().object_exists(entry.object_key):
+        logger.warning(f"document_cache object {entry.object_key} missing; re-storing")
+        return None
+    db.session.execute(
+        update(DocumentExtraction)
+        .where(DocumentExtraction.content_sha256 == digest)
+        .values(
+            hit_count=DocumentExtraction.hit_count + 1,
+            last_used_at=datetime.utcnow(),
+        )
+    )
+    return entry
+
+
+def _hit(file, digest):
+    file_type = DocumentProcessor.get_file_type(file.filename)
+    entry = _lookup(digest, file_type)
+    if entry is None:
+        return None
+    logger.info(
+        f"document_cache hit sha256={digest[:12]} object_key={entry.object_key}",
+        extra={"content_sha256": digest, "object_key": entry.object_key},
+    )
+    # Shared with the reviews that uploaded these bytes before (see is_shared_object)
+    result = {
+        "success": True,
+        "filename": secure_filename(file.filename),
+        "file_path": entry.object_key,
+        "file_type": file_type,
+        "extracted_text": entry.extracted_html,
+        "content_sha256": digest,
+        "cached": True,
+    }
+    if file_type in ("docx", "doc"):
+        result["main_cast"] = entry.main_cast
+        result["line_notes"] = entry.line_notes
+    if entry.backdrop_object_key:
+        result["backdrop_object_key"] = entry.backdrop_object_key
+    return result
+
+
+def cached_result(file):
+    """The stored result for ``file``'s bytes (shaped like a processor result), or None."""
+    if not _cacheable(file):
+        return None
+    digest, _size = content_hash(file)
+    return _hit(file, digest)
+
+
+def _store(digest, size, result):
+    values = {
+        "content_sha256": digest,
+        "file_type": result["file_type"],
+        "size_bytes": size,
+        "object_key": result["file_path"],
+        "extracted_html": result["extracted_text"],
+        "main_cast": result.get("main_cast"),
+        "line_notes": result.get("line_notes"),
+        "backdrop_object_key": result.get("backdrop_object_key"),
+        "extractor_version": EXTRACTION_VERSION,
+        "created_at": datetime.utcnow(),
+        "last_used_at": datetime.utcnow(),
+    }
+    insert = _DIALECT_INSERTS[db.session.get_bind().dialect.name]
+    statement = insert(DocumentExtraction.__table__).values(values)
+    db.session.execute(
+        statement.on_conflict_do_update(
+            index_elements=["content_sha256"],
+            set_={
+                name: statement.excluded[name]
+                for name in values
+                if name not in ("content_sha256", "created_at")
+            },
+        )
+    )
+
+
+def process_upload(file, review_id, progress=None):
+    """process_uploaded_document_s3 with the cache in front; same result shape.
+
+    Writes the cache row in the caller's transaction, so it lands with the review.
+    """
+    if not _cacheable(file):
+        return DocumentProcessor.process_uploaded_document_s3(
+            file, review_id, progress=progress
+        )
+    digest, size = content_hash(file)
+    result = _hit(file, digest)
+    if result is not None:
+        if progress:
+            progress("cached", 80)
+        return result
+    result = DocumentProcessor.process_uploaded_document_s3(
+        file, review_id, progress=progress
+    )
+    if result["success"]:
+        _store(digest, size, result)
+        result["content_sha256"] = digest
+    return result
+
+
+def is_shared_object(object_key):
+    """True when a cache entry names ``object_key`` (document or backdrop), so other
+    reviews may point at it and it must not be deleted for one of them."""
+    return db.session.scalar(
+        select(
+            exists().where(
+                or_(
+                    DocumentExtraction.object_key == object_key,
+                    DocumentExtraction.backdrop_object_key == object_key,
+                )
+            )
+        )
+    )
@@ -0,0 +1,355 @@
+"""
+Database-backed queue for document uploads (opt-in: ``DOCUMENT_JOBS=1``).
+
+Without it the document endpoints run DocumentProcessor.process_uploaded_document_s3
+inside the request: temp file, pdfplumber/python-docx extraction, HTML enrichment,
+the S3 upload and the backdrop image, which holds a gunicorn worker for seconds on
+a long PDF. With it the request only checks the file, stores the bytes in a
+``document_jobs`` row and answers 202 with the job; a worker claims the job, does
+the processing and then, in one transaction, applies the result to the review and
+marks the job succeeded. Clients poll ``GET /api/documents/jobs/<id>``.
+
+Workers need nothing but the database:
+
+  python -m movie_reviews.document_jobs                 # one worker process
+  python -m movie_reviews.document_jobs --processes 4   # a small pool
+  python -m movie_reviews.document_jobs --drain         # work the queue, then exit
+
+or ``DOCUMENT_JOB_THREADS=N`` to run N worker threads inside each web worker (no
+extra service to deploy, but extraction then competes with requests for CPU).
+
+A claim is a conditional UPDATE on a still-queued row (with ``FOR UPDATE SKIP
+LOCKED`` on Postgres), so any number of workers can poll the same table. Progress
+reports refresh the worker's lease; a running job whose lease is older than
+``DOCUMENT_JOB_LEASE_SECONDS`` goes back to the queue, up to
+``DOCUMENT_JOB_MAX_ATTEMPTS`` attempts.
+"""
+
+import argparse
+import io
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+from werkzeug.datastructures import FileStorage
+
+from movie_reviews import document_cache
+from movie_reviews.config import db
+from movie_reviews.logging import logger
+from movie_reviews.models import DocumentJob, Review
+from movie_reviews.utils.document_processor import DocumentProcessor
+
+DOCUMENT_JOBS_ENABLED = os.getenv("DOCUMENT_JOBS", "").lower() in ("1", "true", "yes")
+DOCUMENT_JOB_THREADS = int(os.getenv("DOCUMENT_JOB_THREADS", "0"))
+DOCUMENT_JOB_POLL_SECONDS = float(os.getenv("DOCUMENT_JOB_POLL_SECONDS", "2"))
+DOCUMENT_JOB_LEASE_SECONDS = int(os.getenv("DOCUMENT_JOB_LEASE_SECONDS", "600"))
+DOCUMENT_JOB_MAX_ATTEMPTS = int(os.getenv("DOCUMENT_JOB_MAX_ATTEMPTS", "3"))
+DOCUMENT_JOB_MAX_BYTES = int(os.getenv("DOCUMENT_JOB_MAX_BYTES", str(25 * 1024 * 1024)))
+
+
+def apply_document_result(review, result, replace_text):
+    """Copy a successful process_uploaded_document_s3 result onto ``review``."""
+    review.has_document = True
+    review.document_filename = result["filename"]
+    review.document_path = result["file_path"]
+    review.document_type = result["file_type"]
+
+    if result.get("file_type") in ("docx", "doc"):
+        review.main_cast = result.get("main_cast")
+        review.line_notes = result.get("line_notes")
+
+    # First image extracted from a .docx becomes the backdrop when there is none yet
+    key = result.get("backdrop_object_key")
+    if key and not (review.backdrop or "").strip():
+        review.backdrop = key
+
+    if replace_text and result["extracted_text"]:
+        review.review_text = result["extracted_text"]
+
+
+def enqueue(review_id, file, replace_text):
+    """Queue ``file`` for ``review_id``; the caller commits.
+
+    Raises ValueError (message suitable for a 400) when the file is unusable.
+    """
+    if not DocumentProcessor.allowed_file(file.filename):
+        raise ValueError("File type not allowed")
+    file.seek(0)
+    payload = file.read(DOCUMENT_JOB_MAX_BYTES + 1)
+    if len(payload) > DOCUMENT_JOB_MAX_BYTES:
+        raise ValueError(
+            f"Document is larger than {DOCUMENT_JOB_MAX_BYTES // (1024 * 1024)} MB"
+        )
+    if not payload:
+        raise ValueError("Document is empty")
+    job = DocumentJob(
+        review_id=review_id,
+        status="queued",
+        stage="queued",
+        progress=0,
+        filename=file.filename[:255],
+        file_type=DocumentProcessor.get_file_type(file.filename),
+        replace_text=replace_text,
+        payload=payload,
+    )
+    db.session.add(job)
+    db.session.flush()
+    return job
+
+
+# Worker side -----------------------------------------------------------------
+
+
+def _requeue_stale(now):
+    """Return jobs whose worker stopped reporting to the queue (or fail them)."""
+    stale = (
+        DocumentJob.status == "running",
+        DocumentJob.locked_at < now - timedelta(seconds=DOCUMENT_JOB_LEASE_SECONDS),
+    )
+    db.session.execute(
+        update(DocumentJob)
+        .where(*stale, DocumentJob.attempts < DOCUMENT_JOB_MAX_ATTEMPTS)
+        .values(status="queued", stage="requeued", locked_by=None, locked_at=None)
+    )
+    db.session.execute(
+        update(DocumentJob)
+        .where(*stale, DocumentJob.attempts >= DOCUMENT_JOB_MAX_ATTEMPTS)
+        .values(
+            status="failed",
+            error="Worker stopped responding",
+            payload=None,
+            finished_at=now,
+        )
+    )
+
+
+def claim(worker_id):
+    """Mark the oldest queued job as running for ``worker_id``; its id or None."""
+    now = datetime.utcnow()
+    _requeue_stale(now)
+    query = (
+        select(DocumentJob.id)
+        .where(DocumentJob.status == "queued")
+        .order_by(DocumentJob.created_at, DocumentJob.id)
+        .limit(1)
+    )
+    if db.session.get_bind().dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+    job_id = db.session.scalar(query)
+    if job_id is None:
+        db.session.commit()
+        return None
+    # Another worker may have taken it between the SELECT and here (SQLite)
+    claimed = db.session.execute(
+        update(DocumentJob)
+        .where(DocumentJob.id == job_id, DocumentJob.status == "queued")
+        .values(
+            status="running",
+            stage="claimed",
+            locked_by=worker_id,
+            locked_at=now,
+            started_at=now,
+            attempts=DocumentJob.attempts + 1,
+        )
+    ).rowcount
+    db.session.commit()
+    return job_id if claimed else None
+
+
+def _report(job_id, worker_id, stage, percent):
+    """Record progress and renew the lease, in its own short transaction."""
+    db.session.execute(
+        update(DocumentJob)
+        .where(DocumentJob.id == job_id, DocumentJob.locked_by == worker_id)
+        .values(stage=stage, progress=percent, locked_at=datetime.utcnow())
+    )
+    db.session.commit()
+
+
+def _finish(job_id, worker_id, **values):
+    db.session.execute(
+        update(DocumentJob)
+        .where(DocumentJob.id == job_id, DocumentJob.locked_by == worker_id)
+        .values(
+            **values,
+            payload=None,
+            locked_by=None,
+            locked_at=None,
+            finished_at=datetime.utcnow(),
+        )
+    )
+    db.session.commit()
+
+
+def run_job(job_id, worker_id):
+    """Process one claimed job and apply it to its review."""
+    start = time.perf_counter()
+    job = db.session.get(DocumentJob, job_id)
+    review_id, replace_text = job.review_id, job.replace_text
+    upload = FileStorage(stream=io.BytesIO(job.payload), filename=job.filename)
+    db.session.commit()
+
+    result = document_cache.process_upload(
+        upload,
+        review_id,
+        progress=lambda stage, percent: _report(job_id, worker_id, stage, percent),
+    )
+    if not result["success"]:
+        # Unreadable documents fail the same way every time: no retry
+        _finish(
+            job_id, worker_id, status="failed", stage="failed", error=result["error"]
+        )
+        return False
+
+    _report(job_id, worker_id, "applying", 90)
+    # Review and job change together, and only if this worker still holds the lease
+    review = db.session.get(Review, review_id, with_for_update=True)
+    job = db.session.get(
+        DocumentJob, job_id, with_for_update=True, populate_existing=True
+    )
+    if job is None or job.locked_by != worker_id:
+        db.session.rollback()
+        logger.warning(f"document_jobs job={job_id} lease lost; result discarded")
+        return False
+    if review is None:
+        db.session.rollback()
+        _finish(
+            job_id, worker_id, status="failed", stage="failed", error="Review not found"
+        )
+        return False
+    apply_document_result(review, result, replace_text)
+    job.status = "succeeded"
+    job.stage = "done"
+    job.progress = 100
+    job.payload = None
+    job.locked_by = None
+    job.locked_at = None
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    log = logger.warning if elapsed_ms > 10000 else logger.info
+    log(
+        f"document_jobs.run job={job_id} review_id={review_id} "
+        f"elapsed_ms={elapsed_ms:.2f}ms",
+        extra={
+            "job_id": job_id,
+            "review_id": review_id,
+            "file_type": result["file_type"],
+            "elapsed_ms": round(elapsed_ms, 2),
+        },
+    )
+    return True
+
+
+def _run_claimed(job_id, worker_id):
+    try:
+        run_job(job_id, worker_id)
+    except Exception as exc:
+        db.session.rollback()
+        logger.exception(f"document_jobs job={job_id} crashed")
+        attempts = db.session.scalar(
+            select(DocumentJob.attempts).where(DocumentJob.id == job_id)
+        )
+        if attempts is not None and attempts < DOCUMENT_JOB_MAX_ATTEMPTS:
+            db.session.execute(
+                update(DocumentJob)
+                .where(DocumentJob.id == job_id, DocumentJob.locked_by == worker_id)
+                .values(
+                    status="queued",
+                    stage="requeued",
+                    error=str(exc),
+                    locked_by=None,
+                    locked_at=None,
+                )
+            )
+            db.session.commit()
+        else:
+            _finish(job_id, worker_id, status="failed", stage="failed", error=str(exc))
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def drain(worker_id=None):
+    """Run queued jobs until none are left (inside an app context); returns how many."""
+    worker_id = worker_id or worker_name()
+    processed = 0
+    while (job_id := claim(worker_id)) is not None:
+        _run_claimed(job_id, worker_id)
+        processed += 1
+    return processed
+
+
+def work(app, worker_id=None, poll_seconds=None, stop=None):
+    """Poll for jobs until ``stop`` (a threading.Event) is set."""
+    worker_id = worker_id or worker_name()
+    poll_seconds = poll_seconds or DOCUMENT_JOB_POLL_SECONDS
+    stop = stop or threading.Event()
+    logger.info(f"document_jobs worker {worker_id} started")
+    while not stop.is_set():
+        with app.app_context():
+            try:
+                job_id = claim(worker_id)
+                if job_id is not None:
+                    _run_claimed(job_id, worker_id)
+                    continue
+            except Exception:
+                db.session.rollback()
+                logger.exception("document_jobs poll failed")
+            finally:
+                db.session.remove()
+        stop.wait(poll_seconds)
+
+
+def install(app):
+    """Start DOCUMENT_JOB_THREADS in-process workers (no-op unless DOCUMENT_JOBS)."""
+    if not DOCUMENT_JOBS_ENABLED:
+        return
+    for n in range(DOCUMENT_JOB_THREADS):
+        threading.Thread(
+            target=work, args=(app,), name=f"document-job-{n}", daemon=True
+        ).start()
+
+
+def _work_process():
+    from movie_reviews.config import app
+
+    work(app)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process queued document uploads.")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument(
+        "--drain", action="store_true", help="Process what is queued, then exit."
+    )
+    args = parser.parse_args()
+
+    from movie_reviews.config import app
+
+    if args.drain:
+        with app.app_context():
+            print(f"processed={drain()}")
+        return
+    if args.processes <= 1:
+        work(app)
+        return
+    workers = [
+        multiprocessing.Process(target=_work_process, name=f"document-job-{n}")
+        for n in range(args.processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == "__main__":
+    main()
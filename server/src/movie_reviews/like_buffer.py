@@ -0,0 +1,358 @@
+"""
+Optional write-behind buffer for like toggles (``LIKE_WRITE_BEHIND=1``).
+
+A shared review can turn /api/reviews/<id>/like into a write hotspot where every
+click is its own transaction on the same parent row. With the buffer on, a toggle
+reads the current state once (parent like_count plus "does this user's like
+exist"), records the user's desired state in memory and returns the optimistic
+``{liked, like_count}`` straight away.
+
+Pending toggles are keyed by (like model, user, target), so repeated clicks collapse
+to one final state and a click that undoes a pending one is dropped. A background
+thread flushes every ``LIKE_FLUSH_INTERVAL_MS`` or as soon as
+``LIKE_FLUSH_MAX_EVENTS`` keys are pending. Each flush is one transaction per like
+model: a multi-row ``INSERT ... ON CONFLICT DO NOTHING RETURNING``, a multi-row
+``DELETE ... RETURNING``, one batched counter UPDATE built from what those
+statements returned, and the matching notification fan-out. Replays and
+cross-worker races therefore cannot double-count. Toggles that arrive while a batch is being written treat that
+batch as the stored state; a toggle whose read overlapped the start or end of a
+flush reads again, so it never mistakes the pre-flush row for the stored state.
+A failed batch is retried entry by entry so one bad row (e.g. a parent deleted
+meanwhile) does not drop the rest.
+
+Pending likes live only in this process until flushed: other workers, and this
+worker's ``liked_by_me`` reads, see them after the next flush. Whatever caches or
+streams like counts registers on ``on_written`` (called inside each batch's
+transaction, e.g. to publish stream events that go out with its commit) and
+``on_committed`` (called after it commits, e.g. to invalidate cached pages), as
+``hook(like_model, inserted_ids, target_ids)``. ``flush()`` runs at
+interpreter exit (gunicorn's graceful worker shutdown) so a deploy does not lose
+the tail.
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import bindparam, exists, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+
+from movie_reviews.config import db
+from movie_reviews.logging import logger
+from movie_reviews.models import fanout
+from movie_reviews.models.aggregates import LIKE_COUNTERS, toggle_like
+
+LIKE_WRITE_BEHIND_ENABLED = os.getenv("LIKE_WRITE_BEHIND", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+LIKE_FLUSH_INTERVAL_MS = int(os.getenv("LIKE_FLUSH_INTERVAL_MS", "250"))
+LIKE_FLUSH_MAX_EVENTS = int(os.getenv("LIKE_FLUSH_MAX_EVENTS", "200"))
+
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class PendingLike:
+    """Desired state for one (user, target) versus what the database had."""
+
+    __slots__ = ("stored", "desired", "created_at")
+
+    def __init__(self, stored, desired):
+        self.stored = stored
+        self.desired = desired
+        self.created_at = datetime.utcnow()
+
+
+class LikeBuffer:
+    def __init__(
+        self,
+        interval_ms=LIKE_FLUSH_INTERVAL_MS,
+        max_events=LIKE_FLUSH_MAX_EVENTS,
+    ):
+        self.interval = interval_ms / 1000
+        self.max_events = max_events
+        self._pending = {}  # (like model, user_id, target_id) -> PendingLike
+        self._deltas = {like_model: Counter() for like_model in LIKE_COUNTERS}
+        # The batch being written: toggles arriving mid-flush treat it as stored
+        self._inflight = {}
+        self._inflight_deltas = {like_model: Counter() for like_model in LIKE_COUNTERS}
+        # Bumped when a batch is taken and when it is done: a toggle whose read
+        # spans a change has read state the batch may have overwritten
+        self._flush_seq = 0
+        self.on_written = []
+        self.on_committed = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._app = None
+        self._thread = None
+        self.counters = Counter()
+
+    # Request path ----------------------------------------------------------
+
+    def _read_state(self, like_model, user_id, target_id):
+        parent_table, fk_name = LIKE_COUNTERS[like_model]
+        liked = (
+            exists()
+            .where(
+                like_model.user_id == user_id,
+                getattr(like_model, fk_name) == target_id,
+            )
+            .correlate(None)
+        )
+        # Own short-lived connection: the request session's state is the caller's
+        with db.engine.connect() as conn:
+            return conn.execute(
+                select(parent_table.c.like_count, liked.label("liked")).where(
+                    parent_table.c.id == target_id
+                )
+            ).first()
+
+    def toggle(self, like_model, user_id, target_id):
+        """Buffer a toggle; ``(liked, optimistic like_count)`` or None if no target."""
+        key = (like_model, user_id, target_id)
+        with self._lock:
+            seq = self._flush_seq
+        while True:
+            row = self._read_state(like_model, user_id, target_id)
+            if row is None:
+                return None
+            self._lock.acquire()
+            if self._flush_seq == seq:
+                break  # still holding the lock
+            # A flush started or finished during the read: it may be stale
+            seq = self._flush_seq
+            self.counters["reread"] += 1
+            self._lock.release()
+
+        try:
+            pending = self._pending.pop(key, None)
+            deltas = self._deltas[like_model]
+            if pending is None:
+                inflight = self._inflight.get(key)
+                stored = inflight.desired if inflight else bool(row.liked)
+                desired = not stored
+                self._pending[key] = PendingLike(stored, desired)
+                deltas[target_id] += 1 if desired else -1
+            else:
+                # Undoes the pending toggle: back to what the database has
+                desired = pending.stored
+                deltas[target_id] -= 1 if pending.desired else -1
+            like_count = max(
+                0,
+                row.like_count
+                + self._inflight_deltas[like_model][target_id]
+                + deltas[target_id],
+            )
+            self.counters["buffered"] += 1
+            due = len(self._pending) >= self.max_events
+        finally:
+            self._lock.release()
+        if due:
+            self._wakeup.set()
+        return desired, like_count
+
+    # Flushing --------------------------------------------------------------
+
+    def _take(self):
+        with self._lock:
+            self._flush_seq += 1
+            self._inflight, self._pending = self._pending, {}
+            self._inflight_deltas, self._deltas = self._deltas, {
+                like_model: Counter() for like_model in LIKE_COUNTERS
+            }
+        return self._inflight
+
+    def _done(self):
+        with self._lock:
+            self._flush_seq += 1
+            self._inflight = {}
+            for counter in self._inflight_deltas.values():
+                counter.clear()
+
+    def flush(self):
+        """Write every pending toggle; returns the number of keys flushed."""
+        with self._flush_lock:
+            pending = self._take()
+            if not pending:
+                return 0
+            start = time.perf_counter()
+            by_model = {}
+            for (like_model, user_id, target_id), entry in pending.items():
+                by_model.setdefault(like_model, []).append((user_id, target_id, entry))
+            for like_model, entries in by_model.items():
+                try:
+                    written = self._write_batch(like_model, entries)
+                    db.session.commit()
+                    self._committed(like_model, *written)
+                except Exception:
+                    db.session.rollback()
+                    logger.exception(
+                        f"Like batch for {like_model.__tablename__} failed; "
+                        "retrying entries one by one"
+                    )
+                    self._write_one_by_one(like_model, entries)
+            self._done()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.counters["flushes"] += 1
+            self.counters["flushed"] += len(pending)
+            log = logger.warning if elapsed_ms > 500 else logger.info
+            log(
+                f"like_buffer.flush keys={len(pending)} elapsed_ms={elapsed_ms:.2f}ms",
+                extra={"keys": len(pending), "elapsed_ms": round(elapsed_ms, 2)},
+            )
+            return len(pending)
+
+    def _write_batch(self, like_model, entries):
+        parent_table, fk_name = LIKE_COUNTERS[like_model]
+        likes = like_model.__table__
+        fk = likes.c[fk_name]
+        deltas = Counter()
+
+        to_insert = [
+            {"user_id": user_id, fk_name: target_id, "created_at": entry.created_at}
+            for user_id, target_id, entry in entries
+            if entry.desired
+        ]
+        if to_insert:
+            # Parents deleted since the toggle would fail the whole INSERT
+            live = set(
+                db.session.scalars(
+                    select(parent_table.c.id).where(
+                        parent_table.c.id.in_({row[fk_name] for row in to_insert})
+                    )
+                )
+            )
+            to_insert = [row for row in to_insert if row[fk_name] in live]
+        inserted = []
+        if to_insert:
+            insert = _DIALECT_INSERTS[db.session.get_bind().dialect.name]
+            inserted = db.session.execute(
+                insert(likes)
+                .values(to_insert)
+                .on_conflict_do_nothing(index_elements=["user_id", fk_name])
+                .returning(likes.c.id, fk)
+            ).all()
+            deltas.update(target_id for _like_id, target_id in inserted)
+
+        to_delete = [
+            (user_id, target_id)
+            for user_id, target_id, entry in entries
+            if not entry.desired
+        ]
+        deleted = []
+        if to_delete:
+            deleted = db.session.execute(
+                likes.delete()
+                .where(tuple_(likes.c.user_id, fk).in_(to_delete))
+                .returning(likes.c.id, fk)
+            ).all()
+            deltas.subtract(target_id for _like_id, target_id in deleted)
+
+        params = [
+            {"target_id": target_id, "delta": delta}
+            for target_id, delta in deltas.items()
+            if delta
+        ]
+        if params:
+            db.session.execute(
+                parent_table.update()
+                .where(parent_table.c.id == bindparam("target_id"))
+                .values(like_count=parent_table.c.like_count + bindparam("delta")),
+                params,
+            )
+        inserted_ids = [like_id for like_id, _target_id in inserted]
+        fanout.sync_likes(
+            db.session,
+            like_model,
+            inserted_ids=inserted_ids,
+            deleted_ids=[like_id for like_id, _target_id in deleted],
+        )
+        target_ids = {target_id for _like_id, target_id in (*inserted, *deleted)}
+        for hook in self.on_written:
+            hook(like_model, inserted_ids, target_ids)
+        return inserted_ids, target_ids
+
+    def _committed(self, like_model, inserted_ids, target_ids):
+        for hook in self.on_committed:
+            try:
+                hook(like_model, inserted_ids, target_ids)
+            except Exception:
+                logger.exception("like_buffer on_committed hook failed")
+
+    def _write_one_by_one(self, like_model, entries):
+        for user_id, target_id, entry in entries:
+            try:
+                written = self._write_batch(like_model, [(user_id, target_id, entry)])
+                db.session.commit()
+                self._committed(like_model, *written)
+            except Exception:
+                db.session.rollback()
+                self.counters["dropped"] += 1
+                logger.exception(
+                    f"Dropping buffered like user={user_id} "
+                    f"{like_model.__tablename__}={target_id}"
+                )
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            with self._app.app_context():
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Like buffer flush failed")
+                finally:
+                    db.session.remove()
+
+    def _flush_at_exit(self):
+        with self._app.app_context():
+            try:
+                flushed = self.flush()
+                if flushed:
+                    logger.info(f"like_buffer flushed {flushed} keys at shutdown")
+            finally:
+                db.session.remove()
+
+    def start(self, app):
+        self._app = app
+        self._thread = threading.Thread(
+            target=self._run, name="like-buffer-flush", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self._flush_at_exit)
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            **self.counters,
+            "pending": pending,
+            "interval_ms": int(self.interval * 1000),
+            "max_events": self.max_events,
+        }
+
+
+like_buffer = LikeBuffer()
+
+
+def toggle(like_model, user_id, target_id):
+    """Toggle through the buffer when enabled, else atomically in this request.
+
+    Returns ``(liked, like_count)`` or None when the target does not exist; the
+    caller owns the transaction for the direct path.
+    """
+    if LIKE_WRITE_BEHIND_ENABLED:
+        return like_buffer.toggle(like_model, user_id, target_id)
+    return toggle_like(db.session, like_model, user_id, target_id)
+
+
+def install(app):
+    """Start the flush thread (no-op unless LIKE_WRITE_BEHIND is set)."""
+    if LIKE_WRITE_BEHIND_ENABLED:
+        like_buffer.start(app)
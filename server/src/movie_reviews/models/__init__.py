@@ -1,7 +1,11 @@
+from . import aggregates, fanout
 from .comment_likes import CommentLike
 from .directors import Director
+from .document_extractions import DocumentExtraction
+from .document_jobs import DocumentJob
 from .movies import Movie
 from .notification_reads import NotificationRead
+from .notifications import Notification
 from .password_reset_tokens import PasswordResetToken
 from .review_comments import ReviewComment
 from .review_likes import ReviewLike
@@ -17,8 +21,13 @@ __all__ = [
     "CommentLike",
     "ReviewLike",
     "NotificationRead",
+    "Notification",
     "Tag",
     "review_tags",
     "Director",
+    "DocumentExtraction",
+    "DocumentJob",
     "PasswordResetToken",
+    "aggregates",
+    "fanout",
 ]
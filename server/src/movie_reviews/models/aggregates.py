@@ -0,0 +1,306 @@
+"""
+Denormalized aggregates kept on the parent rows.
+
+* ``reviews.like_count`` / ``review_comments.like_count``: number of likes.
+* ``movies.rating``: the canonical review rating (highest rating among the movie's
+  reviews), and ``movies.review_count`` so "has a review" needs no join either.
+
+* ``users.unread_notification_count``: kept by models.fanout; only checked here.
+
+ORM writes keep these current inside the same transaction: an ``after_flush`` hook
+turns new/deleted likes into +/-1 counter updates and recomputes the movie columns
+for any movie whose reviews were added, removed, moved or re-rated. Statements that
+bypass the ORM (Core inserts/deletes, bulk updates) must adjust the counters
+themselves, as ``toggle_like`` does. ``reconcile`` recomputes everything from the
+source tables and repairs drift; run it with
+``python -m movie_reviews.seeding.reconcile_aggregates``.
+"""
+
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import bindparam, event, func, inspect, select, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+
+from movie_reviews.config import db
+
+from . import fanout
+from .comment_likes import CommentLike
+from .movies import Movie
+from .notifications import Notification
+from .review_comments import ReviewComment
+from .review_likes import ReviewLike
+from .reviews import Review
+from .users import User
+
+# Review columns whose change can move a movie's rating or review_count
+_MOVIE_AGGREGATE_INPUTS = ("movie_id", "rating", "content_type")
+
+# like model -> (parent table, FK attribute on the like)
+LIKE_COUNTERS = {
+    ReviewLike: (Review.__table__, "review_id"),
+    CommentLike: (ReviewComment.__table__, "comment_id"),
+}
+
+
+def movie_rating_subquery():
+    """Canonical review rating for the outer Movie row (uses ix_reviews_movie_id)."""
+    return (
+        select(func.max(Review.rating))
+        .where(Review.movie_id == Movie.id, Review.content_type == "review")
+        .correlate(Movie)
+        .scalar_subquery()
+    )
+
+
+def movie_review_count_subquery():
+    return (
+        select(func.count(Review.id))
+        .where(Review.movie_id == Movie.id, Review.content_type == "review")
+        .correlate(Movie)
+        .scalar_subquery()
+    )
+
+
+def _like_count_subquery(like_model, parent_table, fk_name):
+    return (
+        select(func.count(like_model.id))
+        .where(getattr(like_model, fk_name) == parent_table.c.id)
+        .correlate(parent_table)
+        .scalar_subquery()
+    )
+
+
+# One round trip on Postgres: delete the like if present, otherwise insert it
+# (ON CONFLICT covers a concurrent double-click), and move the parent's counter by
+# the net change. The UPDATE row-locks the parent, so concurrent toggles serialize
+# on the counter; like_count comes back NULL when the parent does not exist.
+_PG_TOGGLE_SQL = """
+WITH deleted AS (
+    DELETE FROM {likes} WHERE user_id = :user_id AND {fk} = :target_id
+    RETURNING id
+), inserted AS (
+    INSERT INTO {likes} (user_id, {fk}, created_at)
+    SELECT :user_id, :target_id, :created_at
+    WHERE NOT EXISTS (SELECT 1 FROM deleted)
+      AND EXISTS (SELECT 1 FROM {parent} WHERE id = :target_id)
+    ON CONFLICT (user_id, {fk}) DO NOTHING
+    RETURNING id
+), counter AS (
+    UPDATE {parent}
+    SET like_count = like_count
+        + (SELECT count(*) FROM inserted) - (SELECT count(*) FROM deleted)
+    WHERE id = :target_id
+    RETURNING like_count
+)
+SELECT (SELECT id FROM deleted) AS deleted_id,
+       (SELECT id FROM inserted) AS inserted_id,
+       (SELECT like_count FROM counter) AS like_count
+"""
+
+
+def _toggle_like_postgresql(session, like_model, user_id, target_id):
+    parent_table, fk_name = LIKE_COUNTERS[like_model]
+    sql = _PG_TOGGLE_SQL.format(
+        likes=like_model.__tablename__, fk=fk_name, parent=parent_table.name
+    )
+    row = session.execute(
+        text(sql),
+        {"user_id": user_id, "target_id": target_id, "created_at": datetime.utcnow()},
+    ).one()
+    return row.deleted_id, row.inserted_id, row.like_count
+
+
+def _toggle_like_sqlite(session, like_model, user_id, target_id):
+    """Same statements run one at a time (SQLite has no writable CTEs).
+
+    Returns ``(deleted like id, inserted like id, like_count)`` like the CTE.
+    """
+    parent_table, fk_name = LIKE_COUNTERS[like_model]
+    fk = getattr(like_model, fk_name)
+    deleted = session.execute(
+        like_model.__table__.delete()
+        .where(like_model.user_id == user_id, fk == target_id)
+        .returning(like_model.id)
+    ).scalar()
+    inserted = None
+    if deleted is None:
+        inserted = session.execute(
+            sqlite.insert(like_model.__table__)
+            .values(
+                {
+                    "user_id": user_id,
+                    fk_name: target_id,
+                    "created_at": datetime.utcnow(),
+                }
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", fk_name])
+            .returning(like_model.id)
+        ).scalar()
+    delta = -1 if deleted is not None else 1 if inserted is not None else 0
+    like_count = session.execute(
+        parent_table.update()
+        .where(parent_table.c.id == target_id)
+        .values(like_count=parent_table.c.like_count + delta)
+        .returning(parent_table.c.like_count)
+    ).scalar()
+    return deleted, inserted, like_count
+
+
+def toggle_like(session, like_model, user_id, target_id):
+    """Like or unlike ``target_id`` for ``user_id`` and move its like_count.
+
+    Returns ``(liked, like_count)``, or None when the target does not exist. Runs
+    inside the caller's transaction; the caller commits (or rolls back on None).
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        toggle = _toggle_like_postgresql
+    else:
+        toggle = _toggle_like_sqlite
+    deleted_id, inserted_id, like_count = toggle(
+        session, like_model, user_id, target_id
+    )
+    if like_count is None:
+        return None
+    fanout.sync_likes(
+        session,
+        like_model,
+        inserted_ids=[inserted_id] if inserted_id else (),
+        deleted_ids=[deleted_id] if deleted_id else (),
+    )
+    return deleted_id is None, like_count
+
+
+def refresh_movie_aggregates(session, movie_ids):
+    """Recompute rating and review_count for the given movies."""
+    movie_ids = sorted({movie_id for movie_id in movie_ids if movie_id is not None})
+    if not movie_ids:
+        return
+    session.execute(
+        Movie.__table__.update()
+        .where(Movie.__table__.c.id.in_(movie_ids))
+        .values(
+            rating=movie_rating_subquery(),
+            review_count=movie_review_count_subquery(),
+        )
+    )
+
+
+def _touched_movie_ids(session):
+    movie_ids = set()
+    for obj in session.new:
+        if isinstance(obj, Review):
+            movie_ids.add(obj.movie_id)
+    for obj in session.deleted:
+        if isinstance(obj, Review):
+            movie_ids.add(obj.movie_id)
+    for obj in session.dirty:
+        if not isinstance(obj, Review):
+            continue
+        state = inspect(obj)
+        changed = False
+        for name in _MOVIE_AGGREGATE_INPUTS:
+            history = state.attrs[name].history
+            if history.has_changes():
+                changed = True
+                if name == "movie_id":
+                    movie_ids.update(history.deleted)
+        if changed:
+            movie_ids.add(obj.movie_id)
+    return movie_ids
+
+
+def _like_deltas(session):
+    deltas = {like_model: Counter() for like_model in LIKE_COUNTERS}
+    for objects, sign in ((session.new, 1), (session.deleted, -1)):
+        for obj in objects:
+            counter = deltas.get(type(obj))
+            if counter is not None:
+                _parent_table, fk_name = LIKE_COUNTERS[type(obj)]
+                counter[getattr(obj, fk_name)] += sign
+    return deltas
+
+
+def _apply_aggregates(session, flush_context):
+    for like_model, counter in _like_deltas(session).items():
+        params = [
+            {"target_id": target_id, "delta": delta}
+            for target_id, delta in counter.items()
+            if target_id is not None and delta
+        ]
+        if not params:
+            continue
+        parent_table, _fk_name = LIKE_COUNTERS[like_model]
+        session.execute(
+            parent_table.update()
+            .where(parent_table.c.id == bindparam("target_id"))
+            .values(like_count=parent_table.c.like_count + bindparam("delta")),
+            params,
+        )
+    refresh_movie_aggregates(session, _touched_movie_ids(session))
+
+
+event.listen(Session, "after_flush", _apply_aggregates)
+
+
+def reconcile(apply=False):
+    """Compare stored aggregates with the source tables; fix them when ``apply``.
+
+    Returns ``{aggregate name: [(row id, stored, actual), ...]}`` for drifted rows.
+    Call inside an app context; commits when ``apply`` is set.
+    """
+    drift = {}
+    for like_model, (parent_table, fk_name) in LIKE_COUNTERS.items():
+        actual = _like_count_subquery(like_model, parent_table, fk_name)
+        rows = db.session.execute(
+            select(parent_table.c.id, parent_table.c.like_count, actual).where(
+                parent_table.c.like_count != actual
+            )
+        ).all()
+        drift[f"{parent_table.name}.like_count"] = [tuple(row) for row in rows]
+        if apply and rows:
+            db.session.execute(
+                parent_table.update()
+                .where(parent_table.c.id.in_([row[0] for row in rows]))
+                .values(like_count=actual)
+            )
+
+    rating, review_count = movie_rating_subquery(), movie_review_count_subquery()
+    rating_rows = db.session.execute(
+        select(Movie.id, Movie.rating, rating).where(
+            Movie.rating.is_distinct_from(rating)
+        )
+    ).all()
+    count_rows = db.session.execute(
+        select(Movie.id, Movie.review_count, review_count).where(
+            Movie.review_count != review_count
+        )
+    ).all()
+    unread = (
+        select(func.count(Notification.id))
+        .where(Notification.user_id == User.id, Notification.read_at.is_(None))
+        .correlate(User)
+        .scalar_subquery()
+    )
+    unread_rows = db.session.execute(
+        select(User.id, User.unread_notification_count, unread).where(
+            User.unread_notification_count != unread
+        )
+    ).all()
+    drift["users.unread_notification_count"] = [tuple(row) for row in unread_rows]
+    if apply and unread_rows:
+        db.session.execute(
+            User.__table__.update()
+            .where(User.__table__.c.id.in_([row[0] for row in unread_rows]))
+            .values(unread_notification_count=unread)
+        )
+
+    drift["movies.rating"] = [tuple(row) for row in rating_rows]
+    drift["movies.review_count"] = [tuple(row) for row in count_rows]
+    if apply:
+        refresh_movie_aggregates(
+            db.session, [row[0] for row in (*rating_rows, *count_rows)]
+        )
+        db.session.commit()
+    return drift
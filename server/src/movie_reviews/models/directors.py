@@ -5,6 +5,8 @@ from sqlalchemy_serializer import SerializerMixin
 from movie_reviews.config import db
 from movie_reviews.utils import validate_required_string, validate_required_url
 
+from .search_vector import search_vector_column
+
 
 class Director(db.Model, SerializerMixin):
     __tablename__ = "directors"
@@ -16,6 +18,11 @@ class Director(db.Model, SerializerMixin):
     backdrop = Column(String(500), nullable=True)  # URL to backdrop photo
     biography = Column(Text, nullable=True)
     description = Column(Text, nullable=True)  # long-form editorial
+    search_vector = search_vector_column()  # name/biography/description
+
+    __table_args__ = (
+        db.Index("ix_directors_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     # Relationships
     movies = db.relationship(
@@ -30,6 +37,7 @@ class Director(db.Model, SerializerMixin):
         "-movies.reviews",
         "-reviews.director",
         "-reviews.movie",
+        "-search_vector",
     )
 
     def __repr__(self):
@@ -0,0 +1,44 @@
+"""
+Extraction results keyed by the uploaded file's SHA-256 (see movie_reviews.document_cache).
+
+One row per distinct document body: the S3 object it was stored as, the enriched
+HTML and the Word-only main cast / line notes, and the backdrop image taken from a
+.docx. ``extractor_version`` is compared with document_cache.EXTRACTION_VERSION so
+a change to the extraction pipeline does not serve stale HTML.
+
+The S3 objects named here are shared: every review that uploads the same bytes
+points its document_path (and backdrop) at them. They must never be deleted on
+behalf of one review; check document_cache.is_shared_object before deleting.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Text
+
+from movie_reviews.config import db
+
+
+class DocumentExtraction(db.Model):
+    __tablename__ = "document_extractions"
+
+    content_sha256 = Column(String(64), primary_key=True)
+    file_type = Column(String(10), nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)
+    object_key = Column(String(500), nullable=False)
+    extracted_html = Column(Text, nullable=False)
+    main_cast = Column(Text, nullable=True)
+    line_notes = Column(Text, nullable=True)
+    backdrop_object_key = Column(String(500), nullable=True)
+    extractor_version = Column(Integer, nullable=False)
+    hit_count = Column(Integer, default=0, server_default="0", nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Per-review deletes check whether the object still backs a cache entry
+        db.Index("ix_document_extractions_object_key", "object_key"),
+        db.Index("ix_document_extractions_backdrop", "backdrop_object_key"),
+    )
+
+    def __repr__(self):
+        return f"<DocumentExtraction {self.content_sha256[:12]} {self.object_key}>"
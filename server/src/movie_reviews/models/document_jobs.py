@@ -0,0 +1,61 @@
+"""
+Queued document uploads (``DOCUMENT_JOBS=1``), worked off by movie_reviews.document_jobs.
+
+The upload itself is kept in ``payload`` until a worker has stored it in S3 and
+applied the extraction to the review; finished jobs drop it so the table only
+keeps the status history. ``locked_by`` / ``locked_at`` are the worker's lease:
+a running job whose lease is older than DOCUMENT_JOB_LEASE_SECONDS is assumed
+abandoned and goes back to the queue.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+)
+from sqlalchemy_serializer import SerializerMixin
+
+from movie_reviews.config import db
+
+
+class DocumentJob(db.Model, SerializerMixin):
+    __tablename__ = "document_jobs"
+
+    serialize_rules = ("-payload", "-locked_by", "-locked_at")
+
+    id = Column(Integer, primary_key=True)
+    review_id = Column(
+        Integer, ForeignKey("reviews.id", ondelete="CASCADE"), nullable=False
+    )
+    status = Column(
+        String(20), default="queued", nullable=False
+    )  # 'queued' | 'running' | 'succeeded' | 'failed'
+    stage = Column(String(40), nullable=True)  # last progress step reported
+    progress = Column(Integer, default=0, nullable=False)  # 0-100
+    filename = Column(String(255), nullable=False)
+    file_type = Column(String(10), nullable=False)
+    replace_text = Column(Boolean, default=False, nullable=False)
+    payload = Column(LargeBinary, nullable=True)  # the upload; cleared when done
+    attempts = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)
+    locked_by = Column(String(100), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Workers claim the oldest queued job
+        db.Index("ix_document_jobs_status_created", "status", "created_at"),
+        db.Index("ix_document_jobs_review_id", "review_id"),
+    )
+
+    def __repr__(self):
+        return f"<DocumentJob {self.id} review_id={self.review_id} {self.status}>"
@@ -0,0 +1,249 @@
+"""
+Fan-out on write for notifications (see models.notifications).
+
+``publish`` turns source rows (replies, comment likes) into notification rows with
+one ``INSERT ... SELECT`` that also resolves the recipient, skips self-notifications
+and ignores events already published. ``retract`` deletes them again when the
+source row goes away. Both move ``users.unread_notification_count`` by what they
+actually inserted or deleted, so the bell's unread count is a column read, and
+queue a stream event for the recipient (sent on commit, see movie_reviews.stream).
+
+ORM writes are covered by an ``after_flush`` hook. Core statements that create or
+delete likes (``aggregates.toggle_like``, the like write-behind buffer) call
+``sync_likes`` themselves.
+"""
+
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import bindparam, event, literal, select, tuple_, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from movie_reviews import stream
+
+from .comment_likes import CommentLike
+from .notification_reads import NotificationRead
+from .notifications import Notification
+from .review_comments import ReviewComment
+from .users import User
+
+EVENT_TYPES = ("reply", "comment_like")
+
+# like model -> notification event type, for likes that notify someone
+LIKE_EVENT_TYPES = {CommentLike: "comment_like"}
+
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+_NOTIFICATION_COLUMNS = (
+    "user_id",
+    "event_type",
+    "event_id",
+    "actor_id",
+    "review_id",
+    "created_at",
+)
+
+
+def reply_events(recipient_id=None):
+    """(recipient, type, event id, actor, review, at) for replies to my comments."""
+    reply = ReviewComment.__table__
+    parent = reply.alias("parent")
+    query = (
+        select(
+            parent.c.user_id.label("user_id"),
+            literal("reply").label("event_type"),
+            reply.c.id.label("event_id"),
+            reply.c.user_id.label("actor_id"),
+            reply.c.review_id.label("review_id"),
+            reply.c.created_at.label("created_at"),
+        )
+        .join(parent, reply.c.parent_comment_id == parent.c.id)
+        .where(parent.c.user_id != reply.c.user_id)
+    )
+    if recipient_id is not None:
+        query = query.where(parent.c.user_id == recipient_id)
+    return query
+
+
+def comment_like_events(recipient_id=None):
+    """(recipient, type, event id, actor, review, at) for likes on my comments."""
+    like = CommentLike.__table__
+    comment = ReviewComment.__table__
+    query = (
+        select(
+            comment.c.user_id.label("user_id"),
+            literal("comment_like").label("event_type"),
+            like.c.id.label("event_id"),
+            like.c.user_id.label("actor_id"),
+            comment.c.review_id.label("review_id"),
+            like.c.created_at.label("created_at"),
+        )
+        .join(comment, like.c.comment_id == comment.c.id)
+        .where(comment.c.user_id != like.c.user_id)
+    )
+    if recipient_id is not None:
+        query = query.where(comment.c.user_id == recipient_id)
+    return query
+
+
+def derived_events(recipient_id):
+    """Every event for one recipient straight from the source tables (UNION ALL).
+
+    Same rows the notifications table holds, computed on read; the recipient filter
+    sits inside each branch so both use their user_id indexes.
+    """
+    return union_all(reply_events(recipient_id), comment_like_events(recipient_id))
+
+
+# event type -> (source select, source row id column)
+_EVENT_SOURCES = {
+    "reply": (reply_events, ReviewComment.__table__.c.id),
+    "comment_like": (comment_like_events, CommentLike.__table__.c.id),
+}
+
+
+def _move_unread(session, deltas):
+    params = [
+        {"recipient_id": user_id, "delta": delta}
+        for user_id, delta in deltas.items()
+        if delta
+    ]
+    if not params:
+        return
+    users = User.__table__
+    session.execute(
+        users.update()
+        .where(users.c.id == bindparam("recipient_id"))
+        .values(
+            unread_notification_count=users.c.unread_notification_count
+            + bindparam("delta")
+        ),
+        params,
+    )
+
+
+def publish(session, event_type, event_ids):
+    """Write notifications for the given source rows; returns how many were new."""
+    event_ids = sorted(set(event_ids))
+    if not event_ids:
+        return 0
+    events, source_id = _EVENT_SOURCES[event_type]
+    source = events().where(source_id.in_(event_ids))
+    insert = _DIALECT_INSERTS[session.get_bind().dialect.name]
+    table = Notification.__table__
+    published = session.execute(
+        insert(table)
+        .from_select(_NOTIFICATION_COLUMNS, source)
+        .on_conflict_do_nothing(index_elements=["event_type", "event_id"])
+        .returning(*(table.c[name] for name in _NOTIFICATION_COLUMNS))
+    ).all()
+    deltas = Counter(row.user_id for row in published)
+    _move_unread(session, deltas)
+    for row in published:
+        stream.publish(
+            session,
+            stream.user_channel(row.user_id),
+            "notification",
+            {
+                "event_type": row.event_type,
+                "event_id": row.event_id,
+                "event_at": row.created_at.isoformat(),
+                "review_id": row.review_id,
+                "actor_id": row.actor_id,
+                "read": False,
+            },
+        )
+    return len(published)
+
+
+def retract(session, event_type, event_ids):
+    """Delete notifications for source rows that are gone; returns how many."""
+    event_ids = sorted(set(event_ids))
+    if not event_ids:
+        return 0
+    table = Notification.__table__
+    rows = session.execute(
+        table.delete()
+        .where(table.c.event_type == event_type, table.c.event_id.in_(event_ids))
+        .returning(table.c.user_id, table.c.event_id, table.c.read_at)
+    ).all()
+    deltas = Counter()
+    deltas.subtract(row.user_id for row in rows if row.read_at is None)
+    _move_unread(session, deltas)
+    for row in rows:
+        stream.publish(
+            session,
+            stream.user_channel(row.user_id),
+            "notification_removed",
+            {"event_type": event_type, "event_id": row.event_id},
+        )
+    return len(rows)
+
+
+def sync_likes(session, like_model, inserted_ids=(), deleted_ids=()):
+    """Publish/retract for likes written with Core statements."""
+    event_type = LIKE_EVENT_TYPES.get(like_model)
+    if event_type is None:
+        return
+    retract(session, event_type, deleted_ids)
+    publish(session, event_type, inserted_ids)
+
+
+def mark_read(session, user_id, events):
+    """Mark ``[(event_type, event_id), ...]`` read for ``user_id``; returns count."""
+    events = sorted({(event_type, int(event_id)) for event_type, event_id in events})
+    if not events:
+        return 0
+    table = Notification.__table__
+    marked = session.execute(
+        table.update()
+        .where(
+            table.c.user_id == user_id,
+            table.c.read_at.is_(None),
+            tuple_(table.c.event_type, table.c.event_id).in_(events),
+        )
+        .values(read_at=datetime.utcnow())
+        .returning(table.c.id)
+    ).all()
+    _move_unread(session, {user_id: -len(marked)})
+    return len(marked)
+
+
+def record_reads(session, user_id, events):
+    """Mirror read state into notification_reads (read by the derived engine)."""
+    rows = [
+        {"user_id": user_id, "event_type": event_type, "event_id": int(event_id)}
+        for event_type, event_id in sorted(set(events))
+    ]
+    if not rows:
+        return 0
+    insert = _DIALECT_INSERTS[session.get_bind().dialect.name]
+    table = NotificationRead.__table__
+    inserted = session.execute(
+        insert(table)
+        .values([{**row, "read_at": datetime.utcnow()} for row in rows])
+        .on_conflict_do_nothing(index_elements=["user_id", "event_type", "event_id"])
+        .returning(table.c.id)
+    ).all()
+    return len(inserted)
+
+
+def _orm_events(objects):
+    found = {event_type: [] for event_type in EVENT_TYPES}
+    for obj in objects:
+        if isinstance(obj, CommentLike):
+            found["comment_like"].append(obj.id)
+        elif isinstance(obj, ReviewComment) and obj.parent_comment_id is not None:
+            found["reply"].append(obj.id)
+    return found
+
+
+def _fan_out(session, flush_context):
+    for event_type, event_ids in _orm_events(session.deleted).items():
+        retract(session, event_type, event_ids)
+    for event_type, event_ids in _orm_events(session.new).items():
+        publish(session, event_type, event_ids)
+
+
+event.listen(Session, "after_flush", _fan_out)
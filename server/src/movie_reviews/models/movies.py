@@ -5,6 +5,8 @@ from sqlalchemy_serializer import SerializerMixin
 from movie_reviews.config import db
 from movie_reviews.utils import validate_required_string, validate_required_url
 
+from .search_vector import search_vector_column
+
 
 class Movie(db.Model, SerializerMixin):
     __tablename__ = "movies"
@@ -20,10 +22,18 @@ class Movie(db.Model, SerializerMixin):
     cover_photo = Column(String(500), nullable=False)  # URL to cover image
     backdrop = Column(String(500), nullable=True)  # URL to backdrop photo
     director_id = db.Column(db.Integer, db.ForeignKey("directors.id"), nullable=True)
+    search_vector = search_vector_column()  # title/original_title/overview
+    # Maintained by models.aggregates from this movie's reviews; do not write directly
+    rating = Column(Integer, nullable=True)
+    review_count = Column(Integer, default=0, server_default="0", nullable=False)
 
     __table_args__ = (
         db.Index("ix_movies_director_id", "director_id"),
-        db.Index("ix_movies_release_date", "release_date"),
+        # Keyset pagination for /api/movies listing mode (sort key + id tiebreaker);
+        # also serves plain release_date lookups, so there is no single-column index
+        db.Index("ix_movies_release_date_id", "release_date", "id"),
+        db.Index("ix_movies_title_id", "title", "id"),
+        db.Index("ix_movies_search_vector", "search_vector", postgresql_using="gin"),
     )
 
     reviews = db.relationship("Review", back_populates="movie", cascade="all")
@@ -34,6 +44,7 @@ class Movie(db.Model, SerializerMixin):
         "-reviews.director",
         "-director.movies",
         "-director.reviews",
+        "-search_vector",
     )
 
     def __repr__(self):
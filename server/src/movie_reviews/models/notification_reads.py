@@ -1,7 +1,7 @@
 """
-Tracks which notification events a user has read. Events are derived from
-existing data (replies to my comments, likes on my comments/reviews); this
-table stores only read state. event_type is one of 'reply', 'comment_like',
+Read state for the old derived notifications. Superseded by notifications.read_at
+(see models.notifications); the notifications migration copies it across and
+nothing writes here any more. event_type is one of 'reply', 'comment_like',
 'review_like'. event_id is the primary key of the source row (review_comments.id,
 comment_likes.id, or review_likes.id respectively).
 """
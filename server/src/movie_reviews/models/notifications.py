@@ -0,0 +1,48 @@
+"""
+One row per notification, written when the event happens (fan-out on write) by
+models.fanout: a reply to my comment ('reply', event_id = review_comments.id) or
+a like on my comment ('comment_like', event_id = comment_likes.id). Rows go away
+when the source row does. read_at is NULL until the recipient marks it read;
+users.unread_notification_count mirrors the unread rows.
+
+review_id is a plain column rather than a foreign key so a review delete does
+not have to order itself around its notifications.
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy_serializer import SerializerMixin
+
+from movie_reviews.config import db
+
+
+class Notification(db.Model, SerializerMixin):
+    __tablename__ = "notifications"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )  # recipient
+    event_type = Column(String(20), nullable=False)  # 'reply' | 'comment_like'
+    event_id = Column(Integer, nullable=False)
+    actor_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    review_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=False)  # when the event happened
+    read_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("event_type", "event_id", name="uq_notification_event"),
+        # Newest-first listing per recipient: one index range scan
+        db.Index(
+            "ix_notifications_user_created",
+            user_id,
+            created_at.desc(),
+            id.desc(),
+        ),
+    )
+
+    def __repr__(self):
+        return (
+            f"<Notification user_id={self.user_id} {self.event_type}={self.event_id}>"
+        )
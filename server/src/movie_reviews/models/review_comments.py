@@ -12,6 +12,10 @@ class ReviewComment(db.Model, SerializerMixin):
         db.Index("ix_review_comments_review_id", "review_id"),
         db.Index("ix_review_comments_review_parent", "review_id", "parent_comment_id"),
         db.Index("ix_review_comments_review_created", "review_id", "created_at"),
+        # Notification sources: my comments, and replies to them
+        db.Index("ix_review_comments_user_id", "user_id"),
+        db.Index("ix_review_comments_parent_comment_id", "parent_comment_id"),
+        db.Index("ix_review_comments_created_at", "created_at"),  # activity feed
     )
 
     id = Column(Integer, primary_key=True)
@@ -23,6 +27,8 @@ class ReviewComment(db.Model, SerializerMixin):
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
+    # Maintained by models.aggregates; do not write directly
+    like_count = Column(Integer, default=0, server_default="0", nullable=False)
 
     review = db.relationship("Review", back_populates="comments")
     user = db.relationship("User", back_populates="review_comments")
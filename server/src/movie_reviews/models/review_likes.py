@@ -18,6 +18,7 @@ class ReviewLike(db.Model, SerializerMixin):
         UniqueConstraint("user_id", "review_id", name="uq_review_like_user_review"),
         db.Index("ix_review_likes_review_id", "review_id"),
         db.Index("ix_review_likes_user_review", "user_id", "review_id"),
+        db.Index("ix_review_likes_created_at", "created_at"),  # activity feed
     )
 
     user = db.relationship("User", back_populates="review_likes")
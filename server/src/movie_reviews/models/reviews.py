@@ -11,6 +11,7 @@ from movie_reviews.utils import (
     validate_optional_int_in_range,
 )
 
+from .search_vector import search_vector_column
 from .tags import review_tags
 
 
@@ -37,11 +38,15 @@ class Review(db.Model, SerializerMixin):
     document_filename = Column(String(255), nullable=True)
     document_path = Column(String(500), nullable=True)
     document_type = Column(String(10), nullable=True)  # 'pdf', 'docx', etc.
+    search_vector = search_vector_column()  # title/description/text + tag names
+    # Maintained by models.aggregates; do not write directly
+    like_count = Column(Integer, default=0, server_default="0", nullable=False)
 
     __table_args__ = (
         db.Index("ix_reviews_movie_id", "movie_id"),
         db.Index("ix_reviews_director_id", "director_id"),
         db.Index("ix_reviews_content_type_date", "content_type", "date_added"),
+        db.Index("ix_reviews_search_vector", "search_vector", postgresql_using="gin"),
     )
 
     movie = db.relationship("Movie", back_populates="reviews")
@@ -66,6 +71,7 @@ class Review(db.Model, SerializerMixin):
         "-director.reviews",
         "-director.movies",
         "-likes.review",
+        "-search_vector",
     )
 
     def __repr__(self):
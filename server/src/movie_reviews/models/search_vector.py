@@ -0,0 +1,20 @@
+from sqlalchemy import Column, FetchedValue, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
+
+# Weighted tsvector maintained by Postgres triggers (see migration 7c4d2e9b1f30).
+# The ORM never writes it and only loads it on demand; SQLite dev databases get an
+# inert TEXT column so create_all() keeps working.
+SEARCH_VECTOR_TYPE = TSVECTOR().with_variant(Text(), "sqlite")
+
+
+def search_vector_column():
+    return deferred(
+        Column(
+            "search_vector",
+            SEARCH_VECTOR_TYPE,
+            nullable=True,
+            server_default=FetchedValue(),
+            server_onupdate=FetchedValue(),
+        )
+    )
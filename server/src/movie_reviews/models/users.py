@@ -28,6 +28,10 @@ class User(db.Model, SerializerMixin):
     is_admin = db.Column(db.Boolean, default=False)
     dark_mode = db.Column(db.Boolean, default=False)
     icon_color = db.Column(db.String, default="blue")
+    # Maintained by models.fanout; do not write directly
+    unread_notification_count = db.Column(
+        db.Integer, default=0, server_default="0", nullable=False
+    )
 
     review_comments = db.relationship(
         "ReviewComment",
@@ -0,0 +1,18 @@
+from .engine import SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT, SEARCH_TYPES, run_search
+from .memory_index import install as install_search_index
+from .memory_index import search_index
+from .suggest import SUGGEST_DEFAULT_LIMIT, SUGGEST_MAX_LIMIT, suggest_index
+from .suggest import install as install_suggest_index
+
+__all__ = [
+    "SEARCH_TYPES",
+    "SEARCH_DEFAULT_LIMIT",
+    "SEARCH_MAX_LIMIT",
+    "SUGGEST_DEFAULT_LIMIT",
+    "SUGGEST_MAX_LIMIT",
+    "run_search",
+    "search_index",
+    "suggest_index",
+    "install_search_index",
+    "install_suggest_index",
+]
@@ -0,0 +1,36 @@
+"""
+Backend selection for /api/search.
+
+With ``SEARCH_MEMORY_INDEX=1`` searches are answered from the in-process inverted
+index whenever it is warm and fresh. Otherwise Postgres gets ranked full-text
+search over the trigger-maintained ``search_vector`` columns and any other dialect
+(SQLite dev databases) falls back to the ILIKE scan. Every backend returns
+``{type: (items, has_more)}`` for the requested types.
+"""
+
+from movie_reviews.config import db
+
+from . import fulltext, ilike
+from .memory_index import SEARCH_MEMORY_INDEX_ENABLED, search_index
+
+SEARCH_TYPES = ("movies", "articles", "directors")
+SEARCH_DEFAULT_LIMIT = 25
+SEARCH_MAX_LIMIT = 50
+
+
+def fulltext_available():
+    return db.session.get_bind().dialect.name == "postgresql"
+
+
+def run_search(query, types=SEARCH_TYPES, page=1, limit=SEARCH_DEFAULT_LIMIT):
+    offset = (page - 1) * limit
+    if SEARCH_MEMORY_INDEX_ENABLED:
+        if search_index.ready():
+            return search_index.search(query, types, offset, limit)
+        search_index.record_fallback()
+
+    backend = fulltext if fulltext_available() else ilike
+    return {
+        search_type: backend.SEARCHERS[search_type](query, offset, limit)
+        for search_type in types
+    }
@@ -0,0 +1,141 @@
+"""
+Ranked Postgres full-text search over the ``search_vector`` columns.
+
+The vectors are weighted and kept current by triggers (migration 7c4d2e9b1f30), so a
+search is a GIN index probe: ``websearch_to_tsquery`` parses what users type (quoted
+phrases, ``or``, ``-exclusions``), ``ts_rank`` orders the hits and ``ts_headline``
+builds a ``<mark>``-highlighted snippet. Ranking runs in an inner subquery that is
+cut to one page before the outer query computes headlines, so the expensive
+``ts_headline`` call only ever sees the rows being returned.
+"""
+
+from sqlalchemy import func, or_, select
+
+from movie_reviews.config import db
+from movie_reviews.models import Director, Movie, Review
+from movie_reviews.serializers import (
+    DIRECTOR_SEARCH_HIT,
+    MOVIE_SEARCH_HIT,
+    REVIEW_SEARCH_HIT,
+)
+
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=12, "
+    'MaxFragments=2, FragmentDelimiter=" … "'
+)
+
+
+def _tsquery(query):
+    return func.websearch_to_tsquery(SEARCH_CONFIG, query)
+
+
+def _matches(vector, tsq):
+    return vector.bool_op("@@")(tsq)
+
+
+def _plain_text(column):
+    """Review bodies are stored as HTML; headline the text, not the markup."""
+    return func.regexp_replace(func.coalesce(column, ""), "<[^>]+>", " ", "g")
+
+
+def _ranked_hits(model, schema, rank, condition, headline_source, tsq, offset, limit):
+    page = (
+        select(model.id.label("id"), rank.label("rank"))
+        .where(condition)
+        .order_by(rank.desc(), model.id)
+        .offset(offset)
+        .limit(limit + 1)
+        .subquery()
+    )
+    snippet = func.ts_headline(SEARCH_CONFIG, headline_source, tsq, HEADLINE_OPTIONS)
+    rows = db.session.execute(
+        select(page.c.id, page.c.rank, snippet.label("snippet"))
+        .select_from(page)
+        .join(model, model.id == page.c.id)
+        .order_by(page.c.rank.desc(), page.c.id)
+    ).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not rows:
+        return [], has_more
+
+    by_id = {
+        obj.id: obj
+        for obj in model.query.options(*schema.load_options()).filter(
+            model.id.in_([row.id for row in rows])
+        )
+    }
+    items = []
+    for row in rows:
+        obj = by_id.get(row.id)
+        if obj is None:  # deleted between the two queries
+            continue
+        item = schema.dump(obj)
+        item["rank"] = round(float(row.rank), 6)
+        item["snippet"] = row.snippet
+        items.append(item)
+    return items, has_more
+
+
+def search_movies(query, offset, limit):
+    """Movies matching on their own text or on the text/tags of their reviews."""
+    tsq = _tsquery(query)
+    review_rank = (
+        select(func.max(func.ts_rank(Review.search_vector, tsq)))
+        .where(Review.movie_id == Movie.id)
+        .scalar_subquery()
+    )
+    reviewed_matches = select(Review.movie_id).where(
+        Review.movie_id.isnot(None), _matches(Review.search_vector, tsq)
+    )
+    rank = func.greatest(
+        func.ts_rank(Movie.search_vector, tsq), func.coalesce(review_rank, 0)
+    )
+    condition = or_(_matches(Movie.search_vector, tsq), Movie.id.in_(reviewed_matches))
+    review_text = (
+        select(func.string_agg(_plain_text(Review.review_text), " "))
+        .where(Review.movie_id == Movie.id)
+        .scalar_subquery()
+    )
+    headline_source = func.concat_ws(" ", Movie.overview, review_text)
+    return _ranked_hits(
+        Movie, MOVIE_SEARCH_HIT, rank, condition, headline_source, tsq, offset, limit
+    )
+
+
+def search_articles(query, offset, limit):
+    tsq = _tsquery(query)
+    rank = func.ts_rank(Review.search_vector, tsq)
+    condition = Review.movie_id.is_(None) & _matches(Review.search_vector, tsq)
+    headline_source = func.concat_ws(
+        " ", Review.description, _plain_text(Review.review_text)
+    )
+    return _ranked_hits(
+        Review, REVIEW_SEARCH_HIT, rank, condition, headline_source, tsq, offset, limit
+    )
+
+
+def search_directors(query, offset, limit):
+    tsq = _tsquery(query)
+    rank = func.ts_rank(Director.search_vector, tsq)
+    condition = _matches(Director.search_vector, tsq)
+    headline_source = func.concat_ws(" ", Director.biography, Director.description)
+    return _ranked_hits(
+        Director,
+        DIRECTOR_SEARCH_HIT,
+        rank,
+        condition,
+        headline_source,
+        tsq,
+        offset,
+        limit,
+    )
+
+
+SEARCHERS = {
+    "movies": search_movies,
+    "articles": search_articles,
+    "directors": search_directors,
+}
@@ -0,0 +1,77 @@
+"""Portable ILIKE search (no ranking, no snippets) for non-Postgres databases."""
+
+from movie_reviews.config import db
+from movie_reviews.models import Director, Movie, Review, Tag
+from movie_reviews.serializers import (
+    DIRECTOR_SEARCH_HIT,
+    MOVIE_SEARCH_HIT,
+    REVIEW_SEARCH_HIT,
+)
+
+
+def _page(query, schema, offset, limit):
+    rows = query.offset(offset).limit(limit + 1).all()
+    return schema.dump_many(rows[:limit]), len(rows) > limit
+
+
+def search_movies(query, offset, limit):
+    pattern = f"%{query}%"
+    movie_ids = (
+        db.session.query(Movie.id)
+        .join(Review, Movie.id == Review.movie_id)
+        .filter(
+            db.or_(
+                Movie.title.ilike(pattern),
+                Review.review_text.ilike(pattern),
+                Review.tags.any(Tag.name.ilike(pattern)),
+            )
+        )
+    )
+    movies = (
+        db.session.query(Movie)
+        .options(*MOVIE_SEARCH_HIT.load_options())
+        .filter(Movie.id.in_(movie_ids))
+        .order_by(Movie.id)
+    )
+    return _page(movies, MOVIE_SEARCH_HIT, offset, limit)
+
+
+def search_articles(query, offset, limit):
+    pattern = f"%{query}%"
+    articles = (
+        db.session.query(Review)
+        .options(*REVIEW_SEARCH_HIT.load_options())
+        .filter_by(movie_id=None)
+        .filter(
+            db.or_(
+                Review.title.ilike(pattern),
+                Review.review_text.ilike(pattern),
+                Review.tags.any(Tag.name.ilike(pattern)),
+            )
+        )
+        .order_by(Review.id)
+    )
+    return _page(articles, REVIEW_SEARCH_HIT, offset, limit)
+
+
+def search_directors(query, offset, limit):
+    pattern = f"%{query}%"
+    directors = (
+        db.session.query(Director)
+        .options(*DIRECTOR_SEARCH_HIT.load_options())
+        .filter(
+            db.or_(
+                Director.name.ilike(pattern),
+                Director.biography.ilike(pattern),
+            )
+        )
+        .order_by(Director.id)
+    )
+    return _page(directors, DIRECTOR_SEARCH_HIT, offset, limit)
+
+
+SEARCHERS = {
+    "movies": search_movies,
+    "articles": search_articles,
+    "directors": search_directors,
+}
@@ -0,0 +1,475 @@
+"""
+Optional in-process inverted index for /api/search (``SEARCH_MEMORY_INDEX=1``).
+
+Built in a background thread at worker start, then kept current from SQLAlchemy
+session events: ``after_flush`` records which movies, reviews, directors and tags a
+transaction touched, ``after_commit`` hands them to the index and the next search
+re-reads just those rows (searches arriving meanwhile wait for that refresh).
+Searches with nothing pending never touch the database.
+
+Text is HTML-stripped, accent-stripped (NFKD) and case-folded before tokenizing.
+Every query token must match; the last one matches as a prefix so typeahead works.
+
+``run_search`` falls back to SQL while the index is cold (still building), stale
+(older than ``SEARCH_INDEX_MAX_AGE`` seconds, or an incremental refresh failed) or
+rebuilding. The age limit bounds drift from writes the events cannot see: other
+worker processes, bulk ``query.update()``/``delete()`` and scripts.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from datetime import datetime, timezone
+
+from flask import current_app
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from movie_reviews.config import db
+from movie_reviews.logging import logger
+from movie_reviews.models import Director, Movie, Review, Tag, review_tags
+from movie_reviews.serializers import (
+    DIRECTOR_SEARCH_HIT,
+    MOVIE_SEARCH_HIT,
+    REVIEW_SEARCH_HIT,
+)
+
+SEARCH_MEMORY_INDEX_ENABLED = os.getenv("SEARCH_MEMORY_INDEX", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+SEARCH_INDEX_MAX_AGE = int(os.getenv("SEARCH_INDEX_MAX_AGE", "300"))
+PREFIX_MIN_LENGTH = 2
+REBUILD_RETRY_SECONDS = 30
+
+TITLE_WEIGHT = 3
+TAG_WEIGHT = 2
+BODY_WEIGHT = 1
+
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"\w+")
+_PENDING_KEY = "search_index_pending"
+
+
+def normalize(text):
+    """Case-fold and strip accents: 'Vértigo' -> 'vertigo'."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def tokenize(text):
+    if not text:
+        return []
+    return _TOKEN_RE.findall(normalize(_HTML_TAG_RE.sub(" ", text)))
+
+
+def _empty_pending():
+    return {"movies": set(), "reviews": set(), "directors": set(), "tags": set()}
+
+
+def _review_fields(review):
+    fields = [
+        (review.title, TITLE_WEIGHT),
+        (review.description, TAG_WEIGHT),
+        (review.review_text, BODY_WEIGHT),
+    ]
+    fields.extend((tag.name, TAG_WEIGHT) for tag in review.tags)
+    return fields
+
+
+def _movie_fields(movie):
+    fields = [
+        (movie.title, TITLE_WEIGHT),
+        (movie.original_title, TITLE_WEIGHT),
+        (movie.overview, BODY_WEIGHT),
+    ]
+    for review in movie.reviews:
+        fields.extend(_review_fields(review))
+    return fields
+
+
+def _director_fields(director):
+    return [(director.name, TITLE_WEIGHT), (director.biography, BODY_WEIGHT)]
+
+
+def _token_scores(fields):
+    scores = {}
+    for text, weight in fields:
+        for token in tokenize(text):
+            scores[token] = max(scores.get(token, 0), weight)
+    return scores
+
+
+def _deep_sizeof(obj, seen):
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += _deep_sizeof(key, seen) + _deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += _deep_sizeof(item, seen)
+    return size
+
+
+# (doc type, model, hit schema, field extractor, base query filter)
+_DOC_TYPES = (
+    ("movies", Movie, MOVIE_SEARCH_HIT, _movie_fields, None),
+    ("articles", Review, REVIEW_SEARCH_HIT, _review_fields, Review.movie_id.is_(None)),
+    ("directors", Director, DIRECTOR_SEARCH_HIT, _director_fields, None),
+)
+
+
+class InMemorySearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        # Held from taking the pending ids until they are applied, so a search
+        # that arrives mid-refresh waits for it instead of answering from the
+        # index without those writes (the row reads happen outside _lock)
+        self._apply_lock = threading.Lock()
+        self._docs = {}  # (doc type, id) -> (payload, label, token scores)
+        self._postings = {}  # token -> {(doc type, id): weight}
+        self._vocab = []  # sorted tokens for prefix lookups
+        self._vocab_dirty = False
+        self._pending = _empty_pending()
+        self.state = "cold"
+        self.build_ms = None
+        self.built_at = None
+        self._built_monotonic = None
+        self._build_started = None
+        self.queries = 0
+        self.fallbacks = 0
+        self.refreshes = 0
+
+    # -- building ---------------------------------------------------------
+
+    def build(self):
+        """Load every searchable row and swap in a fresh index."""
+        with self._lock:
+            if self.state == "building":
+                return
+            previous_state = self.state
+            self.state = "building"
+            # Writes committed from here on are re-read after the swap
+            self._pending = _empty_pending()
+
+        start = time.perf_counter()
+        try:
+            docs, postings = {}, {}
+            for doc_type, model, schema, fields, condition in _DOC_TYPES:
+                query = model.query.options(*schema.load_options())
+                if condition is not None:
+                    query = query.filter(condition)
+                for obj in query:
+                    self._add_doc(docs, postings, doc_type, obj, schema, fields)
+        except Exception:
+            logger.exception("Search index build failed")
+            with self._lock:
+                self.state = "stale" if previous_state != "cold" else "cold"
+            return
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._docs = docs
+            self._postings = postings
+            self._vocab = sorted(postings)
+            self._vocab_dirty = False
+            self.build_ms = round(elapsed_ms, 1)
+            self.built_at = datetime.now(timezone.utc)
+            self._built_monotonic = time.monotonic()
+            self.state = "ready"
+        logger.info(
+            f"Search index built in {elapsed_ms:.1f}ms",
+            extra={"documents": len(docs), "tokens": len(postings)},
+        )
+
+    def build_in_background(self, app):
+        with self._lock:
+            now = time.monotonic()
+            if self.state == "building" or (
+                self._build_started is not None
+                and now - self._build_started < REBUILD_RETRY_SECONDS
+            ):
+                return
+            self._build_started = now
+
+        def run():
+            with app.app_context():
+                try:
+                    self.build()
+                finally:
+                    db.session.remove()
+
+        threading.Thread(target=run, name="search-index-build", daemon=True).start()
+
+    @staticmethod
+    def _add_doc(docs, postings, doc_type, obj, schema, fields):
+        key = (doc_type, obj.id)
+        scores = _token_scores(fields(obj))
+        payload = schema.dump(obj)
+        label = normalize(
+            payload.get("title")
+            or payload.get("name")
+            or payload.get("original_title")
+            or ""
+        )
+        docs[key] = (payload, label, scores)
+        for token, weight in scores.items():
+            postings.setdefault(token, {})[key] = weight
+
+    def _remove_doc(self, key):
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        for token in doc[2]:
+            bucket = self._postings.get(token)
+            if bucket is None:
+                continue
+            bucket.pop(key, None)
+            if not bucket:
+                del self._postings[token]
+                self._vocab_dirty = True
+
+    # -- incremental updates ---------------------------------------------
+
+    def enqueue(self, pending):
+        with self._lock:
+            for kind, ids in pending.items():
+                self._pending[kind].update(ids)
+
+    def _take_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, _empty_pending()
+        return pending
+
+    def _apply_pending(self):
+        """Re-read rows touched by committed writes. Returns False on failure."""
+        with self._apply_lock:
+            # The refresh this call waited on may have failed and marked it stale
+            if self.state != "ready":
+                return False
+            return self._apply_pending_locked()
+
+    def _apply_pending_locked(self):
+        pending = self._take_pending()
+        if not any(pending.values()):
+            return True
+
+        try:
+            movie_ids = set(pending["movies"])
+            director_ids = set(pending["directors"])
+            review_ids = set(pending["reviews"])
+            article_ids = set()
+            removed = set()
+
+            if pending["tags"]:
+                review_ids.update(
+                    db.session.scalars(
+                        select(review_tags.c.review_id).where(
+                            review_tags.c.tag_id.in_(pending["tags"])
+                        )
+                    )
+                )
+            if review_ids:
+                rows = db.session.execute(
+                    select(Review.id, Review.movie_id).where(Review.id.in_(review_ids))
+                ).all()
+                found = set()
+                for review_id, movie_id in rows:
+                    found.add(review_id)
+                    if movie_id is None:
+                        article_ids.add(review_id)
+                    else:
+                        movie_ids.add(movie_id)
+                        removed.add(("articles", review_id))
+                removed.update(("articles", rid) for rid in review_ids - found)
+            if director_ids:
+                movie_ids.update(
+                    db.session.scalars(
+                        select(Movie.id).where(Movie.director_id.in_(director_ids))
+                    )
+                )
+
+            wanted = {
+                "movies": movie_ids,
+                "articles": article_ids,
+                "directors": director_ids,
+            }
+            loaded = []
+            for doc_type, model, schema, fields, condition in _DOC_TYPES:
+                ids = wanted[doc_type]
+                if not ids:
+                    continue
+                query = model.query.options(*schema.load_options()).filter(
+                    model.id.in_(ids)
+                )
+                if condition is not None:
+                    query = query.filter(condition)
+                objs = query.all()
+                found = {obj.id for obj in objs}
+                removed.update((doc_type, missing) for missing in ids - found)
+                loaded.extend((doc_type, obj, schema, fields) for obj in objs)
+        except Exception:
+            logger.exception("Search index refresh failed; falling back to SQL")
+            with self._lock:
+                self.state = "stale"
+            return False
+
+        with self._lock:
+            for key in removed:
+                self._remove_doc(key)
+            for doc_type, obj, schema, fields in loaded:
+                self._remove_doc((doc_type, obj.id))
+                self._add_doc(self._docs, self._postings, doc_type, obj, schema, fields)
+            self._vocab_dirty = True
+            self.refreshes += 1
+        return True
+
+    # -- querying ---------------------------------------------------------
+
+    def ready(self):
+        """True when searches can be answered from memory right now.
+
+        A cold or stale index schedules a background (re)build and reports
+        not-ready until the new one is swapped in.
+        """
+        if self.state == "ready" and (
+            time.monotonic() - self._built_monotonic > SEARCH_INDEX_MAX_AGE
+        ):
+            with self._lock:
+                self.state = "stale"
+        if self.state in ("cold", "stale"):
+            self.build_in_background(current_app._get_current_object())
+            return False
+        if self.state != "ready":
+            return False
+        return self._apply_pending()
+
+    def _candidates(self, token, prefix):
+        if not prefix or len(token) < PREFIX_MIN_LENGTH:
+            return self._postings.get(token, {})
+        if self._vocab_dirty:
+            self._vocab = sorted(self._postings)
+            self._vocab_dirty = False
+        vocab = self._vocab
+        merged = {}
+        i = bisect_left(vocab, token)
+        while i < len(vocab) and vocab[i].startswith(token):
+            for key, weight in self._postings.get(vocab[i], {}).items():
+                if weight > merged.get(key, 0):
+                    merged[key] = weight
+            i += 1
+        return merged
+
+    def search(self, query, types, offset, limit):
+        """Return ``{type: (items, has_more)}`` like the SQL backends."""
+        tokens = tokenize(query)
+        with self._lock:
+            self.queries += 1
+            scores = None
+            for position, token in enumerate(tokens):
+                candidates = self._candidates(token, position == len(tokens) - 1)
+                if scores is None:
+                    scores = dict(candidates)
+                else:
+                    scores = {
+                        key: score + candidates[key]
+                        for key, score in scores.items()
+                        if key in candidates
+                    }
+                if not scores:
+                    break
+
+            by_type = {search_type: [] for search_type in types}
+            for key, score in (scores or {}).items():
+                hits = by_type.get(key[0])
+                if hits is not None:
+                    hits.append((-score, self._docs[key][1], key[1], key))
+
+            results = {}
+            for search_type, hits in by_type.items():
+                hits.sort()
+                page = hits[offset : offset + limit]
+                results[search_type] = (
+                    [
+                        {**self._docs[key][0], "rank": -neg_score}
+                        for neg_score, _label, _id, key in page
+                    ],
+                    len(hits) > offset + limit,
+                )
+        return results
+
+    def record_fallback(self):
+        with self._lock:
+            self.fallbacks += 1
+
+    def stats(self):
+        with self._lock:
+            memory_bytes = _deep_sizeof(self._docs, set()) + _deep_sizeof(
+                self._postings, set()
+            )
+            return {
+                "enabled": SEARCH_MEMORY_INDEX_ENABLED,
+                "state": self.state,
+                "documents": len(self._docs),
+                "tokens": len(self._postings),
+                "postings": sum(len(bucket) for bucket in self._postings.values()),
+                "memory_bytes": memory_bytes,
+                "build_ms": self.build_ms,
+                "built_at": self.built_at.isoformat() if self.built_at else None,
+                "max_age_seconds": SEARCH_INDEX_MAX_AGE,
+                "pending": sum(len(ids) for ids in self._pending.values()),
+                "queries": self.queries,
+                "fallbacks": self.fallbacks,
+                "refreshes": self.refreshes,
+            }
+
+
+search_index = InMemorySearchIndex()
+
+
+def _record_touched(session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, _empty_pending())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Movie):
+            pending["movies"].add(obj.id)
+        elif isinstance(obj, Review):
+            pending["reviews"].add(obj.id)
+            # Both the current movie and any movie the review was moved away from
+            history = inspect(obj).attrs.movie_id.history
+            pending["movies"].update(
+                mid for mid in (obj.movie_id, *history.deleted) if mid is not None
+            )
+        elif isinstance(obj, Director):
+            pending["directors"].add(obj.id)
+        elif isinstance(obj, Tag):
+            pending["tags"].add(obj.id)
+            # A deleted tag's association rows are gone by the time we re-read
+            pending["reviews"].update(r.id for r in obj.__dict__.get("reviews", ()))
+
+
+def _publish_touched(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and search_index.state != "cold":
+        search_index.enqueue(pending)
+
+
+def _discard_touched(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def install(app):
+    """Hook session events and start the initial build (no-op unless enabled)."""
+    if not SEARCH_MEMORY_INDEX_ENABLED:
+        return
+    event.listen(Session, "after_flush", _record_touched)
+    event.listen(Session, "after_commit", _publish_touched)
+    event.listen(Session, "after_rollback", _discard_touched)
+    search_index.build_in_background(app)
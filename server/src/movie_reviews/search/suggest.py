@@ -0,0 +1,211 @@
+"""
+Typeahead suggestions for /api/search/suggest.
+
+Sorted arrays of normalized keys over movie titles, director names, article titles
+and tag names, searched with ``bisect``. One array holds each whole label, a second
+holds the label from each later word start ("rear window" is reachable from "rea"
+and "win"); whole-label matches are taken from the first before the second is
+scanned. Only (type, id, label) is kept, so the structure stays small and a lookup
+is a binary search plus a short scan: no database round trip.
+
+Each scan stops after ``SUGGEST_SCAN_LIMIT`` keys, so for a very short prefix on a
+large catalog the shortest-label ordering applies to the first keys alphabetically,
+not to every match. Whole-label matches are never crowded out by mid-label ones.
+
+The arrays are built on first use (concurrent first lookups wait for that build)
+and rebuilt in the background when a commit in this process touches a movie,
+review, director or tag, and at least every ``SUGGEST_INDEX_MAX_AGE`` seconds to
+pick up other workers' writes. A build publishes all arrays as one tuple, so
+lookups keep serving the previous index until the new one is swapped in.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from flask import current_app
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from movie_reviews.config import db
+from movie_reviews.logging import logger
+from movie_reviews.models import Director, Movie, Review, Tag
+
+from .memory_index import normalize, tokenize
+
+SUGGEST_INDEX_MAX_AGE = int(os.getenv("SUGGEST_INDEX_MAX_AGE", "60"))
+SUGGEST_DEFAULT_LIMIT = 8
+SUGGEST_MAX_LIMIT = 20
+# Bound each scan for very short prefixes ("a") on large catalogs
+SUGGEST_SCAN_LIMIT = 500
+
+_TOUCHED_KEY = "suggest_index_touched"
+_SUGGEST_MODELS = (Movie, Review, Director, Tag)
+
+
+def _label_rows():
+    """(type, id, label) for every suggestible entity."""
+    queries = (
+        ("movie", select(Movie.id, Movie.title)),
+        ("director", select(Director.id, Director.name)),
+        (
+            "article",
+            select(Review.id, Review.title).where(
+                Review.movie_id.is_(None), Review.title.isnot(None)
+            ),
+        ),
+        ("tag", select(Tag.id, Tag.name)),
+    )
+    for kind, query in queries:
+        for entity_id, label in db.session.execute(query):
+            if label and label.strip():
+                yield kind, entity_id, label.strip()
+
+
+def _sorted_arrays(pairs):
+    pairs.sort(key=lambda pair: pair[0])
+    return (
+        tuple(key for key, _entry in pairs),
+        tuple(entry for _key, entry in pairs),
+    )
+
+
+class SuggestIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._first_build_lock = threading.Lock()
+        # ((keys, entries) for whole labels, (keys, entries) for later word starts);
+        # keys are sorted normalized keys, entries the parallel (type, id, label).
+        # Replaced as a whole, never mutated, so a lookup reads it once.
+        self._index = None
+        self._built_monotonic = None
+        self._dirty = False
+        self._building = False
+        self.build_ms = None
+
+    def build(self):
+        start = time.perf_counter()
+        whole_labels, word_starts = [], []
+        for kind, entity_id, label in _label_rows():
+            words = tokenize(label)
+            for position in range(len(words)):
+                key = " ".join(words[position:])
+                pairs = word_starts if position else whole_labels
+                pairs.append((key, (kind, entity_id, label)))
+        index = tuple(_sorted_arrays(pairs) for pairs in (whole_labels, word_starts))
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            # Before the index: a lookup that sees the index also sees its age
+            self._built_monotonic = time.monotonic()
+            self._index = index
+            self.build_ms = round(elapsed_ms, 1)
+        logger.info(
+            f"Suggest index built in {elapsed_ms:.1f}ms",
+            extra={"entries": len(whole_labels) + len(word_starts)},
+        )
+
+    def _rebuild_in_background(self, app):
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+            # Commits landing during the rebuild mark it dirty again
+            self._dirty = False
+
+        def run():
+            with app.app_context():
+                try:
+                    self.build()
+                except Exception:
+                    logger.exception("Suggest index rebuild failed")
+                    # Try again on the next lookup
+                    self.mark_dirty()
+                finally:
+                    db.session.remove()
+                    with self._lock:
+                        self._building = False
+
+        threading.Thread(target=run, name="suggest-index-build", daemon=True).start()
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def _ensure_fresh(self):
+        """The index to answer from, building it first if this is the first lookup."""
+        index = self._index
+        if index is None:
+            # One request builds; the others wait here instead of each loading
+            # every label.
+            with self._first_build_lock:
+                if self._index is None:
+                    # Cleared before the read, like a background rebuild
+                    self._dirty = False
+                    self.build()
+            return self._index
+        too_old = time.monotonic() - self._built_monotonic > SUGGEST_INDEX_MAX_AGE
+        if self._dirty or too_old:
+            self._rebuild_in_background(current_app._get_current_object())
+        return index
+
+    def suggest(self, query, limit=SUGGEST_DEFAULT_LIMIT):
+        prefix = " ".join(tokenize(query))
+        if not prefix:
+            return []
+        # Keep a trailing-space query ("rear ") from matching "rearview"
+        if normalize(query).endswith(" "):
+            prefix += " "
+        seen = set()
+        suggestions = []
+        # Whole-label matches first; within each, shorter labels then alphabetical
+        for keys, entries in self._ensure_fresh():
+            start = bisect_left(keys, prefix)
+            matches = []
+            for i in range(start, min(len(keys), start + SUGGEST_SCAN_LIMIT)):
+                if not keys[i].startswith(prefix):
+                    break
+                matches.append(entries[i])
+            matches.sort(key=lambda entry: (len(entry[2]), entry[2]))
+            for kind, entity_id, label in matches:
+                if (kind, entity_id) in seen:
+                    continue
+                seen.add((kind, entity_id))
+                suggestions.append({"id": entity_id, "type": kind, "label": label})
+                if len(suggestions) >= limit:
+                    return suggestions
+        return suggestions
+
+    def stats(self):
+        index = self._index or ()
+        return {
+            "entries": sum(len(keys) for keys, _entries in index),
+            "build_ms": self.build_ms,
+            "dirty": self._dirty,
+        }
+
+
+suggest_index = SuggestIndex()
+
+
+def _record_touched(session, flush_context):
+    if any(
+        isinstance(obj, _SUGGEST_MODELS)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info[_TOUCHED_KEY] = True
+
+
+def _publish_touched(session):
+    if session.info.pop(_TOUCHED_KEY, False):
+        suggest_index.mark_dirty()
+
+
+def _discard_touched(session):
+    session.info.pop(_TOUCHED_KEY, None)
+
+
+def install(app):
+    event.listen(Session, "after_flush", _record_touched)
+    event.listen(Session, "after_commit", _publish_touched)
+    event.listen(Session, "after_rollback", _discard_touched)
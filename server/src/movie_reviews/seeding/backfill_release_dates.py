@@ -17,10 +17,9 @@ import argparse
 import os
 from datetime import datetime
 
-import requests
-
 from movie_reviews.config import app, db
 from movie_reviews.models import Movie
+from movie_reviews.utils.tmdb_client import get_tmdb_client
 
 
 def extract_earliest_release_date(release_dates_payload):
@@ -52,18 +51,13 @@ def fetch_earliest_release_date(external_movie_id, api_key, timeout=12):
     if not external_movie_id or not api_key:
         return None
 
-    base_url = "https://api.themoviedb.org/3"
-    url = f"{base_url}/movie/{external_movie_id}/release_dates?api_key={api_key}"
-
-    try:
-        response = requests.get(url, timeout=timeout)
-    except Exception:
-        return None
-
-    if response.status_code != 200:
+    payload = get_tmdb_client().get_json(
+        f"/movie/{external_movie_id}/release_dates", timeout=timeout
+    )
+    if payload is None:
         return None
 
-    return extract_earliest_release_date(response.json() or {})
+    return extract_earliest_release_date(payload)
 
 
 def run_backfill(apply=False, limit=None):
@@ -1,6 +1,5 @@
 import json
 import mimetypes
-import os
 import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Tuple
@@ -10,6 +9,8 @@ import PyPDF2
 import requests
 from docx import Document
 
+from movie_reviews.utils.tmdb_client import get_tmdb_client
+
 DEFAULT_BASE_URL = "http://localhost:5555"
 DEFAULT_TIMEOUT = 60
 DEFAULT_CONFIG_CANDIDATES = (
@@ -220,18 +221,17 @@ class BatchImportClient:
         self, external_movie_id: int
     ) -> Optional[Dict[str, Any]]:
         """Full TMDb /movie/{id} object (includes origin_country; search hits often omit it)."""
-        api_key = os.getenv("MOVIE_API_KEY")
-        if not api_key:
+        tmdb = get_tmdb_client()
+        if not tmdb.configured:
             return None
-        url = (
-            f"https://api.themoviedb.org/3/movie/{int(external_movie_id)}"
-            f"?api_key={api_key}&language=en-US"
-        )
         try:
-            resp = requests.get(url, timeout=self.timeout)
-            if resp.status_code != 200:
+            status, body = tmdb.fetch(
+                f"/movie/{int(external_movie_id)}",
+                {"language": "en-US"},
+                timeout=self.timeout,
+            )
+            if status != 200:
                 return None
-            body = resp.json()
             return body if isinstance(body, dict) else None
         except Exception as exc:
             print(f"   -> WARNING: TMDb movie details fetch failed: {exc}")
@@ -239,19 +239,16 @@ class BatchImportClient:
 
     def _fetch_tmdb_director_name(self, external_movie_id: int) -> Optional[str]:
         """Primary Director credit from TMDb (same source of truth as the API server)."""
-        api_key = os.getenv("MOVIE_API_KEY")
-        if not api_key:
+        tmdb = get_tmdb_client()
+        if not tmdb.configured:
             print("   -> WARNING: MOVIE_API_KEY unset; cannot resolve director name")
             return None
-        url = (
-            f"https://api.themoviedb.org/3/movie/{external_movie_id}/credits"
-            f"?api_key={api_key}"
-        )
         try:
-            resp = requests.get(url, timeout=self.timeout)
-            if resp.status_code != 200:
+            status, data = tmdb.fetch(
+                f"/movie/{external_movie_id}/credits", timeout=self.timeout
+            )
+            if status != 200:
                 return None
-            data = resp.json()
             crew = data.get("crew") or []
             director = next((c for c in crew if c.get("job") == "Director"), None)
             if not director:
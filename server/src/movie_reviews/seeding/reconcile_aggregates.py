@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Repair drift in the materialized aggregates (see movie_reviews.models.aggregates).
+
+Recomputes reviews.like_count, review_comments.like_count, movies.rating,
+movies.review_count and users.unread_notification_count from the source tables and reports rows whose stored value
+differs. Drift only appears after writes that bypass the ORM (raw SQL, bulk
+deletes, manual fixes), so this is meant for cron or after data surgery.
+
+Usage examples:
+  # Dry-run (default): report drifted rows
+  python -m movie_reviews.seeding.reconcile_aggregates
+
+  # Apply repairs
+  python -m movie_reviews.seeding.reconcile_aggregates --apply
+"""
+
+import argparse
+
+from movie_reviews.config import app
+from movie_reviews.models import aggregates
+
+SAMPLE_ROWS = 10
+
+
+def run_reconcile(apply=False):
+    with app.app_context():
+        drift = aggregates.reconcile(apply=apply)
+
+    total = 0
+    for name, rows in drift.items():
+        total += len(rows)
+        for row_id, stored, actual in rows[:SAMPLE_ROWS]:
+            print(f"[drift] {name} id={row_id} stored={stored} actual={actual}")
+        if len(rows) > SAMPLE_ROWS:
+            print(f"[drift] {name} ... {len(rows) - SAMPLE_ROWS} more")
+
+    mode = "APPLY" if apply else "DRY-RUN"
+    summary = " ".join(f"{name}={len(rows)}" for name, rows in drift.items())
+    print(f"\n[{mode}] drifted={total} {summary}")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Recompute like counts and movie ratings from source tables."
+    )
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Persist repairs. Without this flag, runs as dry-run.",
+    )
+    args = parser.parse_args()
+
+    run_reconcile(apply=args.apply)
+
+
+if __name__ == "__main__":
+    main()
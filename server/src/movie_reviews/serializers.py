@@ -0,0 +1,210 @@
+"""
+Compiled, schema-driven serializers for hot read paths.
+
+``SerializerMixin.to_dict()`` walks relationships recursively, re-evaluates
+``serialize_rules`` on every call and lazy-loads whatever it touches. A ``Schema``
+fixes its field list once at import time, reads only attributes already present on
+the instance and raises ``UnloadedAttributeError`` instead of issuing a lazy load.
+Pair a schema with ``query.options(*schema.load_options())`` so everything it needs
+arrives in a bounded number of SELECTs.
+
+Views:
+    card        list/grid tiles (no long text, no nested collections beyond tags)
+    detail      single-entity pages
+    search_hit  /api/search results (card-level, enough for the Home result grids)
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload
+from sqlalchemy_serializer import SerializerMixin
+
+from movie_reviews.models import Director, Movie, Review, ReviewComment, Tag, User
+
+
+class UnloadedAttributeError(RuntimeError):
+    """A schema field is not loaded on the instance; reading it would lazy-load."""
+
+
+def _format_date(value):
+    return value.strftime(SerializerMixin.date_format) if value is not None else None
+
+
+def _format_datetime(value):
+    return (
+        value.strftime(SerializerMixin.datetime_format) if value is not None else None
+    )
+
+
+def _converter_for(column):
+    """Match SerializerMixin output formats so payloads stay byte-compatible."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+    if issubclass(python_type, datetime):
+        return _format_datetime
+    if issubclass(python_type, date):
+        return _format_date
+    return None
+
+
+class Schema:
+    """A precompiled field list for one model and one view."""
+
+    __slots__ = ("model", "columns", "nested", "_column_plan", "_nested_plan")
+
+    def __init__(self, model, columns, nested=None):
+        self.model = model
+        self.columns = tuple(columns)
+        self.nested = dict(nested or {})
+        self._column_plan, self._nested_plan = self._compile()
+
+    def _compile(self):
+        mapper = inspect(self.model)
+        column_plan = []
+        for name in self.columns:
+            if name not in mapper.columns:
+                raise ValueError(f"{self.model.__name__}.{name} is not a column")
+            column_plan.append((name, _converter_for(mapper.columns[name])))
+        nested_plan = []
+        for name, schema in self.nested.items():
+            if name not in mapper.relationships:
+                raise ValueError(f"{self.model.__name__}.{name} is not a relationship")
+            nested_plan.append((name, schema, mapper.relationships[name].uselist))
+        return tuple(column_plan), tuple(nested_plan)
+
+    def _missing(self, name):
+        return UnloadedAttributeError(
+            f"{self.model.__name__}.{name} is not loaded; add "
+            f"query.options(*schema.load_options()) instead of lazy-loading it"
+        )
+
+    def dump(self, obj):
+        """Serialize one instance from its already-loaded attribute dict."""
+        loaded = obj.__dict__
+        out = {}
+        for name, convert in self._column_plan:
+            try:
+                value = loaded[name]
+            except KeyError:
+                raise self._missing(name) from None
+            out[name] = convert(value) if convert else value
+        for name, schema, many in self._nested_plan:
+            try:
+                value = loaded[name]
+            except KeyError:
+                raise self._missing(name) from None
+            if many:
+                out[name] = [schema.dump(item) for item in value]
+            else:
+                out[name] = schema.dump(value) if value is not None else None
+        return out
+
+    def dump_many(self, objs):
+        dump = self.dump
+        return [dump(obj) for obj in objs]
+
+    def load_options(self):
+        """Loader options that populate every relationship this schema reads."""
+        options = []
+        for name, schema in self.nested.items():
+            loader = selectinload(getattr(self.model, name))
+            child_options = schema.load_options()
+            if child_options:
+                loader = loader.options(*child_options)
+            options.append(loader)
+        return options
+
+
+MOVIE_COLUMNS = (
+    "id",
+    "external_id",
+    "title",
+    "original_title",
+    "original_language",
+    "overview",
+    "release_date",
+    "cover_photo",
+    "backdrop",
+    "primary_origin_country",
+    "director_id",
+)
+REVIEW_CARD_COLUMNS = (
+    "id",
+    "movie_id",
+    "director_id",
+    "title",
+    "description",
+    "rating",
+    "date_added",
+    "content_type",
+    "backdrop",
+    "show_review_backdrop",
+    "has_document",
+    "document_type",
+    "like_count",
+)
+REVIEW_DETAIL_COLUMNS = REVIEW_CARD_COLUMNS + (
+    "review_text",
+    "main_cast",
+    "line_notes",
+    "document_filename",
+    "document_path",
+)
+DIRECTOR_COLUMNS = (
+    "id",
+    "external_id",
+    "name",
+    "cover_photo",
+    "backdrop",
+    "biography",
+    "description",
+)
+
+TAG = Schema(Tag, ("id", "name"))
+PUBLIC_USER = Schema(User, ("id", "username", "first_name", "last_name", "icon_color"))
+
+DIRECTOR_CARD = Schema(Director, DIRECTOR_COLUMNS)
+MOVIE_CARD = Schema(Movie, MOVIE_COLUMNS)
+
+REVIEW_CARD = Schema(Review, REVIEW_CARD_COLUMNS, {"tags": TAG})
+REVIEW_DETAIL = Schema(
+    Review,
+    REVIEW_DETAIL_COLUMNS,
+    {"tags": TAG, "movie": MOVIE_CARD, "director": DIRECTOR_CARD},
+)
+REVIEW_SEARCH_HIT = REVIEW_CARD
+
+MOVIE_DETAIL = Schema(
+    Movie,
+    MOVIE_COLUMNS,
+    {
+        "director": DIRECTOR_CARD,
+        "reviews": Schema(Review, REVIEW_DETAIL_COLUMNS, {"tags": TAG}),
+    },
+)
+MOVIE_SEARCH_HIT = Schema(
+    Movie, MOVIE_COLUMNS, {"director": DIRECTOR_CARD, "reviews": REVIEW_CARD}
+)
+
+DIRECTOR_DETAIL = Schema(
+    Director, DIRECTOR_COLUMNS, {"movies": MOVIE_CARD, "reviews": REVIEW_CARD}
+)
+DIRECTOR_SEARCH_HIT = DIRECTOR_CARD
+
+COMMENT_DETAIL = Schema(
+    ReviewComment,
+    (
+        "id",
+        "review_id",
+        "user_id",
+        "body",
+        "parent_comment_id",
+        "created_at",
+        "updated_at",
+        "like_count",
+    ),
+    {"user": PUBLIC_USER},
+)
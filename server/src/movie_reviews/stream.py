@@ -0,0 +1,327 @@
+"""
+Server-sent events for /api/stream (opt-in: ``STREAM_ENABLED=1``).
+
+Write paths call ``publish(session, channel, name, data)``; the event is held on the
+session and only goes out after the transaction commits (rolled-back work
+publishes nothing). Channels are ``activity`` (global feed items) and
+``user:<id>`` (that user's notifications).
+
+Delivery goes through a backend chosen with ``STREAM_BACKEND``:
+
+* ``local`` (default): straight to this process's subscribers. Enough for one
+  worker, or when every worker only needs its own writes.
+* ``postgres``: ``pg_notify`` on commit and a LISTEN thread per worker, so a reply
+  written by one gunicorn worker reaches streams held open by the others.
+
+Each open stream holds a worker thread, so run gunicorn with threaded or gevent
+workers when this is on. Streams close after ``STREAM_MAX_SECONDS`` and the
+browser's EventSource reconnects on its own, sending the ``id:`` of the last event
+it saw as ``Last-Event-ID``. Each worker keeps its last ``STREAM_REPLAY_SIZE``
+events and replays what the client missed; when it cannot (the id is from another
+worker or older than the buffer, or a queue overflowed) the client gets
+``resync`` and refetches instead.
+"""
+
+import json
+import os
+import queue
+import select
+import threading
+import time
+import uuid
+from collections import Counter, deque
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from movie_reviews.config import db
+from movie_reviews.logging import logger
+
+STREAM_ENABLED = os.getenv("STREAM_ENABLED", "").lower() in ("1", "true", "yes")
+STREAM_BACKEND = os.getenv("STREAM_BACKEND", "local").lower()
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+STREAM_MAX_SECONDS = float(os.getenv("STREAM_MAX_SECONDS", "300"))
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "100"))
+STREAM_REPLAY_SIZE = int(os.getenv("STREAM_REPLAY_SIZE", "500"))
+
+PG_CHANNEL = "movie_reviews_stream"
+# pg_notify rejects payloads of 8000 bytes or more
+PG_PAYLOAD_LIMIT = 7900
+
+_PENDING_KEY = "stream_pending"
+
+
+class Subscription:
+    """One open stream: the channels it listens on and its event queue."""
+
+    def __init__(self, channels, maxsize=STREAM_QUEUE_SIZE):
+        self.channels = frozenset(channels)
+        self.queue = queue.Queue(maxsize)
+        # Set when events were dropped (or cannot be replayed); the client should
+        # refetch
+        self.overflowed = False
+        # Missed events to send first, and the id the stream starts from
+        self.replay = []
+        self.last_event_id = None
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class Broker:
+    """In-process fan-out from channels to open subscriptions."""
+
+    def __init__(self, replay_size=STREAM_REPLAY_SIZE):
+        self._subscriptions = {}  # channel -> set of Subscription
+        self._lock = threading.Lock()
+        self.backend = LocalBackend(self)
+        self.counters = Counter()
+        # Event ids are "<epoch>-<seq>"; the epoch tells this process's ids apart
+        # from another worker's (or a restarted one's)
+        self.epoch = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._history = deque(maxlen=replay_size)  # (seq, channel, name, data)
+
+    def _event_id(self, seq):
+        return f"{self.epoch}-{seq}"
+
+    def _missed(self, channels, last_event_id):
+        """Events after ``last_event_id`` on ``channels``, or None if unknown."""
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self._seq:
+            return None
+        seq = int(seq)
+        oldest = self._history[0][0] if self._history else self._seq + 1
+        if seq < oldest - 1:
+            return None  # the buffer no longer reaches back that far
+        return [
+            (self._event_id(event_seq), name, data)
+            for event_seq, channel, name, data in self._history
+            if event_seq > seq and channel in channels
+        ]
+
+    def subscribe(self, channels, last_event_id=None):
+        """Open a subscription; with ``last_event_id``, queue up what was missed."""
+        subscription = Subscription(channels)
+        with self._lock:
+            # Under the lock, so nothing is both replayed and delivered (or neither)
+            if last_event_id:
+                missed = self._missed(subscription.channels, last_event_id)
+                if missed is None:
+                    subscription.overflowed = True
+                    self.counters["resyncs"] += 1
+                else:
+                    subscription.replay = missed
+                    self.counters["replayed"] += len(missed)
+            subscription.last_event_id = self._event_id(self._seq)
+            for channel in subscription.channels:
+                self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscriptions.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[channel]
+
+    def publish(self, channel, name, data):
+        self.counters["published"] += 1
+        self.backend.publish(channel, name, data)
+
+    def deliver(self, channel, name, data):
+        """Hand an event to this process's subscribers of ``channel``."""
+        with self._lock:
+            self._seq += 1
+            event_id = self._event_id(self._seq)
+            self._history.append((self._seq, channel, name, data))
+            subscribers = list(self._subscriptions.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait((event_id, name, data))
+                self.counters["delivered"] += 1
+            except queue.Full:
+                subscription.overflowed = True
+                self.counters["dropped"] += 1
+
+    def stats(self):
+        with self._lock:
+            streams = len(
+                {
+                    sub
+                    for subscribers in self._subscriptions.values()
+                    for sub in subscribers
+                }
+            )
+        return {
+            **self.counters,
+            "streams": streams,
+            "backend": type(self.backend).__name__,
+        }
+
+
+class LocalBackend:
+    def __init__(self, broker):
+        self.broker = broker
+
+    def publish(self, channel, name, data):
+        self.broker.deliver(channel, name, data)
+
+    def start(self, app):
+        pass
+
+
+class PostgresBackend:
+    """Cross-worker delivery over LISTEN/NOTIFY on ``PG_CHANNEL``.
+
+    Publishing is a ``pg_notify`` on its own connection after the writer's commit;
+    every worker (including the publisher) gets it back through its LISTEN thread
+    and delivers locally.
+    """
+
+    def __init__(self, broker):
+        self.broker = broker
+        self._engine = None
+
+    def publish(self, channel, name, data):
+        payload = json.dumps({"channel": channel, "event": name, "data": data})
+        if len(payload.encode("utf-8")) > PG_PAYLOAD_LIMIT:
+            # Too big to travel; tell listeners to refetch instead
+            payload = json.dumps({"channel": channel, "event": "resync", "data": {}})
+        try:
+            with self._engine.connect() as conn:
+                conn.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": PG_CHANNEL, "payload": payload},
+                )
+                conn.commit()
+        except Exception:
+            logger.exception("stream pg_notify failed; delivering locally only")
+            self.broker.deliver(channel, name, data)
+
+    def _listen_once(self):
+        raw = self._engine.raw_connection()
+        try:
+            conn = raw.driver_connection
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {PG_CHANNEL}")
+            logger.info(f"stream listening on {PG_CHANNEL}")
+            while True:
+                # Wake up now and then so a dead connection is noticed
+                if select.select([conn], [], [], 30) == ([], [], []):
+                    with conn.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    try:
+                        message = json.loads(notify.payload)
+                        self.broker.deliver(
+                            message["channel"], message["event"], message["data"]
+                        )
+                    except (ValueError, KeyError):
+                        logger.warning(
+                            f"stream ignored bad payload: {notify.payload!r}"
+                        )
+        finally:
+            raw.invalidate()
+
+    def _listen(self):
+        backoff = 1
+        while True:
+            try:
+                self._listen_once()
+            except Exception:
+                logger.exception(f"stream LISTEN failed; reconnecting in {backoff}s")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def start(self, app):
+        with app.app_context():
+            self._engine = db.engine
+        threading.Thread(target=self._listen, name="stream-listen", daemon=True).start()
+
+
+BACKENDS = {"local": LocalBackend, "postgres": PostgresBackend}
+
+broker = Broker()
+
+
+def user_channel(user_id):
+    return f"user:{user_id}"
+
+
+def publish(session, channel, name, data):
+    """Queue an event on ``session``; it is published when the session commits."""
+    if not STREAM_ENABLED:
+        return
+    session.info.setdefault(_PENDING_KEY, []).append((channel, name, data))
+
+
+def _publish_pending(session):
+    for channel, name, data in session.info.pop(_PENDING_KEY, ()):
+        try:
+            broker.publish(channel, name, data)
+        except Exception:
+            logger.exception(f"stream publish to {channel} failed")
+
+
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def format_event(name, data, event_id=None):
+    prefix = f"id: {event_id}\n" if event_id else ""
+    return f"{prefix}event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+def events(subscription, heartbeat=None, max_seconds=None):
+    """SSE text for one subscription: events as they arrive, heartbeats between."""
+    heartbeat = heartbeat or STREAM_HEARTBEAT_SECONDS
+    deadline = time.monotonic() + (max_seconds or STREAM_MAX_SECONDS)
+    # Reconnect quickly after the server closes the stream on purpose
+    yield "retry: 2000\n\n"
+    # ready carries the current id, so a reconnect resumes from here even when no
+    # event arrived on this connection
+    yield format_event(
+        "ready",
+        {"channels": sorted(subscription.channels)},
+        subscription.last_event_id,
+    )
+    for event_id, name, data in subscription.replay:
+        yield format_event(name, data, event_id)
+    subscription.replay = []
+    if subscription.overflowed:
+        subscription.overflowed = False
+        yield format_event("resync", {})
+    while (remaining := deadline - time.monotonic()) > 0:
+        item = subscription.get(timeout=min(heartbeat, remaining))
+        if subscription.overflowed:
+            subscription.overflowed = False
+            yield format_event("resync", {})
+        if item is None:
+            yield ": ping\n\n"
+            continue
+        event_id, name, data = item
+        yield format_event(name, data, event_id)
+
+
+def install(app):
+    """Hook commit/rollback and start the backend (no-op unless STREAM_ENABLED)."""
+    if not STREAM_ENABLED:
+        return
+    backend = BACKENDS.get(STREAM_BACKEND)
+    if backend is None:
+        logger.warning(f"Unknown STREAM_BACKEND={STREAM_BACKEND!r}; using local")
+        backend = LocalBackend
+    broker.backend = backend(broker)
+    broker.backend.start(app)
+    event.listen(Session, "after_commit", _publish_pending)
+    event.listen(Session, "after_rollback", _discard_pending)
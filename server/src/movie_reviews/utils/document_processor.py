@@ -17,10 +17,10 @@ from typing import Any
 from xml.etree import ElementTree as ET
 
 import pdfplumber
-import PyPDF2
 from docx import Document
 from werkzeug.utils import secure_filename
 
+from .pdf_extraction import extract_pdf_text
 from .review_html_enricher import (
     enrich_review_html,
     extract_main_cast_line_notes_from_review_html,
@@ -235,34 +235,12 @@ class DocumentProcessor:
 
     @staticmethod
     def extract_text_from_pdf(file_path: str) -> str:
-        """Extract text from PDF file with better formatting preservation."""
-        try:
-            text = ""
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    # Use extract_text with layout preservation
-                    page_text = page.extract_text(
-                        layout=True, x_tolerance=3, y_tolerance=3
-                    )
-                    if page_text:
-                        # Preserve the original formatting
-                        text += page_text + "\n\n"  # Add double newline between pages
-            return text.strip()
-        except Exception as e:
-            print(f"Error extracting text from PDF with pdfplumber: {e}")
-            # Fallback to PyPDF2
-            try:
-                with open(file_path, "rb") as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    text = ""
-                    for page in pdf_reader.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n\n"
-                    return text.strip()
-            except Exception as e2:
-                print(f"Error with PyPDF2 fallback: {e2}")
-                return ""
+        """Extract text from PDF file with better formatting preservation.
+
+        Pages are extracted in parallel with per-page PyPDF2 fallback; see
+        utils.pdf_extraction for the pool, page cap and deadline settings.
+        """
+        return extract_pdf_text(file_path)
 
     @staticmethod
     def extract_text_from_docx(file_path: str) -> str:
@@ -741,7 +719,9 @@ class DocumentProcessor:
                 temp_file.close()
 
     @staticmethod
-    def process_uploaded_document_s3(file, review_id: int) -> dict[str, Any]:
+    def process_uploaded_document_s3(
+        file, review_id: int, progress=None
+    ) -> dict[str, Any]:
         """
         Process uploaded document using S3 storage for deployment compatibility.
         Extracts text and uploads file to S3 - production-ready approach.
@@ -749,6 +729,7 @@ class DocumentProcessor:
         Args:
             file: Uploaded file object
             review_id: ID of the review this document belongs to
+            progress: Optional ``progress(stage, percent)`` callback (document jobs)
 
         Returns:
             Dict with keys: 'filename', 's3_object_key', 'file_type', 'extracted_text', 'success'
@@ -780,6 +761,8 @@ class DocumentProcessor:
             temp_file.close()
 
             # Extract HTML when possible so semantic classes can be applied
+            if progress:
+                progress("extracting", 10)
             extracted_text, main_cast, line_notes = (
                 DocumentProcessor.extract_html_from_document(
                     temp_path, file_type, clean_text=True, remove_title=True
@@ -793,6 +776,8 @@ class DocumentProcessor:
                     "file_type": file_type,
                 }
 
+            if progress:
+                progress("uploading", 60)
             # Generate S3 object key
             s3_object_key = s3_client.generate_object_key(original_filename, review_id)
 
@@ -823,6 +808,8 @@ class DocumentProcessor:
 
             # First embedded image as review backdrop (same S3 pattern as manual backdrop upload)
             if file_type == "docx" and temp_path:
+                if progress:
+                    progress("backdrop", 80)
                 first_img = (
                     DocumentProcessor.extract_first_body_image_for_backdrop_docx(
                         temp_path
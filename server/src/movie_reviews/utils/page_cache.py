@@ -0,0 +1,166 @@
+"""
+Bounded TTL cache for rendered API pages, invalidated by group.
+
+Every entry belongs to a group (e.g. one review's comment pages). Invalidating a
+group bumps its generation number, which is part of every entry's identity, so
+all of the group's entries stop matching at once without scanning for them; the
+orphans age out through the LRU bound and TTL like any other entry.
+
+Generations live in this process by default. With a shared backend (anything with
+``generation(group)`` / ``bump(group)``; ``SqliteGenerationBackend`` is bundled)
+a bump in one gunicorn worker invalidates the group in all of them, at the cost
+of one local read per lookup.
+
+Values are stored as JSON text so each hit hands out a fresh object.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from movie_reviews.logging import logger
+
+
+class SqliteGenerationBackend:
+    """Group generations in one SQLite file shared by every worker on the host."""
+
+    def __init__(self, path, table="page_cache_generations"):
+        self.path = path
+        self.table = table
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "grp TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def generation(self, group):
+        row = (
+            self._connect()
+            .execute(f"SELECT generation FROM {self.table} WHERE grp = ?", (group,))
+            .fetchone()
+        )
+        return row[0] if row else 0
+
+    def bump(self, group):
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO {self.table} (grp, generation) VALUES (?, 1) "
+                "ON CONFLICT(grp) DO UPDATE SET generation = generation + 1",
+                (group,),
+            )
+
+
+class PageCache:
+    def __init__(self, max_entries, ttl, shared=None, name="page_cache"):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.shared = shared
+        self.name = name
+        self._entries = OrderedDict()  # (group, generation, key) -> (expires, json)
+        self._generations = {}
+        self._lock = threading.Lock()
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "expired": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "shared_errors": 0,
+        }
+
+    def _generation(self, group):
+        if self.shared is not None:
+            try:
+                return self.shared.generation(str(group))
+            except Exception as exc:
+                self.counters["shared_errors"] += 1
+                logger.warning(f"{self.name} shared generation read failed: {exc}")
+        return self._generations.get(group, 0)
+
+    def generation(self, group):
+        """The group's current generation, to pass to a ``get`` and its ``set``.
+
+        Read it before building the value: a ``set`` under that generation cannot
+        outlive an ``invalidate`` that ran while the value was being built.
+        """
+        return self._generation(group)
+
+    def get(self, group, key, generation=None):
+        """The cached value, or None on a miss."""
+        if generation is None:
+            generation = self._generation(group)
+        full_key = (group, generation, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            if entry[0] <= now:
+                del self._entries[full_key]
+                self.counters["expired"] += 1
+                self.counters["misses"] += 1
+                return None
+            self._entries.move_to_end(full_key)
+            self.counters["hits"] += 1
+        return json.loads(entry[1])
+
+    def set(self, group, key, value, generation=None):
+        if generation is None:
+            generation = self._generation(group)
+        full_key = (group, generation, key)
+        now = time.monotonic()
+        entry = (now + self.ttl, json.dumps(value))
+        with self._lock:
+            self._entries[full_key] = entry
+            self._entries.move_to_end(full_key)
+            self.counters["stores"] += 1
+            # Oldest first: drop expired entries, then anything over the bound
+            while self._entries:
+                oldest_key, (expires_at, _) = next(iter(self._entries.items()))
+                if expires_at > now and len(self._entries) <= self.max_entries:
+                    break
+                del self._entries[oldest_key]
+                self.counters["expired" if expires_at <= now else "evictions"] += 1
+
+    def invalidate(self, group):
+        """Drop every entry of ``group`` (here and, with a shared backend, everywhere)."""
+        with self._lock:
+            self._generations[group] = self._generations.get(group, 0) + 1
+            self.counters["invalidations"] += 1
+        if self.shared is not None:
+            try:
+                self.shared.bump(str(group))
+            except Exception as exc:
+                self.counters["shared_errors"] += 1
+                logger.warning(f"{self.name} shared invalidation failed: {exc}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+            entries = len(self._entries)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else None,
+            "shared_backend": type(self.shared).__name__ if self.shared else None,
+        }
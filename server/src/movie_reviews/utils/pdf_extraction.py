@@ -0,0 +1,190 @@
+"""
+Page-parallel PDF text extraction behind DocumentProcessor.extract_text_from_pdf.
+
+pdfplumber's layout-mode ``extract_text`` is CPU-bound, so a long essay used to keep
+one core busy for seconds, page after page. Here the pages are cut into chunks of
+``PDF_EXTRACT_PAGES_PER_TASK`` and run on a bounded process pool
+(``PDF_EXTRACT_WORKERS`` processes, started once per web worker and reused), and
+the chunk texts are joined back in page order. A page pdfplumber cannot read is
+retried on its own with PyPDF2 instead of dropping the whole document to the
+PyPDF2 path.
+
+``PDF_EXTRACT_MAX_PAGES`` caps how many pages are read and
+``PDF_EXTRACT_DEADLINE_SECONDS`` bounds the wall time. Past either, the text
+extracted so far (in order, up to the first unfinished chunk) is returned and a
+warning is logged; chunks already running finish in the pool and are discarded.
+Documents shorter than ``PDF_EXTRACT_PARALLEL_MIN_PAGES``, or
+``PDF_EXTRACT_WORKERS`` below 2, are extracted in the calling process.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pdfplumber
+import PyPDF2
+
+from movie_reviews.logging import logger
+
+PDF_EXTRACT_WORKERS = int(
+    os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+PDF_EXTRACT_PAGES_PER_TASK = int(os.getenv("PDF_EXTRACT_PAGES_PER_TASK", "8"))
+PDF_EXTRACT_PARALLEL_MIN_PAGES = int(os.getenv("PDF_EXTRACT_PARALLEL_MIN_PAGES", "6"))
+PDF_EXTRACT_MAX_PAGES = int(os.getenv("PDF_EXTRACT_MAX_PAGES", "300"))
+PDF_EXTRACT_DEADLINE_SECONDS = float(os.getenv("PDF_EXTRACT_DEADLINE_SECONDS", "60"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def page_ranges(page_count, per_task):
+    """``[(start, stop), ...]`` covering ``range(page_count)`` in chunks."""
+    per_task = max(1, per_task)
+    return [
+        (start, min(start + per_task, page_count))
+        for start in range(0, page_count, per_task)
+    ]
+
+
+def count_pages(file_path):
+    try:
+        return len(PyPDF2.PdfReader(file_path).pages)
+    except Exception:
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+
+
+def extract_page_range(file_path, start, stop):
+    """Texts of pages ``[start, stop)`` in order, and how many needed PyPDF2.
+
+    Runs inside the pool workers, so it opens the file itself and never raises:
+    pages neither library can read come back as None.
+    """
+    texts = [None] * (stop - start)
+    done = [False] * (stop - start)
+    try:
+        # pdfplumber numbers pages from 1
+        with pdfplumber.open(file_path, pages=range(start + 1, stop + 1)) as pdf:
+            for offset, page in enumerate(pdf.pages):
+                try:
+                    texts[offset] = page.extract_text(
+                        layout=True, x_tolerance=3, y_tolerance=3
+                    )
+                    done[offset] = True
+                except Exception:
+                    pass
+                finally:
+                    page.close()
+    except Exception:
+        pass
+
+    failed = [offset for offset, ok in enumerate(done) if not ok]
+    if failed:
+        try:
+            reader = PyPDF2.PdfReader(file_path)
+            for offset in failed:
+                try:
+                    texts[offset] = reader.pages[start + offset].extract_text()
+                except Exception:
+                    pass
+        except Exception:
+            pass
+    return texts, len(failed)
+
+
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: web workers run threads (stream, like buffer)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _drop_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_parallel(file_path, ranges, deadline, workers):
+    pool = _get_pool(workers)
+    futures = [
+        pool.submit(extract_page_range, file_path, start, stop)
+        for start, stop in ranges
+    ]
+    chunks = []
+    try:
+        # In submission order, so whatever is collected is a prefix of the document
+        for (start, stop), future in zip(ranges, futures):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                chunks.append(future.result(timeout=remaining))
+            except FutureTimeoutError:
+                break
+            except Exception:
+                # Broken pool (a worker died): finish this chunk here
+                logger.exception("pdf_extraction pool failed; extracting inline")
+                _drop_pool(pool)
+                chunks.append(extract_page_range(file_path, start, stop))
+    finally:
+        for future in futures:
+            future.cancel()
+    return chunks
+
+
+def extract_pdf_text(file_path, max_pages=None, deadline_seconds=None, workers=None):
+    """Layout-preserving text of a PDF, pages separated by blank lines."""
+    start_time = time.perf_counter()
+    max_pages = PDF_EXTRACT_MAX_PAGES if max_pages is None else max_pages
+    if deadline_seconds is None:
+        deadline_seconds = PDF_EXTRACT_DEADLINE_SECONDS
+    workers = PDF_EXTRACT_WORKERS if workers is None else workers
+    deadline = time.monotonic() + deadline_seconds
+
+    try:
+        page_count = count_pages(file_path)
+    except Exception as e:
+        logger.warning(f"pdf_extraction could not open {file_path}: {e}")
+        return ""
+    pages = min(page_count, max_pages) if max_pages else page_count
+    ranges = page_ranges(pages, PDF_EXTRACT_PAGES_PER_TASK)
+
+    parallel = workers > 1 and pages >= PDF_EXTRACT_PARALLEL_MIN_PAGES
+    if parallel:
+        chunks = _extract_parallel(file_path, ranges, deadline, workers)
+    else:
+        chunks = []
+        for start, stop in ranges:
+            if time.monotonic() >= deadline:
+                break
+            chunks.append(extract_page_range(file_path, start, stop))
+
+    texts = [text for chunk_texts, _fallbacks in chunks for text in chunk_texts]
+    fallbacks = sum(fallback_count for _texts, fallback_count in chunks)
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    truncated = len(texts) < page_count
+    log = logger.warning if truncated or elapsed_ms > 5000 else logger.info
+    log(
+        f"pdf_extraction pages={len(texts)}/{page_count} fallbacks={fallbacks} "
+        f"parallel={parallel} elapsed_ms={elapsed_ms:.2f}ms"
+        + (" (truncated)" if truncated else ""),
+        extra={
+            "pages": len(texts),
+            "page_count": page_count,
+            "fallback_pages": fallbacks,
+            "parallel": parallel,
+            "elapsed_ms": round(elapsed_ms, 2),
+        },
+    )
+    return "\n\n".join(text for text in texts if text).strip()
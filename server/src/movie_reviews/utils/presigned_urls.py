@@ -0,0 +1,96 @@
+"""
+Presigned GET URLs for S3 objects, cached per key until shortly before expiry.
+
+With ``OBJECT_DELIVERY=redirect`` the backdrop and document view endpoints answer
+with a 302 to one of these URLs, so object bytes go from MinIO/S3 straight to the
+browser instead of through a Flask worker. A URL is signed for
+``PRESIGNED_URL_SECONDS`` and handed out again until
+``PRESIGNED_URL_REFRESH_SECONDS`` before it lapses: a redirect never points at a
+URL about to expire, and repeat views get the same URL, so the browser can reuse
+its cached copy of the object.
+
+URLs are signed for the client's endpoint (``MINIO_PUBLIC_ENDPOINT``), which must
+be reachable from browsers; Word documents are read with ``fetch()``, so the
+bucket also needs a CORS rule for the site's origin. The default,
+``OBJECT_DELIVERY=proxy``, streams through Flask as before, and redirect mode falls
+back to it whenever signing fails.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from movie_reviews.logging import logger
+from movie_reviews.utils.s3_client import get_s3_client
+
+OBJECT_DELIVERY = os.getenv("OBJECT_DELIVERY", "proxy").lower()
+PRESIGNED_URL_SECONDS = int(os.getenv("PRESIGNED_URL_SECONDS", "900"))
+PRESIGNED_URL_REFRESH_SECONDS = int(os.getenv("PRESIGNED_URL_REFRESH_SECONDS", "120"))
+PRESIGNED_URL_CACHE_SIZE = int(os.getenv("PRESIGNED_URL_CACHE_SIZE", "4096"))
+
+
+class PresignedUrlCache:
+    def __init__(self, expires_in, refresh_margin, max_entries, clock=time.time):
+        self.expires_in = expires_in
+        self.refresh_margin = refresh_margin
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (reuse_until, url)
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "signed": 0, "failures": 0, "evictions": 0}
+
+    def get(self, key, sign):
+        """The cached URL for ``key``, or ``sign(expires_in)``'s (None if it failed)."""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return entry[1]
+
+        url = sign(self.expires_in)
+        with self._lock:
+            if url is None:
+                self.counters["failures"] += 1
+                return None
+            self.counters["signed"] += 1
+            self._entries[key] = (now + self.expires_in - self.refresh_margin, url)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+        return url
+
+    def stats(self):
+        with self._lock:
+            return {**self.counters, "entries": len(self._entries)}
+
+
+_cache = PresignedUrlCache(
+    PRESIGNED_URL_SECONDS, PRESIGNED_URL_REFRESH_SECONDS, PRESIGNED_URL_CACHE_SIZE
+)
+
+
+def redirect_enabled():
+    return OBJECT_DELIVERY == "redirect"
+
+
+def presigned_url(object_key, **response_headers):
+    """A presigned GET URL for ``object_key``, or None when it cannot be signed.
+
+    ``response_headers`` are S3 response overrides such as ``ResponseContentType``
+    or ``ResponseContentDisposition``; they are signed into the URL.
+    """
+
+    def sign(expires_in):
+        result = get_s3_client().generate_presigned_url(
+            object_key, expiration=expires_in, response_headers=response_headers
+        )
+        if not result["success"]:
+            logger.warning(f"presigned_urls {object_key}: {result['error']}")
+            return None
+        return result["url"]
+
+    return _cache.get((object_key, tuple(sorted(response_headers.items()))), sign)
@@ -5,7 +5,8 @@ Handles file uploads, downloads, and management using boto3.
 
 import os
 import uuid
-from typing import Any, Dict
+from datetime import datetime
+from typing import Any, Dict, Optional
 
 import boto3
 from botocore.exceptions import ClientError
@@ -126,6 +127,96 @@ class S3Client:
         except Exception as e:
             return {"success": False, "error": f"Download failed: {str(e)}"}
 
+    def open_stream(
+        self,
+        object_key: str,
+        byte_range: Optional[str] = None,
+        if_match: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Open a file in S3 for streaming, without reading the body.
+
+        Args:
+            object_key: S3 object key to open
+            byte_range: HTTP Range value (single range) forwarded to GetObject
+            if_match / if_none_match / if_modified_since: conditional GET validators
+
+        Returns:
+            Dict with the open body, its HTTP status (200/206) and headers; on failure
+            the error and the status to answer with (304, 404, 412, 416 or 502)
+        """
+        params = {"Bucket": self.bucket_name, "Key": object_key}
+        if byte_range:
+            params["Range"] = byte_range
+        if if_match:
+            params["IfMatch"] = if_match
+        if if_none_match:
+            params["IfNoneMatch"] = if_none_match
+        if if_modified_since:
+            params["IfModifiedSince"] = if_modified_since
+        try:
+            response = self.client.get_object(**params)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+            if code == "NoSuchKey":
+                return {"success": False, "error": "File not found", "status": 404}
+            if status in (304, 412, 416):
+                result = {"success": False, "error": code, "status": status}
+                headers = e.response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+                if headers.get("etag"):
+                    result["etag"] = headers["etag"]
+                if status == 416:
+                    # Content-Range: bytes */<size> needs the object size
+                    try:
+                        head = self.client.head_object(
+                            Bucket=self.bucket_name, Key=object_key
+                        )
+                        result["size"] = head.get("ContentLength")
+                    except Exception:
+                        pass
+                return result
+            return {
+                "success": False,
+                "error": f"S3 download failed: {str(e)}",
+                "status": 502,
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Download failed: {str(e)}",
+                "status": 502,
+            }
+
+        return {
+            "success": True,
+            "status": 206 if response.get("ContentRange") else 200,
+            "body": response["Body"],
+            "content_type": response.get("ContentType", "application/octet-stream"),
+            "content_length": response.get("ContentLength"),
+            "content_range": response.get("ContentRange"),
+            "etag": response.get("ETag"),
+            "last_modified": response.get("LastModified"),
+        }
+
+    def object_exists(self, object_key: str) -> bool:
+        """
+        Check that an object is still in the bucket (HEAD, no body transfer).
+
+        Args:
+            object_key: S3 object key to check
+
+        Returns:
+            True if it exists; False if it is missing or the check failed
+        """
+        try:
+            self.client.head_object(Bucket=self.bucket_name, Key=object_key)
+            return True
+        except Exception:
+            return False
+
     def delete_file(self, object_key: str) -> Dict[str, Any]:
         """
         Delete a file from S3.
@@ -147,7 +238,10 @@ class S3Client:
             return {"success": False, "error": f"Deletion failed: {str(e)}"}
 
     def generate_presigned_url(
-        self, object_key: str, expiration: int = 3600
+        self,
+        object_key: str,
+        expiration: int = 3600,
+        response_headers: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
         """
         Generate a presigned URL for file access.
@@ -155,6 +249,8 @@ class S3Client:
         Args:
             object_key: S3 object key
             expiration: URL expiration time in seconds (default 1 hour)
+            response_headers: GetObject response overrides signed into the URL
+                (e.g. ResponseContentType, ResponseContentDisposition)
 
         Returns:
             Dict with presigned URL or error
@@ -162,7 +258,11 @@ class S3Client:
         try:
             url = self.client.generate_presigned_url(
                 "get_object",
-                Params={"Bucket": self.bucket_name, "Key": object_key},
+                Params={
+                    "Bucket": self.bucket_name,
+                    "Key": object_key,
+                    **(response_headers or {}),
+                },
                 ExpiresIn=expiration,
             )
 
@@ -0,0 +1,274 @@
+"""
+Response cache for TMDb GETs.
+
+Entries are keyed by path plus normalized params. ``api_key`` is dropped, and the
+search ``query`` is case-folded with its whitespace collapsed. Each entry has a
+per-endpoint TTL: listing and search pages go stale in minutes, while movie, credit
+and person details last for days. Only 200 responses are stored.
+
+Lookups go through two tiers:
+
+* an in-process LRU bounded by ``TMDB_CACHE_MAX_ENTRIES``;
+* an optional shared backend that lets gunicorn workers reuse each other's
+  responses. ``TMDB_CACHE_PATH`` enables the bundled SQLite-file backend; anything
+  with ``get(key)``/``set(key, entry)`` can be plugged in.
+
+An entry past its TTL is still served for another TTL ("stale-while-revalidate")
+while one background thread refreshes it, so users never wait on an expiry.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from movie_reviews.logging import logger
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_TTL = HOUR
+
+# First match wins; paths are relative to the API base ("/movie/603/credits")
+TTL_RULES = (
+    (re.compile(r"^/movie/(popular|now_playing|top_rated|upcoming)$"), 10 * MINUTE),
+    (re.compile(r"^/discover/"), 10 * MINUTE),
+    (re.compile(r"^/search/"), 30 * MINUTE),
+    (re.compile(r"^/movie/\d+/release_dates$"), 7 * DAY),
+    (re.compile(r"^/movie/\d+(/credits)?$"), 3 * DAY),
+    (re.compile(r"^/person/\d+(/movie_credits)?$"), 3 * DAY),
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def ttl_for(path):
+    for pattern, ttl in TTL_RULES:
+        if pattern.match(path):
+            return ttl
+    return DEFAULT_TTL
+
+
+def cache_key(path, params=None):
+    items = []
+    for name, value in sorted((params or {}).items()):
+        if name == "api_key" or value is None:
+            continue
+        value = str(value)
+        if name == "query":
+            value = _WHITESPACE_RE.sub(" ", value).strip().casefold()
+        items.append(f"{name}={value}")
+    return f"{path}?{'&'.join(items)}"
+
+
+class CacheEntry:
+    """A cached 200 body as JSON text, so every hit hands out a fresh object."""
+
+    __slots__ = ("body", "fresh_until", "stale_until")
+
+    def __init__(self, body, fresh_until, stale_until):
+        self.body = body
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class SqliteCacheBackend:
+    """Shared on-disk tier: one SQLite file that every worker on the host opens."""
+
+    PURGE_EVERY = 500
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tmdb_cache ("
+                "key TEXT PRIMARY KEY, body TEXT NOT NULL, "
+                "fresh_until REAL NOT NULL, stale_until REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = (
+            self._connect()
+            .execute(
+                "SELECT body, fresh_until, stale_until FROM tmdb_cache WHERE key = ?",
+                (key,),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return CacheEntry(row[0], row[1], row[2])
+
+    def set(self, key, entry):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO tmdb_cache VALUES (?, ?, ?, ?)",
+                (key, entry.body, entry.fresh_until, entry.stale_until),
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                conn.execute(
+                    "DELETE FROM tmdb_cache WHERE stale_until < ?", (time.time(),)
+                )
+
+
+class TMDbResponseCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, shared=None):
+        self.max_entries = max_entries
+        self.shared = shared
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="tmdb-revalidate"
+        )
+        self.counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "revalidations": 0,
+            "revalidation_errors": 0,
+            "shared_errors": 0,
+        }
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        if self.shared is None:
+            return None
+        try:
+            entry = self.shared.get(key)
+        except Exception as exc:
+            self._count("shared_errors")
+            logger.warning(f"TMDb shared cache read failed: {exc}")
+            return None
+        if entry is not None:
+            self._count("shared_hits")
+            self._remember(key, entry)
+        return entry
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def store(self, path, key, body):
+        ttl = ttl_for(path)
+        now = time.time()
+        entry = CacheEntry(json.dumps(body), now + ttl, now + 2 * ttl)
+        self._remember(key, entry)
+        self._count("stores")
+        if self.shared is not None:
+            try:
+                self.shared.set(key, entry)
+            except Exception as exc:
+                self._count("shared_errors")
+                logger.warning(f"TMDb shared cache write failed: {exc}")
+
+    def fetch(self, path, params, loader):
+        """Return ``(status, body)``, using the cache for 200 responses.
+
+        ``loader()`` performs the real request and returns ``(status, body)``.
+        A stale entry is returned immediately and refreshed in the background.
+        """
+        key = cache_key(path, params)
+        entry = self._lookup(key)
+        now = time.time()
+        if entry is not None and now < entry.fresh_until:
+            self._count("hits")
+            return 200, json.loads(entry.body)
+        if entry is not None and now < entry.stale_until:
+            self._count("stale_hits")
+            self._revalidate(path, key, loader)
+            return 200, json.loads(entry.body)
+
+        self._count("misses")
+        status, body = loader()
+        if status == 200:
+            self.store(path, key, body)
+        return status, body
+
+    def _revalidate(self, path, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                status, body = loader()
+                if status == 200:
+                    self.store(path, key, body)
+                    self._count("revalidations")
+                else:
+                    self._count("revalidation_errors")
+            except Exception as exc:
+                self._count("revalidation_errors")
+                logger.warning(f"TMDb revalidation of {path} failed: {exc}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(run)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+            entries = len(self._entries)
+        lookups = counters["hits"] + counters["stale_hits"] + counters["misses"]
+        served = counters["hits"] + counters["stale_hits"]
+        return {
+            **counters,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hit_ratio": round(served / lookups, 4) if lookups else None,
+            "shared_backend": type(self.shared).__name__ if self.shared else None,
+        }
+
+
+def build_default_cache():
+    """Cache configured from the environment, or None when disabled."""
+    max_entries = int(os.getenv("TMDB_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES)))
+    if max_entries <= 0:
+        return None
+    shared = None
+    shared_path = os.getenv("TMDB_CACHE_PATH")
+    if shared_path:
+        try:
+            shared = SqliteCacheBackend(shared_path)
+        except Exception as exc:
+            logger.warning(f"TMDb shared cache at {shared_path} unavailable: {exc}")
+    return TMDbResponseCache(max_entries, shared)
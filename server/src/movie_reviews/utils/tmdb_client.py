@@ -0,0 +1,199 @@
+"""
+Shared HTTP client for The Movie Database (TMDb) API.
+
+One pooled ``requests.Session`` per process: connections are kept alive and reused
+across requests (bounded by ``TMDB_POOL_SIZE``), every call gets the same
+connect/read timeouts, and idempotent GETs are retried with exponential backoff
+on connection errors, 429 and 5xx. ``Retry-After`` from TMDb's rate limiter is
+honored, capped so a single request cannot park a worker for minutes.
+
+``fetch``/``get_json`` go through the response cache in ``tmdb_cache`` (TTL + LRU,
+optional shared tier, stale-while-revalidate); ``get`` always hits the network.
+``fetch_many`` runs independent fetches concurrently on a bounded thread pool
+(sized to the connection pool) and returns whatever finished before a deadline;
+``get_json_async`` puts a single lookup on the same pool so the caller can do
+other work (e.g. database writes) while it is in flight.
+
+``TMDB_BASE_URL`` points the process-wide client somewhere other than the real
+API, e.g. the offline stand-in in ``benchmarks/tmdb_standin.py``.
+"""
+
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from movie_reviews.logging import logger
+
+from .tmdb_cache import build_default_cache
+
+TMDB_BASE_URL = "https://api.themoviedb.org/3"
+TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p"
+
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv("TMDB_CONNECT_TIMEOUT", "3.05"))
+DEFAULT_READ_TIMEOUT = float(os.getenv("TMDB_READ_TIMEOUT", "10"))
+DEFAULT_POOL_SIZE = int(os.getenv("TMDB_POOL_SIZE", "10"))
+DEFAULT_MAX_RETRIES = int(os.getenv("TMDB_MAX_RETRIES", "3"))
+DEFAULT_BACKOFF_FACTOR = 0.5  # 0.5s, 1s, 2s between attempts
+MAX_RETRY_AFTER_SECONDS = 10
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class _CappedRetry(Retry):
+    """urllib3 Retry that honors Retry-After but never sleeps past the cap."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, MAX_RETRY_AFTER_SECONDS)
+
+
+class TMDbClient:
+    """Thin wrapper around a pooled, retrying session for TMDb GETs."""
+
+    def __init__(
+        self,
+        base_url: str = TMDB_BASE_URL,
+        api_key: Optional[str] = None,
+        timeout=(DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT),
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        cache=None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self._api_key = api_key
+        self.timeout = timeout
+        self.cache = cache
+
+        retry = _CappedRetry(
+            total=max_retries,
+            backoff_factor=DEFAULT_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,  # hand the last 429/5xx back to the caller
+        )
+        adapter = HTTPAdapter(
+            pool_connections=2, pool_maxsize=pool_size, max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="tmdb-fanout"
+        )
+
+    @property
+    def api_key(self) -> Optional[str]:
+        # Read lazily so scripts that load .env after import still work
+        return self._api_key or os.getenv("MOVIE_API_KEY")
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def get(
+        self, path: str, params: Optional[Dict[str, Any]] = None, timeout=None
+    ) -> requests.Response:
+        """GET ``{base_url}{path}`` with the API key added.
+
+        Raises ``requests.RequestException`` when TMDb cannot be reached after
+        retries; HTTP error statuses are returned, not raised.
+        """
+        query = {"api_key": self.api_key}
+        if params:
+            query.update({k: v for k, v in params.items() if v is not None})
+        return self.session.get(
+            f"{self.base_url}{path}", params=query, timeout=timeout or self.timeout
+        )
+
+    def fetch(
+        self, path: str, params: Optional[Dict[str, Any]] = None, timeout=None
+    ) -> Tuple[int, Any]:
+        """``(status, body)``: decoded JSON for a 200, response text otherwise.
+
+        Served from the response cache when possible. Raises
+        ``requests.RequestException`` like ``get`` on a cache miss.
+        """
+
+        def load():
+            response = self.get(path, params, timeout=timeout)
+            if response.status_code != 200:
+                return response.status_code, response.text
+            try:
+                return 200, response.json()
+            except ValueError:
+                return 502, f"TMDb returned invalid JSON for {path}"
+
+        if self.cache is None:
+            return load()
+        return self.cache.fetch(path, params, load)
+
+    def get_json(
+        self, path: str, params: Optional[Dict[str, Any]] = None, timeout=None
+    ) -> Optional[Dict[str, Any]]:
+        """Decoded JSON body for a 200 response; None on any failure."""
+        try:
+            status, body = self.fetch(path, params, timeout=timeout)
+        except requests.RequestException as exc:
+            logger.warning(f"TMDb GET {path} failed: {exc}")
+            return None
+        if status != 200:
+            logger.info(f"TMDb GET {path} returned {status}")
+            return None
+        return body if isinstance(body, dict) else None
+
+    def get_json_async(
+        self, path: str, params: Optional[Dict[str, Any]] = None
+    ) -> Future:
+        """``get_json`` on the fan-out pool; the future never raises."""
+        return self._executor.submit(self.get_json, path, params)
+
+    def fetch_many(
+        self, calls: Dict[str, Tuple[str, Optional[Dict[str, Any]]]], deadline: float
+    ) -> Dict[str, Tuple[int, Any]]:
+        """Run ``{name: (path, params)}`` fetches concurrently.
+
+        ``deadline`` is a ``time.monotonic()`` timestamp. Returns ``{name: (status,
+        body)}`` for calls that completed in time; names that timed out or raised
+        are left out. Late calls keep running and still populate the cache.
+        """
+        futures = {
+            self._executor.submit(self.fetch, path, params): name
+            for name, (path, params) in calls.items()
+        }
+        done, not_done = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+
+        results = {}
+        for future in done:
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except requests.RequestException as exc:
+                logger.warning(f"TMDb fan-out call {name!r} failed: {exc}")
+        for future in not_done:
+            logger.warning(f"TMDb fan-out call {futures[future]!r} missed the deadline")
+        return results
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        return self.cache.stats() if self.cache is not None else None
+
+
+# Global TMDb client instance
+tmdb_client = None
+
+
+def get_tmdb_client() -> TMDbClient:
+    """Get or create the process-wide TMDb client."""
+    global tmdb_client
+    if tmdb_client is None:
+        tmdb_client = TMDbClient(
+            base_url=os.getenv("TMDB_BASE_URL") or TMDB_BASE_URL,
+            cache=build_default_cache(),
+        )
+    return tmdb_client
@@ -0,0 +1,26 @@
+"""Shared fixtures; tests that touch the database run on in-memory SQLite."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# src layout; movie_reviews.config needs a database URI to import
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+
+@pytest.fixture
+def app_db():
+    """An app context over freshly created tables; yields ``db``."""
+    from movie_reviews import models  # noqa: F401  (registers every table)
+    from movie_reviews.config import app, db
+
+    with app.app_context():
+        db.create_all()
+        try:
+            yield db
+        finally:
+            db.session.remove()
+            db.drop_all()
@@ -0,0 +1,46 @@
+"""Tests for the shared activity feed snapshot."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# src layout; movie_reviews.config needs a database URI to import
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from movie_reviews.api import activity
+
+
+class _Loader:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self, size):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_failed_first_build_is_retried_on_next_request(monkeypatch):
+    loader = _Loader(RuntimeError("db blip"), [{"id": 1}])
+    monkeypatch.setattr(activity, "load_activity", loader)
+    snapshot = activity.ActivitySnapshot(size=5, ttl=60)
+    with pytest.raises(RuntimeError):
+        snapshot.get()
+    items, etag = snapshot.get()
+    assert items == [{"id": 1}] and etag and loader.calls == 2
+
+
+def test_failed_rebuild_serves_previous_snapshot(monkeypatch):
+    loader = _Loader([{"id": 1}], RuntimeError("db blip"), [{"id": 2}])
+    monkeypatch.setattr(activity, "load_activity", loader)
+    snapshot = activity.ActivitySnapshot(size=5, ttl=60)
+    assert snapshot.get()[0] == [{"id": 1}]
+    snapshot.invalidate()
+    assert snapshot.get()[0] == [{"id": 1}]
+    assert snapshot.get()[0] == [{"id": 2}]
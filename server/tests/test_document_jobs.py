@@ -0,0 +1,128 @@
+"""Tests for the document job queue's claim / lease / requeue state machine."""
+
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from movie_reviews import document_jobs
+from movie_reviews.models import DocumentJob, Review
+from movie_reviews.utils.document_processor import DocumentProcessor
+from werkzeug.datastructures import FileStorage
+
+
+@pytest.fixture
+def review_id(app_db):
+    review = Review(title="Essay", review_text="<p>old</p>", content_type="article")
+    app_db.session.add(review)
+    app_db.session.commit()
+    return review.id
+
+
+def _enqueue(db, review_id, body=b"docx bytes"):
+    upload = FileStorage(stream=io.BytesIO(body), filename="essay.docx")
+    job = document_jobs.enqueue(review_id, upload, replace_text=True)
+    db.session.commit()
+    return job.id
+
+
+def _result(**overrides):
+    return {
+        "success": True,
+        "filename": "essay.docx",
+        "file_path": "documents/essay.docx",
+        "file_type": "docx",
+        "extracted_text": "<p>new</p>",
+        "main_cast": None,
+        "line_notes": None,
+        **overrides,
+    }
+
+
+def test_claim_takes_oldest_queued_job_once(app_db, review_id):
+    first = _enqueue(app_db, review_id, b"one")
+    second = _enqueue(app_db, review_id, b"two")
+    assert document_jobs.claim("w1") == first
+    assert document_jobs.claim("w2") == second
+    assert document_jobs.claim("w3") is None
+    job = app_db.session.get(DocumentJob, first)
+    assert (job.status, job.locked_by, job.attempts) == ("running", "w1", 1)
+
+
+def test_stale_lease_is_requeued_then_failed_at_max_attempts(
+    app_db, review_id, monkeypatch
+):
+    monkeypatch.setattr(document_jobs, "DOCUMENT_JOB_MAX_ATTEMPTS", 2)
+    job_id = _enqueue(app_db, review_id)
+    stale = datetime.utcnow() - timedelta(
+        seconds=document_jobs.DOCUMENT_JOB_LEASE_SECONDS + 1
+    )
+
+    def expire_lease():
+        job = app_db.session.get(DocumentJob, job_id)
+        job.locked_at = stale
+        app_db.session.commit()
+
+    assert document_jobs.claim("w1") == job_id
+    expire_lease()
+    # w1 stopped reporting: the job goes back to the queue and w2 takes it
+    assert document_jobs.claim("w2") == job_id
+    job = app_db.session.get(DocumentJob, job_id)
+    assert (job.locked_by, job.attempts) == ("w2", 2)
+
+    expire_lease()
+    assert document_jobs.claim("w3") is None
+    app_db.session.expire_all()
+    job = app_db.session.get(DocumentJob, job_id)
+    assert job.status == "failed" and job.payload is None
+
+
+def test_run_job_applies_result(app_db, review_id, monkeypatch):
+    monkeypatch.setattr(
+        DocumentProcessor,
+        "process_uploaded_document_s3",
+        lambda file, review_id, progress=None: _result(),
+    )
+    job_id = _enqueue(app_db, review_id)
+    assert document_jobs.claim("w1") == job_id
+    assert document_jobs.run_job(job_id, "w1") is True
+    app_db.session.expire_all()
+    job = app_db.session.get(DocumentJob, job_id)
+    review = app_db.session.get(Review, review_id)
+    assert (job.status, job.progress, job.payload) == ("succeeded", 100, None)
+    assert review.has_document and review.review_text == "<p>new</p>"
+
+
+def test_run_job_discards_result_when_lease_lost(app_db, review_id, monkeypatch):
+    job_id = _enqueue(app_db, review_id)
+
+    def process_while_lease_moves(file, review_id, progress=None):
+        # The lease expired mid-run and another worker claimed the job
+        job = app_db.session.get(DocumentJob, job_id)
+        job.locked_by = "w2"
+        app_db.session.commit()
+        return _result()
+
+    monkeypatch.setattr(
+        DocumentProcessor, "process_uploaded_document_s3", process_while_lease_moves
+    )
+    assert document_jobs.claim("w1") == job_id
+    assert document_jobs.run_job(job_id, "w1") is False
+    app_db.session.expire_all()
+    job = app_db.session.get(DocumentJob, job_id)
+    review = app_db.session.get(Review, review_id)
+    assert (job.status, job.locked_by) == ("running", "w2")
+    assert not review.has_document and review.review_text == "<p>old</p>"
+
+
+def test_failed_processing_is_not_retried(app_db, review_id, monkeypatch):
+    monkeypatch.setattr(
+        DocumentProcessor,
+        "process_uploaded_document_s3",
+        lambda file, review_id, progress=None: {"success": False, "error": "bad"},
+    )
+    job_id = _enqueue(app_db, review_id)
+    document_jobs.claim("w1")
+    assert document_jobs.run_job(job_id, "w1") is False
+    app_db.session.expire_all()
+    job = app_db.session.get(DocumentJob, job_id)
+    assert (job.status, job.error, job.payload) == ("failed", "bad", None)
@@ -0,0 +1,89 @@
+"""Tests for the like write-behind buffer."""
+
+from movie_reviews.like_buffer import LikeBuffer
+from movie_reviews.models import Review, ReviewLike, User
+
+
+def _review_and_user(db):
+    user = User(username="liker", email="liker@example.com")
+    user._password_hash = "x"
+    review = Review(title="Essay", review_text="<p>x</p>", content_type="article")
+    db.session.add_all([user, review])
+    db.session.commit()
+    return review.id, user.id
+
+
+def _like_exists(db, review_id, user_id):
+    return (
+        db.session.query(ReviewLike)
+        .filter_by(review_id=review_id, user_id=user_id)
+        .count()
+        == 1
+    )
+
+
+def test_toggles_collapse_and_flush(app_db):
+    review_id, user_id = _review_and_user(app_db)
+    buffer = LikeBuffer()
+    assert buffer.toggle(ReviewLike, user_id, review_id) == (True, 1)
+    assert buffer.toggle(ReviewLike, user_id, review_id) == (False, 0)
+    assert buffer.toggle(ReviewLike, user_id, review_id) == (True, 1)
+    assert buffer.flush() == 1
+    assert _like_exists(app_db, review_id, user_id)
+    assert app_db.session.get(Review, review_id).like_count == 1
+
+
+def test_toggle_reading_across_a_flush_rereads(app_db, monkeypatch):
+    review_id, user_id = _review_and_user(app_db)
+    buffer = LikeBuffer()
+    buffer.toggle(ReviewLike, user_id, review_id)  # like, pending
+    inflight = buffer._take()  # a flush starts writing it
+
+    read_state = buffer._read_state
+    reads = []
+
+    def read_then_finish_flush(*args):
+        row = read_state(*args)
+        if not reads:
+            # The flush commits and finishes between this read and the lock
+            entries = [(uid, tid, entry) for (_m, uid, tid), entry in inflight.items()]
+            buffer._write_batch(ReviewLike, entries)
+            app_db.session.commit()
+            buffer._done()
+        reads.append(row)
+        return row
+
+    monkeypatch.setattr(buffer, "_read_state", read_then_finish_flush)
+    # The second click unlikes: it must not mistake the pre-flush row for stored
+    assert buffer.toggle(ReviewLike, user_id, review_id) == (False, 0)
+    assert len(reads) == 2 and buffer.counters["reread"] == 1
+    buffer.flush()
+    assert not _like_exists(app_db, review_id, user_id)
+    assert app_db.session.get(Review, review_id).like_count == 0
+
+
+def test_flush_runs_hooks_with_written_likes(app_db):
+    review_id, user_id = _review_and_user(app_db)
+    buffer = LikeBuffer()
+    calls = []
+    buffer.on_written.append(
+        lambda model, inserted, targets: calls.append(("written", inserted, targets))
+    )
+    buffer.on_committed.append(
+        lambda model, inserted, targets: calls.append(("committed", inserted, targets))
+    )
+    buffer.toggle(ReviewLike, user_id, review_id)
+    assert calls == []  # nothing is cached stale before the flush writes
+    buffer.flush()
+    like_id = app_db.session.query(ReviewLike.id).scalar()
+    assert calls == [
+        ("written", [like_id], {review_id}),
+        ("committed", [like_id], {review_id}),
+    ]
+
+
+def test_toggle_leaves_the_request_session_alone(app_db):
+    review_id, user_id = _review_and_user(app_db)
+    app_db.session.get(Review, review_id).title = "Edited, not yet committed"
+    LikeBuffer().toggle(ReviewLike, user_id, review_id)
+    assert app_db.session.get(Review, review_id).title == "Edited, not yet committed"
@@ -0,0 +1,66 @@
+"""Tests for the grouped page cache."""
+
+import sys
+from pathlib import Path
+
+# src layout
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from movie_reviews.utils.page_cache import PageCache, SqliteGenerationBackend
+
+
+def test_hit_returns_copy():
+    cache = PageCache(max_entries=10, ttl=60)
+    assert cache.get(1, "page") is None
+    cache.set(1, "page", {"comments": [1]})
+    cache.get(1, "page")["comments"].append(2)  # callers may mutate what they get
+    assert cache.get(1, "page") == {"comments": [1]}
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+
+def test_invalidate_drops_only_that_group():
+    cache = PageCache(max_entries=10, ttl=60)
+    cache.set(1, "a", "one-a")
+    cache.set(1, "b", "one-b")
+    cache.set(2, "a", "two-a")
+    cache.invalidate(1)
+    assert cache.get(1, "a") is None and cache.get(1, "b") is None
+    assert cache.get(2, "a") == "two-a"
+    cache.set(1, "a", "fresh")
+    assert cache.get(1, "a") == "fresh"
+
+
+def test_set_after_invalidate_does_not_resurrect_stale_page():
+    cache = PageCache(max_entries=10, ttl=60)
+    generation = cache.generation(1)
+    assert cache.get(1, "p", generation=generation) is None
+    cache.invalidate(1)  # a comment is posted while the old page is being built
+    cache.set(1, "p", "old", generation=generation)
+    assert cache.get(1, "p") is None
+
+
+def test_expired_entries_are_evicted():
+    cache = PageCache(max_entries=10, ttl=-1)  # everything is already stale
+    cache.set(1, "a", "x")
+    assert cache.get(1, "a") is None
+    cache.set(1, "b", "y")
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["expired"] == 2
+
+
+def test_lru_bound():
+    cache = PageCache(max_entries=2, ttl=60)
+    for key in ("a", "b", "c"):
+        cache.set(1, key, key)
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["evictions"] == 1
+    assert cache.get(1, "a") is None
+
+
+def test_shared_backend_invalidates_other_instances(tmp_path):
+    shared_path = str(tmp_path / "generations.sqlite3")
+    first = PageCache(10, 60, shared=SqliteGenerationBackend(shared_path))
+    second = PageCache(10, 60, shared=SqliteGenerationBackend(shared_path))
+    second.set(7, "page", "cached")
+    first.invalidate(7)
+    assert second.get(7, "page") is None
@@ -0,0 +1,84 @@
+"""Tests for the page-parallel PDF extraction helpers."""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# src layout; the benchmark's PDF writer builds the fixtures
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from bench_pdf_extract import write_text_pdf
+from movie_reviews.utils import pdf_extraction
+from movie_reviews.utils.pdf_extraction import extract_pdf_text, page_ranges
+
+
+@pytest.fixture
+def essay_pdf(tmp_path, monkeypatch):
+    """A 7-page text PDF, split into chunks of two pages."""
+    monkeypatch.setattr(pdf_extraction, "PDF_EXTRACT_PAGES_PER_TASK", 2)
+    path = tmp_path / "essay.pdf"
+    write_text_pdf(path, pages=7, lines_per_page=4)
+    return str(path)
+
+
+class FakeTime:
+    """Stands in for the module's ``time``; each page range read takes a second."""
+
+    perf_counter = staticmethod(time.perf_counter)
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_page_ranges_cover_every_page_in_order():
+    assert page_ranges(0, 8) == []
+    assert page_ranges(5, 8) == [(0, 5)]
+    assert page_ranges(17, 8) == [(0, 8), (8, 16), (16, 17)]
+    assert page_ranges(3, 0) == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_unreadable_file_yields_empty_text(tmp_path):
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(b"not a pdf")
+    assert extract_pdf_text(str(path), workers=0) == ""
+
+
+def test_pool_output_matches_inline(essay_pdf):
+    inline = extract_pdf_text(essay_pdf, workers=0)
+    try:
+        pooled = extract_pdf_text(essay_pdf, workers=2)
+    finally:
+        if pdf_extraction._pool is not None:
+            pdf_extraction._drop_pool(pdf_extraction._pool)
+    assert "Page 1" in inline and "Page 7" in inline
+    assert pooled == inline
+
+
+def test_max_pages_returns_the_leading_pages(essay_pdf):
+    full = extract_pdf_text(essay_pdf, workers=0)
+    text = extract_pdf_text(essay_pdf, max_pages=3, workers=0)
+    assert "Page 3" in text and "Page 4" not in text
+    assert full.startswith(text)
+
+
+def test_deadline_returns_the_chunks_read_in_time(essay_pdf, monkeypatch):
+    clock = FakeTime()
+    read_range = pdf_extraction.extract_page_range
+
+    def slow_read(file_path, start, stop):
+        clock.now += 1
+        return read_range(file_path, start, stop)
+
+    monkeypatch.setattr(pdf_extraction, "time", clock)
+    monkeypatch.setattr(pdf_extraction, "extract_page_range", slow_read)
+    full = extract_pdf_text(essay_pdf, workers=0)
+    text = extract_pdf_text(essay_pdf, deadline_seconds=1.5, workers=0)
+    assert "Page 4" in text and "Page 5" not in text  # two chunks of two pages
+    assert full.startswith(text)
+    assert extract_pdf_text(essay_pdf, deadline_seconds=0, workers=0) == ""
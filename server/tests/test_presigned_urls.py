@@ -0,0 +1,46 @@
+"""Tests for the presigned URL cache."""
+
+import sys
+from pathlib import Path
+
+# src layout
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from movie_reviews.utils.presigned_urls import PresignedUrlCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_url_reused_until_refresh_margin():
+    clock = Clock()
+    cache = PresignedUrlCache(
+        expires_in=900, refresh_margin=120, max_entries=10, clock=clock
+    )
+    signed = []
+
+    def sign(expires_in):
+        signed.append(expires_in)
+        return f"https://minio/doc.pdf?n={len(signed)}"
+
+    assert cache.get("doc.pdf", sign) == "https://minio/doc.pdf?n=1"
+    clock.now += 779
+    assert cache.get("doc.pdf", sign) == "https://minio/doc.pdf?n=1"
+    clock.now += 1  # 120s before the URL lapses: sign a fresh one
+    assert cache.get("doc.pdf", sign) == "https://minio/doc.pdf?n=2"
+    assert signed == [900, 900]
+
+
+def test_failed_signing_is_not_cached_and_size_is_bounded():
+    cache = PresignedUrlCache(expires_in=900, refresh_margin=120, max_entries=2)
+    assert cache.get("a", lambda expires_in: None) is None
+    for key in ("a", "b", "c"):
+        cache.get(key, lambda expires_in, key=key: f"https://minio/{key}")
+    stats = cache.stats()
+    assert stats["failures"] == 1 and stats["signed"] == 3
+    assert stats["entries"] == 2 and stats["evictions"] == 1
@@ -0,0 +1,100 @@
+"""Tests for the server-sent events broker and publish-on-commit."""
+
+import os
+import queue
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+# src layout; movie_reviews.config needs a database URI to import
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from movie_reviews import stream
+from movie_reviews.stream import Broker
+
+
+def _drain(subscription):
+    items = []
+    while (item := subscription.get(timeout=0)) is not None:
+        items.append(item)
+    return items
+
+
+def _event_names(subscription):
+    body = "".join(stream.events(subscription, heartbeat=0.01, max_seconds=0.02))
+    return [
+        line[len("event: ") :]
+        for line in body.splitlines()
+        if line.startswith("event: ")
+    ]
+
+
+def test_deliver_reaches_only_channel_subscribers_until_unsubscribed():
+    broker = Broker()
+    activity = broker.subscribe(["activity"])
+    user = broker.subscribe(["user:1"])
+    broker.deliver("activity", "activity", {"id": 1})
+    assert [(name, data) for _id, name, data in _drain(activity)] == [
+        ("activity", {"id": 1})
+    ]
+    assert _drain(user) == []
+    broker.unsubscribe(activity)
+    broker.deliver("activity", "activity", {"id": 2})
+    assert _drain(activity) == []
+    assert broker.stats()["streams"] == 1
+
+
+def test_overflow_sends_resync():
+    broker = Broker()
+    subscription = broker.subscribe(["activity"])
+    subscription.queue = queue.Queue(2)
+    for n in range(3):
+        broker.deliver("activity", "activity", {"id": n})
+    assert subscription.overflowed and broker.stats()["dropped"] == 1
+    assert _event_names(subscription) == ["ready", "resync", "activity", "activity"]
+
+
+def test_reconnect_replays_missed_events_or_resyncs():
+    broker = Broker(replay_size=3)
+    first = broker.subscribe(["activity"])
+    resume_from = first.last_event_id
+    broker.unsubscribe(first)
+    broker.deliver("activity", "activity", {"id": 1})
+    broker.deliver("user:2", "notification", {"id": 9})
+
+    again = broker.subscribe(["activity"], last_event_id=resume_from)
+    assert [data for _id, _name, data in again.replay] == [{"id": 1}]
+    assert not again.overflowed
+    assert _event_names(again) == ["ready", "activity"]
+
+    # Ids from another process, or older than the buffer, cannot be replayed
+    assert broker.subscribe(["activity"], last_event_id="other-1").overflowed
+    for n in range(4):
+        broker.deliver("activity", "activity", {"id": n})
+    assert broker.subscribe(["activity"], last_event_id=resume_from).overflowed
+
+
+def test_events_publish_after_commit_and_not_after_rollback(monkeypatch):
+    broker = Broker()
+    monkeypatch.setattr(stream, "broker", broker)
+    monkeypatch.setattr(stream, "STREAM_ENABLED", True)
+    subscription = broker.subscribe(["activity"])
+    session = Session(create_engine("sqlite://"))
+    event.listen(session, "after_commit", stream._publish_pending)
+    event.listen(session, "after_rollback", stream._discard_pending)
+
+    session.execute(text("SELECT 1"))
+    stream.publish(session, "activity", "activity", {"id": 1})
+    assert _drain(subscription) == []  # not before the commit
+    session.commit()
+    assert [data for _id, _name, data in _drain(subscription)] == [{"id": 1}]
+
+    session.execute(text("SELECT 1"))
+    stream.publish(session, "activity", "activity", {"id": 2})
+    session.rollback()
+    session.execute(text("SELECT 1"))
+    session.commit()
+    assert _drain(subscription) == []
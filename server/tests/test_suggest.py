@@ -0,0 +1,55 @@
+"""Tests for the typeahead suggestion index."""
+
+import threading
+
+from flask import current_app
+from movie_reviews.models import Tag
+from movie_reviews.search import suggest
+from movie_reviews.search.suggest import SuggestIndex
+
+
+def test_whole_label_match_survives_many_mid_label_matches(app_db, monkeypatch):
+    monkeypatch.setattr(suggest, "SUGGEST_SCAN_LIMIT", 5)
+    # Ten mid-label "noir" keys sort ahead of the whole label "noir zz"
+    app_db.session.add_all([Tag(name=f"a{i} noir") for i in range(10)])
+    app_db.session.add(Tag(name="noir zz"))
+    app_db.session.commit()
+
+    labels = [s["label"] for s in SuggestIndex().suggest("noir", limit=3)]
+    assert labels[0] == "noir zz"
+    assert len(labels) == 3
+
+
+def test_concurrent_first_lookups_build_once(app_db, monkeypatch):
+    app_db.session.add(Tag(name="thriller"))
+    app_db.session.commit()
+    app = current_app._get_current_object()
+    index = SuggestIndex()
+    builds = []
+    real_build = index.build
+    started, release = threading.Event(), threading.Event()
+
+    def slow_build():
+        builds.append(1)
+        started.set()
+        release.wait(5)
+        real_build()
+
+    monkeypatch.setattr(index, "build", slow_build)
+    results = []
+
+    def lookup():
+        results.append(index.suggest("thr"))
+
+    def lookup_in_thread():
+        with app.app_context():
+            lookup()
+
+    first = threading.Thread(target=lookup_in_thread)
+    first.start()
+    started.wait(5)
+    threading.Timer(0.2, release.set).start()
+    lookup()  # arrives while the first build is still running
+    first.join(5)
+    assert len(builds) == 1
+    assert all(r and r[0]["label"] == "thriller" for r in results)
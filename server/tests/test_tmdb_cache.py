@@ -0,0 +1,100 @@
+"""Tests for the TMDb response cache."""
+
+import sys
+import time
+from pathlib import Path
+
+# src layout
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from movie_reviews.utils.tmdb_cache import (
+    SqliteCacheBackend,
+    TMDbResponseCache,
+    cache_key,
+    ttl_for,
+)
+
+
+class _Loader:
+    def __init__(self, status=200, body=None):
+        self.status = status
+        self.body = body if body is not None else {"results": [1, 2]}
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.status, self.body
+
+
+def test_cache_key_ignores_api_key_and_normalizes_query():
+    a = cache_key(
+        "/search/movie", {"api_key": "x", "query": " Rear  Window", "page": 1}
+    )
+    b = cache_key("/search/movie", {"page": 1, "query": "rear window", "api_key": "y"})
+    assert a == b
+    assert cache_key("/discover/movie", {"page": 1}) != cache_key(
+        "/discover/movie", {"page": 2}
+    )
+
+
+def test_ttl_rules():
+    assert ttl_for("/movie/popular") < ttl_for("/movie/603")
+    assert ttl_for("/movie/603/credits") == ttl_for("/movie/603")
+    assert ttl_for("/search/person") < ttl_for("/person/42/movie_credits")
+
+
+def test_hit_after_miss_returns_copy():
+    cache = TMDbResponseCache(max_entries=10)
+    loader = _Loader()
+    status, body = cache.fetch("/movie/popular", None, loader)
+    body["results"].append(3)  # callers may mutate what they get
+    status, again = cache.fetch("/movie/popular", None, loader)
+    assert status == 200 and again == {"results": [1, 2]}
+    assert loader.calls == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_errors_are_not_cached():
+    cache = TMDbResponseCache(max_entries=10)
+    loader = _Loader(status=503, body="unavailable")
+    assert cache.fetch("/movie/popular", None, loader) == (503, "unavailable")
+    cache.fetch("/movie/popular", None, loader)
+    assert loader.calls == 2
+
+
+def test_lru_evicts_oldest():
+    cache = TMDbResponseCache(max_entries=2)
+    for page in (1, 2, 3):
+        cache.fetch("/discover/movie", {"page": page}, _Loader())
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_stale_entry_served_while_revalidating():
+    cache = TMDbResponseCache(max_entries=10)
+    cache.fetch("/movie/popular", None, _Loader(body={"v": 1}))
+    entry = next(iter(cache._entries.values()))
+    entry.fresh_until = time.time() - 1  # expire without waiting out the TTL
+
+    refreshed = _Loader(body={"v": 2})
+    assert cache.fetch("/movie/popular", None, refreshed) == (200, {"v": 1})
+    cache._executor.shutdown(wait=True)
+    assert refreshed.calls == 1
+    assert cache.stats()["stale_hits"] == 1
+    assert cache.stats()["revalidations"] == 1
+    assert cache.fetch("/movie/popular", None, refreshed) == (200, {"v": 2})
+
+
+def test_shared_backend_serves_other_instances(tmp_path):
+    shared_path = str(tmp_path / "tmdb_cache.sqlite3")
+    first = TMDbResponseCache(max_entries=10, shared=SqliteCacheBackend(shared_path))
+    first.fetch("/movie/603", {"language": "en-US"}, _Loader(body={"id": 603}))
+
+    second = TMDbResponseCache(max_entries=10, shared=SqliteCacheBackend(shared_path))
+    loader = _Loader()
+    assert second.fetch("/movie/603", {"language": "en-US"}, loader) == (
+        200,
+        {"id": 603},
+    )
+    assert loader.calls == 0
+    assert second.stats()["shared_hits"] == 1